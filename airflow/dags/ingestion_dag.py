@@ -1,12 +1,10 @@
 from airflow import DAG
 from airflow.operators.python import PythonOperator
 from datetime import datetime, timedelta
-from pipeline.ingestion.ingest_reddit import RedditIngestor
-from pipeline.ingestion.ingest_news import NewsIngestor
-from pipeline.snowflake.load_snowflake import (
-    load_reddit_to_snowflake,
-    load_news_to_snowflake
-)
+from pipeline.ingestion.ingest_reddit import RedditIngestor, DEFAULT_SUBREDDITS
+from pipeline.ingestion.ingest_news import NewsIngestor, news_slices
+from pipeline.ingestion.run_static_ingestion import STATIC_SOURCES, run_source
+from pipeline.snowflake.load_snowflake import load_partitions_to_snowflake
 
 default_args = {
     'owner': 'andrew',
@@ -14,11 +12,37 @@ default_args = {
     'retry_delay': timedelta(minutes=5)
 }
 
-def run_reddit():
-    RedditIngestor().run("reddit", "reddit_suite", save_s3=True, save_local=False)
+# Mapped callables hand only S3 keys to XCom; metrics go to the metrics sink.
+# Each map index retries on its own, so one failed slice does not rerun the others.
+def run_reddit(subreddit: str):
+    ingestor = RedditIngestor(subreddits=[subreddit], partition=subreddit)
+    ingestor.run("reddit", "reddit_suite", save_s3=True, save_local=False)
+    return ingestor.output_keys.get("processed")
 
-def ingest_news():
-    NewsIngestor().run("news", "news_suite", save_s3=True, save_local=False)
+def plan_news_slices():
+    return [{"date_slice": list(date_slice)} for date_slice in news_slices()]
+
+def ingest_news(date_slice: list):
+    ingestor = NewsIngestor(date_slice=date_slice)
+    ingestor.run("news", "news_suite", save_s3=True, save_local=False)
+    return ingestor.output_keys.get("processed")
+
+def run_static(source: str):
+    # Static sources load straight to Snowflake; raising lets Airflow retry the source.
+    # Compact dtypes keep large extracts within the 2 GB task
+    result = run_source(source, STATIC_SOURCES[source], compact=True)
+    if result["status"] == "failed":
+        raise RuntimeError(f"{source} ingestion failed: {result['error']}")
+    # An unchanged source rewrote nothing, so there is no new object to hand downstream
+    if result["status"] == "skipped":
+        return None
+    return f"static_data/processed/{STATIC_SOURCES[source]['args'][0].lower()}.json"
+
+def load_reddit(s3_keys):
+    return load_partitions_to_snowflake("reddit", list(s3_keys))
+
+def load_news(s3_keys):
+    return load_partitions_to_snowflake("news", list(s3_keys))
 
 with DAG(
     dag_id="ingestion_dag",
@@ -29,25 +53,42 @@ with DAG(
     tags=["mental_health"],
 ) as dag:
 
-    ingest_reddit_task = PythonOperator(
+    # One task per subreddit, capped like the old in-task thread pool to respect Reddit's rate limit
+    ingest_reddit_task = PythonOperator.partial(
         task_id='ingest_reddit',
-        python_callable=run_reddit
+        python_callable=run_reddit,
+        max_active_tis_per_dagrun=4
+    ).expand(op_kwargs=[{"subreddit": sub} for sub in DEFAULT_SUBREDDITS])
+
+    # Day slices are computed at run time, so the mapping follows the run's window
+    plan_news_task = PythonOperator(
+        task_id='plan_news_slices',
+        python_callable=plan_news_slices
     )
 
-    ingest_news_task = PythonOperator(
+    ingest_news_task = PythonOperator.partial(
         task_id='ingest_news',
-        python_callable=ingest_news
-    )
+        python_callable=ingest_news,
+        max_active_tis_per_dagrun=4
+    ).expand(op_kwargs=plan_news_task.output)
+
+    ingest_static_task = PythonOperator.partial(
+        task_id='ingest_static',
+        python_callable=run_static
+    ).expand(op_kwargs=[{"source": source} for source in STATIC_SOURCES])
 
+    # One COPY per dataset over every partition file the mapped tasks wrote
     load_reddit_task = PythonOperator(
         task_id='load_reddit_to_snowflake',
-        python_callable=load_reddit_to_snowflake 
+        python_callable=load_reddit,
+        op_kwargs={"s3_keys": ingest_reddit_task.output}
     )
 
     load_news_task = PythonOperator(
         task_id='load_news_to_snowflake',
-        python_callable=load_news_to_snowflake
+        python_callable=load_news,
+        op_kwargs={"s3_keys": ingest_news_task.output}
     )
 
     ingest_reddit_task >> load_reddit_task
-    ingest_news_task >> load_news_task
\ No newline at end of file
+    plan_news_task >> ingest_news_task >> load_news_task
\ No newline at end of file
@@ -1,3 +1,3 @@
-from .clustering_utils import run_hdbscan_clustering, evaluate_clustering
+from .clustering_utils import run_hdbscan_clustering, run_hdbscan_knn_clustering, run_hdbscan_sweep, evaluate_clustering
 
-__all__ = ["run_hdbscan_clustering", "evaluate_clustering"]
\ No newline at end of file
+__all__ = ["run_hdbscan_clustering", "run_hdbscan_knn_clustering", "run_hdbscan_sweep", "evaluate_clustering"]
\ No newline at end of file
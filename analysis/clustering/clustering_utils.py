@@ -1,7 +1,11 @@
 import numpy as np
 import pandas as pd
 from hdbscan import HDBSCAN
-from sklearn.metrics import silhouette_score
+from analysis.utils.gower_engine import GowerFeatures
+from analysis.utils.silhouette import silhouette_report
+from analysis.utils.preprocessing import compute_gower_distance
+from .knn_hdbscan import knn_hdbscan
+from .hdbscan_sweep import hdbscan_sweep
 import logging
 
 # Configure logging
@@ -9,18 +13,64 @@ logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 def run_hdbscan_clustering(distance_matrix, min_cluster_size=15, min_samples=10):
-    """Run HDBSCAN clustering on distance matrix"""
+    """Run HDBSCAN clustering on distance matrix (cast to the float64 dense hdbscan requires)"""
     clusterer = HDBSCAN(
         min_cluster_size=min_cluster_size,
         min_samples=min_samples,
         metric='precomputed'
     )
     
-    cluster_labels = clusterer.fit_predict(distance_matrix)
+    cluster_labels = clusterer.fit_predict(np.asarray(distance_matrix, dtype=np.float64))
     
     return clusterer, cluster_labels
 
-def evaluate_clustering(distance_matrix, cluster_labels):
+def run_hdbscan_knn_clustering(features_df, categorical_indices, min_cluster_size=15, min_samples=10,
+                                exact=True, n_neighbors=None, n_jobs=None):
+    """Run HDBSCAN under Gower distance without materializing the distance matrix
+
+    exact=True reproduces the dense labels in O(n) memory; exact=False clusters a
+    sparse k-NN graph (n_neighbors per point) for surveys too large for O(n^2) time.
+    """
+    features = GowerFeatures.from_frame(features_df, categorical_indices)
+    clusterer = knn_hdbscan(
+        features,
+        min_cluster_size=min_cluster_size,
+        min_samples=min_samples,
+        exact=exact,
+        n_neighbors=n_neighbors,
+        n_jobs=n_jobs
+    )
+    
+    return clusterer, clusterer.labels_
+
+def run_hdbscan_sweep(features_df, categorical_indices, grid, n_jobs=None, output_path=None,
+                      sample_size=None, distance_path=None, engine="gower"):
+    """Compute Gower distance once and fit HDBSCAN over a parameter grid
+
+    grid holds lists for min_cluster_size, min_samples and cluster_selection_epsilon
+    (see CLUSTERING_CONFIG['sweep']). distance_path keeps the matrix as a .npy the
+    workers map directly; otherwise it goes through a temporary file. engine='blocked'
+    avoids the one-shot gower_matrix for large surveys (see compute_gower_distance).
+    """
+    distance_matrix = compute_gower_distance(features_df, categorical_indices, out=distance_path, n_jobs=n_jobs,
+                                             engine=engine)
+    
+    results = hdbscan_sweep(
+        distance_matrix,
+        grid,
+        n_jobs=n_jobs,
+        output_path=output_path,
+        sample_size=sample_size
+    )
+    
+    return results
+
+def evaluate_clustering(distance_matrix, cluster_labels, sample_size=None, random_state=None):
+    """Average silhouette of the non-noise points, computed in place on the distance matrix
+
+    distance_matrix may be a np.memmap; sample_size estimates the score from a
+    stratified sample of rows (see silhouette_report for intervals and per-cluster scores).
+    """
     # Filter out noise points
     non_noise_mask = cluster_labels != -1
     
@@ -28,21 +78,7 @@ def evaluate_clustering(distance_matrix, cluster_labels):
         logger.warning("Less than 2 non-noise points, cannot compute silhouette score")
         return None
     
-    n_clusters = len(set(cluster_labels[non_noise_mask]))
-    if n_clusters < 2:
-        logger.warning("Less than 2 clusters found, cannot compute silhouette score")
-        return None
-    
-    # Extract distance matrix for non-noise points
-    filtered_distance = distance_matrix[non_noise_mask][:, non_noise_mask]
-    
-    # Diagonal is exactly zero for precomputed distances
-    np.fill_diagonal(filtered_distance, 0)
-    
-    silhouette_avg = silhouette_score(
-        filtered_distance,
-        cluster_labels[non_noise_mask], 
-        metric='precomputed'
-    )
+    report = silhouette_report(distance_matrix, cluster_labels, sample_size=sample_size,
+                               random_state=random_state)
     
-    return silhouette_avg
\ No newline at end of file
+    return report["silhouette_score"]
\ No newline at end of file
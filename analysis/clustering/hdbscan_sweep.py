@@ -0,0 +1,109 @@
+import os
+import shutil
+import logging
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from itertools import product
+from pathlib import Path
+import numpy as np
+import pandas as pd
+from analysis.utils.gower_engine import gower_knn, open_distance_memmap
+from analysis.utils.silhouette import silhouette_report
+from .knn_hdbscan import PrecomputedDistances, core_distances, exact_mst, hdbscan_from_mst
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+def parameter_grid(grid: dict) -> list:
+    """Every min_cluster_size / min_samples / cluster_selection_epsilon combination"""
+    return [
+        {"min_cluster_size": int(size), "min_samples": int(samples), "cluster_selection_epsilon": float(epsilon)}
+        for size, samples, epsilon in product(
+            grid["min_cluster_size"], grid["min_samples"], grid.get("cluster_selection_epsilon", [0.0])
+        )
+    ]
+
+# Per-process state for pool workers (set once by the initializer)
+_worker = {}
+
+def _init_worker(filename: str, offset: int, shape: tuple, dtype: str) -> None:
+    # Read-only map of the shared file: every worker reads the same page cache
+    _worker["distances"] = np.memmap(filename, dtype=dtype, mode="r", offset=offset, shape=shape)
+
+def _worker_mst(min_samples: int) -> tuple:
+    """Core distances and MST for one min_samples, shared by every fit that uses it"""
+    features = PrecomputedDistances(_worker["distances"])
+    _, knn_distances = gower_knn(features, min_samples + 1, n_jobs=1)
+    return min_samples, exact_mst(features, core_distances(knn_distances, min_samples))
+
+def _worker_fit(params: dict, mst: np.ndarray, sample_size: int, random_state: int) -> dict:
+    clusterer = hdbscan_from_mst(mst, **params)
+    report = silhouette_report(_worker["distances"], clusterer.labels_, sample_size=sample_size,
+                               random_state=random_state)
+    return {
+        **params,
+        "silhouette_score": report["silhouette_score"],
+        "silhouette_ci_low": report.get("ci_low"),
+        "silhouette_ci_high": report.get("ci_high"),
+        "n_clusters": report["n_clusters"],
+        "noise_ratio": report["noise_ratio"],
+        "mean_persistence": float(np.mean(clusterer.cluster_persistence_)) if report["n_clusters"] else None
+    }
+
+def rank_results(results: pd.DataFrame) -> pd.DataFrame:
+    """Best silhouette first, ties broken by less noise; fits without a score go last"""
+    ranked = results.sort_values(["silhouette_score", "noise_ratio"], ascending=[False, True],
+                                 na_position="last", kind="stable").reset_index(drop=True)
+    ranked.insert(0, "rank", np.arange(1, len(ranked) + 1))
+    return ranked
+
+def hdbscan_sweep(distance_matrix, grid: dict, n_jobs: int = None, output_path=None,
+                  sample_size: int = None, random_state: int = 42) -> pd.DataFrame:
+    """Fit HDBSCAN over a parameter grid on one shared precomputed distance matrix
+
+    The matrix is memory-mapped by every worker (a .npy memmap is used in place;
+    anything else is written once to a temporary .npy), so no worker holds a copy.
+    Core distances and the mutual-reachability MST depend only on min_samples, so
+    they are built once per min_samples value and reused by every min_cluster_size /
+    cluster_selection_epsilon fit. Each fit is scored by silhouette (estimated from
+    sample_size rows if given), cluster count and noise ratio; the ranked table is
+    returned and written to output_path (.csv) if given.
+    """
+    n_rows = distance_matrix.shape[0]
+    n_jobs = os.cpu_count() if n_jobs in (None, -1) else n_jobs
+    combos = parameter_grid(grid)
+    for params in combos:
+        params["min_samples"] = max(1, min(n_rows - 1, params["min_samples"]))
+
+    # Workers need a file to map: use the matrix's own file or a temporary one
+    shared, tmp_dir = distance_matrix, None
+    if not (isinstance(distance_matrix, np.memmap) and distance_matrix.filename):
+        tmp_dir = tempfile.mkdtemp(prefix="hdbscan_sweep_")
+        shared = open_distance_memmap(os.path.join(tmp_dir, "distance.npy"), n_rows)
+        shared[:] = distance_matrix
+        shared.flush()
+
+    try:
+        initargs = (shared.filename, shared.offset, shared.shape, shared.dtype.str)
+        sample_sizes = sorted({params["min_samples"] for params in combos})
+        with ProcessPoolExecutor(max_workers=n_jobs, initializer=_init_worker, initargs=initargs) as pool:
+            msts = dict(pool.map(_worker_mst, sample_sizes))
+            logger.info(f"Built {len(msts)} mutual-reachability trees for {len(combos)} HDBSCAN fits")
+
+            fits = [
+                pool.submit(_worker_fit, params, msts[params["min_samples"]], sample_size, random_state)
+                for params in combos
+            ]
+            results = rank_results(pd.DataFrame([fit.result() for fit in fits]))
+    finally:
+        if tmp_dir is not None:
+            del shared
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+
+    if output_path is not None:
+        Path(output_path).parent.mkdir(parents=True, exist_ok=True)
+        results.to_csv(output_path, index=False)
+        logger.info(f"Saved {len(results)} ranked HDBSCAN fits to {output_path}")
+
+    return results
@@ -0,0 +1,213 @@
+import heapq
+import logging
+import numpy as np
+from scipy.sparse import coo_matrix, csgraph
+from hdbscan import HDBSCAN
+from analysis.utils.gower_engine import gower_knn
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Bytes of Gower distances computed at once while bridging graph components
+BRIDGE_BLOCK_BYTES = 256 * 1024 * 1024
+
+# Neighbours per point in the approximate k-NN graph when none are given
+DEFAULT_NEIGHBORS = 15
+
+class PrecomputedDistances():
+    """A precomputed (or memory-mapped) distance matrix behind GowerFeatures' block interface
+
+    Lets gower_knn and exact_mst run on an existing matrix one block of rows at a time.
+    """
+    def __init__(self, matrix):
+        self.matrix = matrix
+
+    @property
+    def n_rows(self) -> int:
+        return self.matrix.shape[0]
+
+    def block(self, rows, cols) -> np.ndarray:
+        return np.asarray(self.matrix[rows][:, cols])
+
+def core_distances(knn_distances: np.ndarray, min_samples: int) -> np.ndarray:
+    """Distance to the min_samples-th neighbour, counting the point itself like hdbscan does"""
+    return knn_distances[:, min(min_samples, knn_distances.shape[1] - 1)].astype(np.float64)
+
+def exact_mst(features, core: np.ndarray) -> np.ndarray:
+    """Mutual-reachability minimum spanning tree by Prim's algorithm in O(n) memory
+
+    Computes one Gower row per step instead of holding the n x n matrix, and follows
+    hdbscan's mst_linkage_core step for step (same start node and tie-breaking), so
+    the resulting hierarchy and labels match the dense precomputed path.
+    """
+    n_rows = features.n_rows
+    in_tree = np.zeros(n_rows, dtype=bool)
+    current = np.full(n_rows, np.inf)
+    sources = np.zeros(n_rows, dtype=np.intp)
+    mst = np.zeros((n_rows - 1, 3))
+
+    node = 0
+    everyone = slice(0, n_rows)
+    for i in range(n_rows - 1):
+        in_tree[node] = True
+        reach = features.block(slice(node, node + 1), everyone)[0].astype(np.float64)
+        np.maximum(reach, core, out=reach)
+        np.maximum(reach, core[node], out=reach)
+
+        closer = (reach < current) & ~in_tree
+        current[closer] = reach[closer]
+        sources[closer] = node
+
+        candidates = np.where(in_tree, np.inf, current)
+        new_node = int(np.argmin(candidates))
+        mst[i] = (sources[new_node], new_node, candidates[new_node])
+        node = new_node
+
+    return mst
+
+def _bridge_components(features, core: np.ndarray, components: np.ndarray, n_components: int) -> list:
+    """Cheapest mutual-reachability edge from every component to the rest of the data"""
+    n_rows = features.n_rows
+    step = max(1, BRIDGE_BLOCK_BYTES // (4 * n_rows))
+    edges = []
+    for component in range(n_components):
+        members = np.flatnonzero(components == component)
+        outside = components != component
+        best = (np.inf, -1, -1)
+        for start in range(0, len(members), step):
+            chunk = members[start:start + step]
+            reach = features.block(chunk, slice(0, n_rows)).astype(np.float64)
+            np.maximum(reach, core[chunk, None], out=reach)
+            np.maximum(reach, core[None, :], out=reach)
+            reach[:, ~outside] = np.inf
+            row, col = np.unravel_index(np.argmin(reach), reach.shape)
+            if reach[row, col] < best[0]:
+                best = (reach[row, col], chunk[row], col)
+        edges.append((best[1], best[2], best[0]))
+    return edges
+
+def knn_graph_mst(features, knn_indices: np.ndarray, knn_distances: np.ndarray, core: np.ndarray) -> np.ndarray:
+    """Minimum spanning tree of the mutual-reachability k-NN graph in O(n * k) memory
+
+    Approximates the exact tree: edges between points that are not among each
+    other's k nearest neighbours are missing. Disconnected parts of the graph are
+    joined by their cheapest mutual-reachability edge. Prim's algorithm runs over
+    the graph with exact_mst's start node and tie-breaking, because Gower distances
+    tie a lot and the order tied edges join decides the condensed tree.
+    """
+    n_rows, k = knn_indices.shape
+    rows = np.repeat(np.arange(n_rows), k)
+    cols = knn_indices.ravel()
+    keep = rows != cols
+    rows, cols = rows[keep], cols[keep]
+    weights = np.maximum(np.maximum(knn_distances.ravel()[keep].astype(np.float64), core[rows]), core[cols])
+
+    while True:
+        # Shift weights by 1 so zero-distance edges (identical respondents) stay edges
+        graph = coo_matrix((weights + 1.0, (rows, cols)), shape=(n_rows, n_rows)).tocsr()
+        graph = graph.maximum(graph.T).tocsr()
+        n_components, components = csgraph.connected_components(graph, directed=False)
+        if n_components == 1:
+            break
+        logger.info(f"Joining {n_components} disconnected k-NN graph components")
+        bridges = np.array(_bridge_components(features, core, components, n_components))
+        rows = np.concatenate([rows, bridges[:, 0].astype(np.int64)])
+        cols = np.concatenate([cols, bridges[:, 1].astype(np.int64)])
+        weights = np.concatenate([weights, bridges[:, 2]])
+
+    in_tree = np.zeros(n_rows, dtype=bool)
+    current = np.full(n_rows, np.inf)
+    sources = np.zeros(n_rows, dtype=np.intp)
+    mst = np.zeros((n_rows - 1, 3))
+    heap = []
+
+    node = 0
+    for i in range(n_rows - 1):
+        in_tree[node] = True
+        start, end = graph.indptr[node], graph.indptr[node + 1]
+        neighbours, reach = graph.indices[start:end], graph.data[start:end] - 1.0
+        closer = (reach < current[neighbours]) & ~in_tree[neighbours]
+        current[neighbours[closer]] = reach[closer]
+        sources[neighbours[closer]] = node
+        for neighbour, distance in zip(neighbours[closer].tolist(), reach[closer].tolist()):
+            heapq.heappush(heap, (distance, neighbour))
+
+        # Skip entries for nodes already joined or since reached more cheaply
+        while True:
+            distance, new_node = heapq.heappop(heap)
+            if not in_tree[new_node] and distance == current[new_node]:
+                break
+        mst[i] = (sources[new_node], new_node, distance)
+        node = new_node
+
+    return mst
+
+def hdbscan_from_mst(mst: np.ndarray, min_cluster_size: int = 15, min_samples: int = 10,
+                     cluster_selection_epsilon: float = 0.0) -> HDBSCAN:
+    """A fitted HDBSCAN built from a mutual-reachability MST
+
+    Runs the same tree-to-labels steps as HDBSCAN.fit, so labels_, probabilities_,
+    cluster_persistence_ and the condensed / single linkage trees are available.
+    Uses hdbscan's private helpers (pinned in requirements.txt), imported here so the
+    rest of the module keeps working if a release moves them.
+    """
+    try:
+        from hdbscan.hdbscan_ import _tree_to_labels
+        from hdbscan._hdbscan_linkage import label
+    except ImportError as e:
+        raise ImportError(
+            "hdbscan_from_mst needs hdbscan's private _tree_to_labels and _hdbscan_linkage.label, "
+            "which this hdbscan version does not provide; install the version pinned in requirements.txt "
+            "or fit HDBSCAN(metric='precomputed') on a dense distance matrix instead"
+        ) from e
+
+    clusterer = HDBSCAN(
+        min_cluster_size=min_cluster_size,
+        min_samples=min_samples,
+        cluster_selection_epsilon=cluster_selection_epsilon,
+        metric='precomputed'
+    )
+    # Sort edges by weight and convert to the single linkage hierarchy
+    mst = mst[np.argsort(mst.T[2]), :]
+    single_linkage_tree = label(mst)
+
+    (
+        clusterer.labels_,
+        clusterer.probabilities_,
+        clusterer.cluster_persistence_,
+        clusterer._condensed_tree,
+        clusterer._single_linkage_tree
+    ) = _tree_to_labels(
+        None,
+        single_linkage_tree,
+        min_cluster_size=min_cluster_size,
+        cluster_selection_method=clusterer.cluster_selection_method,
+        allow_single_cluster=clusterer.allow_single_cluster,
+        match_reference_implementation=clusterer.match_reference_implementation,
+        cluster_selection_epsilon=cluster_selection_epsilon
+    )
+    clusterer._min_spanning_tree = None
+    return clusterer
+
+def knn_hdbscan(features, min_cluster_size: int = 15, min_samples: int = 10, exact: bool = True,
+                n_neighbors: int = None, cluster_selection_epsilon: float = 0.0, n_jobs: int = None) -> HDBSCAN:
+    """HDBSCAN under Gower distance without an n x n matrix
+
+    Core distances come from a blocked exact k-NN search. exact=True then builds the
+    exact mutual-reachability MST (O(n^2) time, O(n) memory, labels identical to the
+    dense path); exact=False uses the MST of the k-NN graph with n_neighbors
+    neighbours per point (DEFAULT_NEIGHBORS if None; O(n * k) memory and much less time; labels can differ when the k-NN graph
+    misses edges the exact tree uses).
+    """
+    min_samples = max(1, min(features.n_rows - 1, min_samples))
+    n_neighbors = 0 if exact else n_neighbors or DEFAULT_NEIGHBORS
+    k = max(min_samples, n_neighbors) + 1
+    knn_indices, knn_distances = gower_knn(features, k, n_jobs=n_jobs)
+    core = core_distances(knn_distances, min_samples)
+
+    if exact:
+        mst = exact_mst(features, core)
+    else:
+        mst = knn_graph_mst(features, knn_indices, knn_distances, core)
+    return hdbscan_from_mst(mst, min_cluster_size, min_samples, cluster_selection_epsilon)
@@ -5,6 +5,11 @@ CLUSTERING_CONFIG = {
         'min_samples': 4,
         'cluster_selection_epsilon': 0.1
     },
+    'sweep': {
+        'min_cluster_size': [10, 15, 25, 40, 60],
+        'min_samples': [2, 4, 8, 12],
+        'cluster_selection_epsilon': [0.0, 0.05, 0.1]
+    },
     'preprocessing': {
         'categorical_columns': [
             'Gender', 'Country', 'treatment', 'work_interfere',
@@ -12,6 +17,9 @@ CLUSTERING_CONFIG = {
         ],
         'numeric_columns': ['Age'],
         'scale_numeric': True
+    },
+    'cache': {
+        'max_size_gb': 20
     }
 }
 
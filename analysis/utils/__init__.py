@@ -3,9 +3,20 @@ from .preprocessing import (
     compute_gower_distance,
     prepare_time_series
 )
+from .gower_engine import GowerFeatures, gower_distance, gower_knn, open_distance_memmap
+from .silhouette import silhouette_report
+from .artifact_cache import ArtifactCache, cached_clustering_inputs, frame_fingerprint
 
 __all__ = [
     "prepare_clustering_features",
     "compute_gower_distance", 
-    "prepare_time_series"
+    "prepare_time_series",
+    "GowerFeatures",
+    "gower_distance",
+    "gower_knn",
+    "open_distance_memmap",
+    "silhouette_report",
+    "ArtifactCache",
+    "cached_clustering_inputs",
+    "frame_fingerprint"
 ]
\ No newline at end of file
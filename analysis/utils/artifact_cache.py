@@ -0,0 +1,165 @@
+import os
+import json
+import time
+import pickle
+import shutil
+import hashlib
+import logging
+from pathlib import Path
+import numpy as np
+import pandas as pd
+from analysis.config.model_config import CLUSTERING_CONFIG
+from .preprocessing import prepare_clustering_features, compute_gower_distance
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Bump when the preprocessing or Gower engine changes what a cached entry holds
+CACHE_VERSION = 2
+
+# Outside the repository so cached matrices can never be committed; override with ANALYSIS_CACHE_DIR
+DEFAULT_CACHE_DIR = Path(os.environ.get("XDG_CACHE_HOME", Path.home() / ".cache")) / "mental_health_analysis"
+DEFAULT_MAX_BYTES = int(CLUSTERING_CONFIG['cache']['max_size_gb'] * 1024 ** 3)
+
+DISTANCE_FILE = "distance.npy"
+FEATURES_FILE = "features.pkl"
+
+def frame_fingerprint(df: pd.DataFrame, categorical_cols: list, numeric_cols: list, scaler_params: dict = None,
+                      engine: str = "gower") -> str:
+    """sha256 of the clustered columns' values, index and dtypes plus the column lists, scaler settings and Gower engine"""
+    columns = list(categorical_cols) + list(numeric_cols)
+    digest = hashlib.sha256()
+    digest.update(json.dumps({
+        "version": CACHE_VERSION,
+        "categorical_cols": list(categorical_cols),
+        "numeric_cols": list(numeric_cols),
+        "scaler_params": scaler_params or {},
+        "engine": engine,
+        "dtypes": [str(df[col].dtype) for col in columns]
+    }, sort_keys=True, default=str).encode())
+    digest.update(pd.util.hash_pandas_object(df[columns], index=True).to_numpy().tobytes())
+    return digest.hexdigest()
+
+class ArtifactCache():
+    """On-disk cache of clustering inputs and fitted models, one directory per fingerprint
+
+    Distance matrices are stored as .npy files and opened as read-only memmaps;
+    everything else is pickled next to them. Reading an entry marks it as used, and
+    the least recently used entries are deleted once the cache exceeds max_bytes.
+    """
+    def __init__(self, root=None, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.root = Path(root or os.environ.get("ANALYSIS_CACHE_DIR", DEFAULT_CACHE_DIR))
+        self.max_bytes = max_bytes
+        self.root.mkdir(parents=True, exist_ok=True)
+
+    def entry(self, key: str) -> Path:
+        return self.root / key
+
+    def touch(self, key: str) -> None:
+        """Record a use; the entry directory's mtime is its LRU timestamp"""
+        now = time.time()
+        os.utime(self.entry(key), (now, now))
+
+    def load_distance(self, key: str):
+        path = self.entry(key) / DISTANCE_FILE
+        if not path.exists():
+            return None
+        self.touch(key)
+        return np.load(path, mmap_mode="r")
+
+    def store_distance(self, key: str, compute) -> np.ndarray:
+        """Write compute(out_path) to the entry, then reopen it as a memmap
+
+        compute receives a temporary .npy path to write into (as compute_gower_distance
+        does), so an interrupted run never leaves a partial matrix under the real name.
+        """
+        entry = self.entry(key)
+        entry.mkdir(parents=True, exist_ok=True)
+        tmp_path = entry / f"{DISTANCE_FILE}.{os.getpid()}.tmp"
+        try:
+            result = compute(tmp_path)
+            if isinstance(result, np.memmap):
+                result.flush()
+            del result
+            os.replace(tmp_path, entry / DISTANCE_FILE)
+        finally:
+            tmp_path.unlink(missing_ok=True)
+        self.evict(keep=key)
+        return self.load_distance(key)
+
+    def load(self, key: str, name: str):
+        path = self.entry(key) / name
+        if not path.exists():
+            return None
+        with open(path, "rb") as f:
+            obj = pickle.load(f)
+        self.touch(key)
+        return obj
+
+    def store(self, key: str, name: str, obj) -> None:
+        entry = self.entry(key)
+        entry.mkdir(parents=True, exist_ok=True)
+        tmp_path = entry / f"{name}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as f:
+            pickle.dump(obj, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, entry / name)
+        self.touch(key)
+        self.evict(keep=key)
+
+    def get_or_create(self, key: str, name: str, create):
+        """Cached pickle for (key, name), calling create() and storing it on a miss"""
+        obj = self.load(key, name)
+        if obj is None:
+            obj = create()
+            self.store(key, name, obj)
+        return obj
+
+    def size(self, key: str) -> int:
+        return sum(path.stat().st_size for path in self.entry(key).iterdir() if path.is_file())
+
+    def evict(self, keep: str = None) -> list:
+        """Delete least recently used entries until the cache fits in max_bytes"""
+        entries = sorted((path for path in self.root.iterdir() if path.is_dir()), key=lambda path: path.stat().st_mtime)
+        sizes = {path.name: self.size(path.name) for path in entries}
+        total = sum(sizes.values())
+        evicted = []
+        for path in entries:
+            if total <= self.max_bytes:
+                break
+            if path.name == keep:
+                continue
+            shutil.rmtree(path, ignore_errors=True)
+            total -= sizes[path.name]
+            evicted.append(path.name)
+        if evicted:
+            logger.info(f"Evicted {len(evicted)} cached entries; cache now {total / 1024 ** 2:.1f} MB")
+        return evicted
+
+def cached_clustering_inputs(df: pd.DataFrame, categorical_cols: list, numeric_cols: list, cache: ArtifactCache = None,
+                             scaler_params: dict = None, n_jobs: int = None, engine: str = "gower") -> tuple:
+    """prepare_clustering_features + compute_gower_distance, loaded from the cache when the inputs are unchanged
+
+    Returns (key, features_df, label_encoders, scaler, distance_matrix); the matrix is a
+    read-only memmap of the cached .npy and key can be passed to cache.get_or_create
+    to store fitted clusterers alongside it.
+    """
+    cache = cache or ArtifactCache()
+    key = frame_fingerprint(df, categorical_cols, numeric_cols, scaler_params, engine)
+
+    prepared = cache.load(key, FEATURES_FILE)
+    distance_matrix = cache.load_distance(key) if prepared is not None else None
+    if distance_matrix is not None:
+        logger.info(f"Loaded cached Gower distance {distance_matrix.shape} for {key[:12]}")
+        return (key, *prepared, distance_matrix)
+
+    prepared = prepare_clustering_features(df, categorical_cols, numeric_cols, scaler_params)
+    features_df = prepared[0]
+    categorical_indices = list(range(len(categorical_cols)))
+    cache.store(key, FEATURES_FILE, prepared)
+    distance_matrix = cache.store_distance(
+        key,
+        lambda out: compute_gower_distance(features_df, categorical_indices, out=out, n_jobs=n_jobs, engine=engine)
+    )
+    logger.info(f"Cached Gower distance {distance_matrix.shape} for {key[:12]}")
+    return (key, *prepared, distance_matrix)
@@ -1,30 +1,24 @@
-from sklearn.metrics import silhouette_score, mean_absolute_error, mean_squared_error
+from sklearn.metrics import mean_absolute_error, mean_squared_error
 from insights.prompt_templates import COMPREHENSIVE_ANALYSIS_PROMPT
 import numpy as np
 import logging
+from .silhouette import silhouette_report
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-def evaluate_clustering_quality(distance_matrix, labels):
-    """Comprehensive clustering evaluation"""
-    # Remove noise points
-    non_noise_mask = labels != -1
-    if len(np.unique(labels[non_noise_mask])) < 2:
-        return {"silhouette_score": None, "noise_ratio": np.mean(labels == -1)}
-    
-    silhouette_avg = silhouette_score(
-        1 - distance_matrix[non_noise_mask][:, non_noise_mask], 
-        labels[non_noise_mask], 
-        metric='precomputed'
-    )
-    
-    return {
-        "silhouette_score": silhouette_avg,
-        "n_clusters": len(np.unique(labels[non_noise_mask])),
-        "noise_ratio": np.mean(labels == -1)
-    }
+def evaluate_clustering_quality(distance_matrix, labels, sample_size=None, confidence=0.95, random_state=None):
+    """Comprehensive clustering evaluation
+
+    Silhouette (overall and per cluster) is computed on the Gower distances in
+    chunks, without copying the matrix; sample_size switches to a stratified
+    estimate with confidence intervals. Earlier versions scored 1 - distance (the
+    Gower similarity) as if it were a distance, so their silhouette scores are not
+    comparable with these.
+    """
+    return silhouette_report(distance_matrix, labels, sample_size=sample_size, confidence=confidence,
+                             random_state=random_state)
 
 def evaluate_forecast_accuracy(actual, predicted):
     """Time series forecasting metrics"""
@@ -0,0 +1,192 @@
+import os
+import shutil
+import logging
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+import numpy as np
+import pandas as pd
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+DEFAULT_BLOCK_ROWS = 2048
+
+class GowerFeatures():
+    """Columns encoded once for blocked Gower distance
+
+    Categorical columns become int32 codes compared for equality; numeric columns are
+    shifted and divided by their range up front, so a block only needs |a - b|.
+    Missing values should be dropped first (prepare_clustering_features does).
+    """
+    def __init__(self, codes: np.ndarray, numeric: np.ndarray, cat_weights: np.ndarray,
+                 num_weights: np.ndarray):
+        self.codes = codes
+        self.numeric = numeric
+        self.cat_weights = cat_weights
+        self.num_weights = num_weights
+        self.weight_sum = float(cat_weights.sum() + num_weights.sum())
+
+    @property
+    def n_rows(self) -> int:
+        return len(self.codes)
+
+    @classmethod
+    def from_frame(cls, df, categorical_indices, weights=None) -> "GowerFeatures":
+        df = df if isinstance(df, pd.DataFrame) else pd.DataFrame(np.asarray(df))
+        categorical_indices = set(categorical_indices)
+        is_cat = np.array([i in categorical_indices for i in range(df.shape[1])], dtype=bool)
+        weights = np.ones(df.shape[1]) if weights is None else np.asarray(weights, dtype=np.float64)
+
+        codes = np.empty((len(df), int(is_cat.sum())), dtype=np.int32)
+        for k, col in enumerate(df.columns[is_cat]):
+            codes[:, k] = pd.factorize(df[col])[0]
+
+        # Range-normalized numerics: |a - b| of these is the per-column Gower term
+        numeric = df.loc[:, df.columns[~is_cat]].to_numpy(dtype=np.float64)
+        lows, highs = numeric.min(axis=0, initial=np.inf), numeric.max(axis=0, initial=-np.inf)
+        ranges = highs - lows
+        numeric = np.divide(numeric - lows, ranges, out=np.zeros_like(numeric), where=ranges > 0)
+
+        return cls(codes, numeric.astype(np.float32), weights[is_cat].astype(np.float32),
+                   weights[~is_cat].astype(np.float32))
+
+    def block(self, rows, cols) -> np.ndarray:
+        """float32 Gower distances between two sets of rows (slices or index arrays)"""
+        row_codes, col_codes = self.codes[rows], self.codes[cols]
+        row_numeric, col_numeric = self.numeric[rows], self.numeric[cols]
+        out = np.zeros((len(row_codes), len(col_codes)), dtype=np.float32)
+        for k, weight in enumerate(self.cat_weights):
+            mismatch = row_codes[:, k, None] != col_codes[None, :, k]
+            out += mismatch * weight if weight != 1 else mismatch
+        for k, weight in enumerate(self.num_weights):
+            delta = np.abs(row_numeric[:, k, None] - col_numeric[None, :, k])
+            out += delta * weight if weight != 1 else delta
+        out /= self.weight_sum
+        return out
+
+def block_pairs(n_rows: int, block_rows: int) -> list:
+    """Upper-triangle (row slice, column slice) pairs covering an n x n matrix"""
+    starts = range(0, n_rows, block_rows)
+    bounds = [slice(start, min(start + block_rows, n_rows)) for start in starts]
+    return [(rows, cols) for i, rows in enumerate(bounds) for cols in bounds[i:]]
+
+def fill_block(features: GowerFeatures, out: np.ndarray, rows: slice, cols: slice) -> None:
+    """Write one block and its mirror image"""
+    block = features.block(rows, cols)
+    if rows == cols:
+        np.fill_diagonal(block, 0)
+        out[rows, cols] = block
+    else:
+        out[rows, cols] = block
+        out[cols, rows] = block.T
+
+# Per-process state for pool workers (set once by the initializer)
+_worker = {}
+
+def _init_worker(features: GowerFeatures, filename: str, offset: int, n_rows: int) -> None:
+    _worker["features"] = features
+    _worker["out"] = np.memmap(filename, dtype=np.float32, mode="r+", offset=offset, shape=(n_rows, n_rows))
+
+def _fill_worker_blocks(pairs: list) -> int:
+    for rows, cols in pairs:
+        fill_block(_worker["features"], _worker["out"], rows, cols)
+    return len(pairs)
+
+def knn_block(features: GowerFeatures, rows: slice, k: int) -> tuple:
+    """k nearest rows (self included) of a row block, sorted by distance"""
+    block = features.block(rows, slice(0, features.n_rows))
+    nearest = np.argpartition(block, k - 1, axis=1)[:, :k]
+    distances = np.take_along_axis(block, nearest, axis=1)
+    order = np.argsort(distances, axis=1, kind="stable")
+    return np.take_along_axis(nearest, order, axis=1), np.take_along_axis(distances, order, axis=1)
+
+def _init_knn_worker(features: GowerFeatures, k: int) -> None:
+    _worker["features"] = features
+    _worker["k"] = k
+
+def _knn_worker_block(rows: slice) -> tuple:
+    return rows, knn_block(_worker["features"], rows, _worker["k"])
+
+def gower_knn(features: GowerFeatures, k: int, n_jobs: int = None, max_block_bytes: int = 256 * 1024 * 1024) -> tuple:
+    """Exact k-nearest-neighbour search under Gower distance, in O(n * k) memory
+
+    Each row block is compared against every row and reduced to its k smallest
+    distances straight away. Returns (indices, distances), both (n, k) and sorted;
+    every row's own zero distance is among them.
+    """
+    n_rows = features.n_rows
+    k = min(k, n_rows)
+    n_jobs = os.cpu_count() if n_jobs in (None, -1) else n_jobs
+    block_rows = max(1, min(n_rows, max_block_bytes // (4 * n_rows)))
+    blocks = [slice(start, min(start + block_rows, n_rows)) for start in range(0, n_rows, block_rows)]
+
+    indices = np.empty((n_rows, k), dtype=np.int64)
+    distances = np.empty((n_rows, k), dtype=np.float32)
+    if n_jobs <= 1 or len(blocks) == 1:
+        for rows in blocks:
+            indices[rows], distances[rows] = knn_block(features, rows, k)
+        return indices, distances
+
+    with ProcessPoolExecutor(max_workers=n_jobs, initializer=_init_knn_worker, initargs=(features, k)) as pool:
+        for rows, (nearest, nearest_distances) in pool.map(_knn_worker_block, blocks):
+            indices[rows], distances[rows] = nearest, nearest_distances
+    return indices, distances
+
+def open_distance_memmap(path, n_rows: int) -> np.memmap:
+    """Create a float32 n x n .npy file opened as a writable memmap"""
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+    return np.lib.format.open_memmap(str(path), mode="w+", dtype=np.float32, shape=(n_rows, n_rows))
+
+def gower_distance(df, categorical_indices, out=None, n_jobs: int = None, block_rows: int = DEFAULT_BLOCK_ROWS,
+                   weights=None) -> np.ndarray:
+    """Blocked float32 Gower distance matrix, optionally on a process pool
+
+    out may be None (in-memory array), a path (written as a memory-mappable .npy) or a
+    preallocated float32 (n, n) array or np.memmap. Workers write their blocks straight
+    into a file-backed output, so only one block per worker is held in memory; with an
+    in-memory output, a pool writes through a temporary file first.
+    n_jobs=None uses every core.
+    """
+    features = GowerFeatures.from_frame(df, categorical_indices, weights)
+    n_rows = features.n_rows
+    n_jobs = os.cpu_count() if n_jobs in (None, -1) else n_jobs
+
+    if isinstance(out, (str, Path)):
+        out = open_distance_memmap(out, n_rows)
+    elif out is not None and (out.shape != (n_rows, n_rows) or out.dtype != np.float32):
+        raise ValueError(f"out must be a float32 array of shape {(n_rows, n_rows)}")
+
+    pairs = block_pairs(n_rows, block_rows)
+    if n_jobs <= 1 or len(pairs) == 1:
+        out = np.empty((n_rows, n_rows), dtype=np.float32) if out is None else out
+        for rows, cols in pairs:
+            fill_block(features, out, rows, cols)
+        return out
+
+    # Workers need a file to map: use the output's own file or a temporary one
+    target, tmp_dir = out, None
+    if not (isinstance(out, np.memmap) and out.filename):
+        tmp_dir = tempfile.mkdtemp(prefix="gower_")
+        target = open_distance_memmap(os.path.join(tmp_dir, "distance.npy"), n_rows)
+
+    try:
+        # Interleave block pairs so every task gets a similar amount of work
+        tasks = [pairs[i::n_jobs * 4] for i in range(min(len(pairs), n_jobs * 4))]
+        with ProcessPoolExecutor(max_workers=n_jobs, initializer=_init_worker,
+                                 initargs=(features, target.filename, target.offset, n_rows)) as pool:
+            done = sum(pool.map(_fill_worker_blocks, tasks))
+        logger.info(f"Computed {done} Gower blocks of {block_rows} rows for {n_rows} rows on {n_jobs} processes")
+
+        if tmp_dir is None:
+            target.flush()
+            return target
+        if out is None:
+            return np.array(target)
+        out[:] = target
+        return out
+    finally:
+        if tmp_dir is not None:
+            del target
+            shutil.rmtree(tmp_dir, ignore_errors=True)
@@ -2,13 +2,14 @@ import pandas as pd
 import numpy as np
 from sklearn.preprocessing import StandardScaler, LabelEncoder
 from gower import gower_matrix
+from .gower_engine import gower_distance, open_distance_memmap, DEFAULT_BLOCK_ROWS
 import logging
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-def prepare_clustering_features(df, categorical_cols, numeric_cols):
+def prepare_clustering_features(df, categorical_cols, numeric_cols, scaler_params=None):
     # Select only relevant columns
     feature_df = df[categorical_cols + numeric_cols].copy()
     
@@ -23,17 +24,38 @@ def prepare_clustering_features(df, categorical_cols, numeric_cols):
         le_dict[col] = le
     
     # Scale numeric variables
-    scaler = StandardScaler()
+    scaler = StandardScaler(**(scaler_params or {}))
     feature_df[numeric_cols] = scaler.fit_transform(feature_df[numeric_cols])
     
     return feature_df, le_dict, scaler
 
-def compute_gower_distance(df, categorical_indices):
-    # Create categorical mask
-    cat_features = [i in categorical_indices for i in range(df.shape[1])]
-    
+def compute_gower_distance(df, categorical_indices, out=None, n_jobs=None, block_rows=DEFAULT_BLOCK_ROWS,
+                           engine="gower"):
+    """Gower distance matrix (float32)
+
+    engine='gower' is the original one-shot gower_matrix call and stays the default, so
+    existing labels and artifacts are reproduced exactly. engine='blocked' computes row
+    blocks on a process pool in bounded memory; it differs from gower_matrix by up to
+    ~6e-8, which can change HDBSCAN labels. Either engine writes to an np.memmap / .npy
+    path given as `out`.
+    """
+    if engine == "gower":
+        # Create categorical mask
+        cat_features = [i in categorical_indices for i in range(df.shape[1])]
+        distance_matrix = gower_matrix(df.values, cat_features=cat_features)
+        if out is None:
+            return distance_matrix
+        if not isinstance(out, np.ndarray):
+            out = open_distance_memmap(out, len(distance_matrix))
+        out[:] = distance_matrix
+        if isinstance(out, np.memmap):
+            out.flush()
+        return out
+    if engine != "blocked":
+        raise ValueError(f"Unknown Gower engine: {engine}")
+
     # Compute Gower distance
-    distance_matrix = gower_matrix(df.values, cat_features=cat_features)
+    distance_matrix = gower_distance(df, categorical_indices, out=out, n_jobs=n_jobs, block_rows=block_rows)
     
     return distance_matrix
 
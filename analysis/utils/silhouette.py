@@ -0,0 +1,123 @@
+import logging
+import numpy as np
+from scipy.stats import norm
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+def cluster_members(labels) -> tuple:
+    """Cluster ids and a (n, n_clusters) float64 membership matrix, noise rows all zero"""
+    labels = np.asarray(labels)
+    clusters = np.unique(labels[labels != -1])
+    membership = (labels[:, None] == clusters[None, :]).astype(np.float64)
+    return clusters, membership
+
+def cluster_distance_sums(distance_matrix, rows: np.ndarray, membership: np.ndarray,
+                          max_block_bytes: int = 256 * 1024 * 1024) -> np.ndarray:
+    """Sum of distances from each row to the members of every cluster
+
+    Reads the matrix a block of rows at a time (contiguous reads for a memmap) and
+    reduces each block with one product against the membership matrix, so nothing
+    n x n is copied. Each row's own diagonal entry is subtracted out.
+    """
+    n_rows = distance_matrix.shape[1]
+    step = max(1, max_block_bytes // (8 * n_rows))
+    sums = np.empty((len(rows), membership.shape[1]))
+    for start in range(0, len(rows), step):
+        chunk = rows[start:start + step]
+        # Runs of consecutive rows read as a slice instead of a fancy-indexed copy
+        if chunk[-1] - chunk[0] == len(chunk) - 1:
+            block = distance_matrix[chunk[0]:chunk[-1] + 1]
+        else:
+            block = distance_matrix[chunk]
+        sums[start:start + step] = block @ membership
+        sums[start:start + step] -= np.asarray(distance_matrix[chunk, chunk], dtype=np.float64)[:, None] * membership[chunk]
+    return sums
+
+def silhouette_rows(sums: np.ndarray, own: np.ndarray, sizes: np.ndarray) -> np.ndarray:
+    """Silhouette of each row from its cluster distance sums, 0 in singleton clusters like sklearn"""
+    n_rows = len(sums)
+    own_size = sizes[own]
+    a = sums[np.arange(n_rows), own] / np.maximum(own_size - 1, 1)
+    other_means = sums / sizes[None, :]
+    other_means[np.arange(n_rows), own] = np.inf
+    b = other_means.min(axis=1)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        s = (b - a) / np.maximum(a, b)
+    return np.where(own_size > 1, np.nan_to_num(s), 0.0)
+
+def stratified_sample(labels: np.ndarray, sample_size: int, rng) -> np.ndarray:
+    """Sorted non-noise row indices, sampled from each cluster in proportion to its size"""
+    clustered = np.flatnonzero(labels != -1)
+    if sample_size >= len(clustered):
+        return clustered
+    clusters, counts = np.unique(labels[clustered], return_counts=True)
+    quotas = np.maximum(np.round(counts * sample_size / len(clustered)).astype(int), np.minimum(counts, 2))
+    picks = [
+        rng.choice(clustered[labels[clustered] == cluster], size=quota, replace=False)
+        for cluster, quota in zip(clusters, quotas)
+    ]
+    return np.sort(np.concatenate(picks))
+
+def silhouette_report(distance_matrix, labels, sample_size: int = None, confidence: float = 0.95,
+                      random_state: int = None, max_block_bytes: int = 256 * 1024 * 1024) -> dict:
+    """Silhouette score and per-cluster silhouettes in one pass over a precomputed distance matrix
+
+    Noise points (-1) are left out, as before. With sample_size, the silhouette is
+    estimated from a stratified sample of rows (each still measured against every
+    point) and the overall and per-cluster scores get confidence intervals; without
+    it, every row is used and the result equals sklearn's silhouette_score.
+    """
+    labels = np.asarray(labels)
+    report = {
+        "silhouette_score": None,
+        "n_clusters": int(len(np.unique(labels[labels != -1]))),
+        "noise_ratio": float(np.mean(labels == -1))
+    }
+    if report["n_clusters"] < 2:
+        logger.warning("Less than 2 clusters found, cannot compute silhouette score")
+        return report
+
+    clusters, membership = cluster_members(labels)
+    sizes = membership.sum(axis=0)
+    rows = np.flatnonzero(labels != -1)
+    if sample_size is not None:
+        rows = stratified_sample(labels, sample_size, np.random.default_rng(random_state))
+
+    sums = cluster_distance_sums(distance_matrix, rows, membership, max_block_bytes)
+    own = np.searchsorted(clusters, labels[rows])
+    scores = silhouette_rows(sums, own, sizes)
+
+    # Stratified mean: clusters weighted by their full size, so the estimate is unbiased
+    weights = sizes / sizes.sum()
+    z = norm.ppf(0.5 + confidence / 2)
+    overall, variance = 0.0, 0.0
+    cluster_scores = {}
+    for k, cluster in enumerate(clusters):
+        cluster_rows = scores[own == k]
+        mean = float(cluster_rows.mean())
+        n_sampled = len(cluster_rows)
+        # Finite population correction: a fully evaluated cluster has no sampling error
+        fpc = 1 - n_sampled / sizes[k]
+        error = np.sqrt(fpc * cluster_rows.var(ddof=1) / n_sampled) if n_sampled > 1 else 0.0
+        overall += weights[k] * mean
+        variance += weights[k] ** 2 * error ** 2
+        cluster_scores[int(cluster)] = {
+            "silhouette": mean,
+            "size": int(sizes[k]),
+            "n_evaluated": n_sampled,
+            "ci_low": float(mean - z * error),
+            "ci_high": float(mean + z * error)
+        }
+
+    error = float(np.sqrt(variance))
+    report.update({
+        "silhouette_score": float(overall),
+        "ci_low": float(overall - z * error),
+        "ci_high": float(overall + z * error),
+        "confidence": confidence,
+        "n_evaluated": int(len(rows)),
+        "cluster_silhouettes": cluster_scores
+    })
+    return report
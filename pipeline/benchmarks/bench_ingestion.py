@@ -0,0 +1,120 @@
+"""End-to-end ingestion benchmark on synthetic data, fully offline
+
+Runs every ingestor (Reddit, News, the four static sources) plus the Reddit/News
+Snowflake load scripts inside a ReplayEnvironment, at each scale factor of the
+synthetic datasets (see pipeline.replay.synthetic.BASE_SIZES), and reports
+throughput per stage from the ingestors' stage metrics.
+
+Usage:
+    python -m pipeline.benchmarks.bench_ingestion --scales 1 10 100 1000
+    python -m pipeline.benchmarks.bench_ingestion --sources static --chunksize 100000 --fast
+"""
+import os
+import time
+import logging
+import argparse
+import pandas as pd
+from pipeline.ingestion.ingest_reddit import RedditIngestor
+from pipeline.ingestion.ingest_news import NewsIngestor
+from pipeline.ingestion.run_static_ingestion import STATIC_SOURCES
+from pipeline.snowflake.load_snowflake import load_reddit_to_snowflake, load_news_to_snowflake
+from pipeline.replay import ReplayEnvironment, synthetic_fixtures
+
+# Configure logging
+logging.basicConfig(level=logging.WARNING)
+logger = logging.getLogger(__name__)
+
+DEFAULT_SCALES = [1, 10, 100, 1000]
+SOURCES = ["reddit", "news", "static"]
+
+def run_reddit(file_format: str) -> list:
+    records = RedditIngestor(limit=None).run("reddit", "reddit_suite", file_format=file_format)
+    return records + load_reddit_to_snowflake(file_format)
+
+def run_news(file_format: str) -> list:
+    ingestor = NewsIngestor(max_workers=8, requests_per_second=1000.0)
+    records = ingestor.run("news", "news_suite", file_format=file_format)
+    return records + load_news_to_snowflake(file_format)
+
+def run_static(name: str, chunksize: int = None) -> list:
+    source = STATIC_SOURCES[name]
+    ingestor = source["ingestor"]()
+    try:
+        ingestor.run(*source["args"], chunksize=chunksize, force=True)
+    finally:
+        records = ingestor.metrics.summary() if ingestor.metrics is not None else []
+    return records
+
+def throughput(records: list) -> pd.DataFrame:
+    """Aggregate stage records into rows/s and MB/s per stage"""
+    df = pd.DataFrame(records)
+    if df.empty:
+        return df
+    summary = df.groupby(["scale", "source", "stage"], sort=False).agg(
+        calls=("stage", "size"),
+        failed=("status", lambda s: int((s != "succeeded").sum())),
+        seconds=("seconds", "sum"),
+        rows=("rows", "sum"),
+        bytes=("bytes", "sum"),
+        tracemalloc_peak_mb=("tracemalloc_peak_mb", "max"),
+        rss_delta_mb=("rss_delta_mb", "max"),
+        process_peak_rss_mb=("process_peak_rss_mb", "max")
+    ).reset_index()
+    seconds = summary["seconds"].where(summary["seconds"] > 0)
+    summary["rows_per_s"] = (summary["rows"] / seconds).round(0)
+    summary["mb_per_s"] = (summary["bytes"] / 2**20 / seconds).round(2)
+    return summary
+
+def bench_scale(scale: int, sources: list, file_format: str, chunksize: int = None) -> list:
+    fixtures = synthetic_fixtures(scale, sources=sources)
+    runs = []
+    if "reddit" in sources:
+        runs.append(("reddit", lambda: run_reddit(file_format)))
+    if "news" in sources:
+        runs.append(("news", lambda: run_news(file_format)))
+    if "static" in sources:
+        runs.extend((name, lambda name=name: run_static(name, chunksize)) for name in STATIC_SOURCES)
+
+    records = []
+    with ReplayEnvironment(fixtures):
+        for source, run in runs:
+            start = time.perf_counter()
+            try:
+                source_records = run()
+            except Exception as e:
+                logger.error(f"{source} failed at scale {scale}: {e}")
+                source_records = []
+            elapsed = time.perf_counter() - start
+            print(f"scale={scale:<5} {source:<22} {elapsed:>8.2f}s")
+            records.extend({**record, "scale": scale, "source": source} for record in source_records)
+    return records
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scales", type=int, nargs="+", default=DEFAULT_SCALES)
+    parser.add_argument("--sources", nargs="+", default=SOURCES, choices=SOURCES)
+    parser.add_argument("--format", default="json", choices=["json", "parquet", "ndjson"],
+                        help="Output format for the Reddit/News ingestors")
+    parser.add_argument("--chunksize", type=int, default=None, help="Run static sources chunked")
+    parser.add_argument("--fast", action="store_true", help="Validate with the compiled fast path")
+    parser.add_argument("--output", default=None, help="Also write the per-stage table to this CSV")
+    args = parser.parse_args()
+
+    if args.fast:
+        os.environ["GX_FAST_PATH"] = "1"
+
+    records = []
+    for scale in args.scales:
+        records.extend(bench_scale(scale, args.sources, args.format, args.chunksize))
+
+    summary = throughput(records)
+    if summary.empty:
+        print("No stage metrics recorded")
+        return
+    with pd.option_context("display.width", 200, "display.max_rows", None):
+        print(summary.drop(columns=["bytes"]).to_string(index=False))
+    if args.output:
+        summary.to_csv(args.output, index=False)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""Benchmark the vectorized NewsIngestor daily aggregation against the per-row apply version
+
+Generates raw NewsAPI-shaped frames (one row per article, `source` as a dict) at
+each size, times both implementations, reports seconds per million articles to
+show scaling, and checks that both produce the same daily table.
+
+Usage:
+    python -m pipeline.benchmarks.bench_news_aggregation --sizes 1000 100000 1000000 5000000
+"""
+import argparse
+import logging
+import time
+import numpy as np
+import pandas as pd
+from pipeline.ingestion.ingest_news import aggregate_daily
+
+# Configure logging
+logging.basicConfig(level=logging.WARNING)
+logger = logging.getLogger(__name__)
+
+DEFAULT_SIZES = [1_000, 10_000, 100_000, 1_000_000]
+
+def apply_aggregate_daily(df: pd.DataFrame) -> pd.DataFrame:
+    """Previous NewsIngestor.process_data, kept as the reference implementation"""
+    processed_df = df.copy()
+    processed_df['publishedAt'] = pd.to_datetime(processed_df['publishedAt'], errors='coerce')
+    processed_df['date'] = processed_df['publishedAt'].dt.date
+    processed_df['source_name'] = processed_df['source'].apply(
+        lambda x: x.get('name', 'Unknown') if isinstance(x, dict) else 'Unknown'
+    )
+    daily_agg = processed_df.groupby('date').agg({
+        'title': ['count', lambda x: ' | '.join(x.head(5))],
+        'source_name': lambda x: ', '.join(set(x))
+    }).reset_index()
+    daily_agg.columns = ['date', 'article_count', 'sample_headlines', 'sources']
+    daily_agg['date'] = daily_agg['date'].astype(str)
+    return daily_agg.sort_values('date')
+
+def make_articles(n_rows: int, n_sources: int = 500, n_days: int = 30, seed: int = 0) -> pd.DataFrame:
+    """Raw articles spread over n_days with a long-tailed mix of sources"""
+    rng = np.random.default_rng(seed)
+    sources = [{"id": None, "name": f"Outlet {i}"} for i in range(n_sources)]
+    picks = np.minimum(rng.zipf(1.5, n_rows) - 1, n_sources - 1)
+    published = pd.Timestamp("2024-01-01", tz="UTC") + pd.to_timedelta(rng.integers(0, n_days * 86400, n_rows), unit="s")
+    return pd.DataFrame({
+        "source": [sources[i] for i in picks],
+        "title": [f"Headline {i}" for i in range(n_rows)],
+        "url": [f"https://news.example.com/{i}" for i in range(n_rows)],
+        "publishedAt": published.strftime("%Y-%m-%dT%H:%M:%SZ")
+    })
+
+def same_output(expected: pd.DataFrame, actual: pd.DataFrame) -> bool:
+    """Compare daily tables; source lists are compared as sets (the old path joined a set)"""
+    expected, actual = expected.reset_index(drop=True), actual.reset_index(drop=True)
+    if list(expected.columns) != list(actual.columns) or len(expected) != len(actual):
+        return False
+    return (
+        expected["date"].equals(actual["date"])
+        and (expected["article_count"].to_numpy() == actual["article_count"].to_numpy()).all()
+        and expected["sample_headlines"].equals(actual["sample_headlines"])
+        and all(set(e.split(", ")) == set(a.split(", ")) for e, a in zip(expected["sources"], actual["sources"]))
+    )
+
+def timed(fn, df: pd.DataFrame, repeats: int) -> tuple:
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = fn(df)
+        timings.append(time.perf_counter() - start)
+    return result, min(timings)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES)
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--apply-max", type=int, default=1_000_000,
+                        help="Skip the apply version above this many articles")
+    args = parser.parse_args()
+
+    results = []
+    for n_rows in args.sizes:
+        df = make_articles(n_rows)
+        vectorized, vectorized_s = timed(aggregate_daily, df, args.repeats)
+        row = {
+            "articles": n_rows,
+            "vectorized_s": round(vectorized_s, 4),
+            "vectorized_s_per_1m": round(vectorized_s / n_rows * 1_000_000, 3)
+        }
+        if n_rows <= args.apply_max:
+            reference, apply_s = timed(apply_aggregate_daily, df, args.repeats)
+            row.update({
+                "apply_s": round(apply_s, 4),
+                "speedup": round(apply_s / vectorized_s, 1) if vectorized_s else None,
+                "same_output": same_output(reference, vectorized)
+            })
+        results.append(row)
+
+    print(pd.DataFrame(results).to_string(index=False))
+
+if __name__ == "__main__":
+    main()
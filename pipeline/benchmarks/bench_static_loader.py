@@ -0,0 +1,90 @@
+"""Benchmark the row-by-row INSERT and Parquet COPY paths of StaticIngestor.load_static_to_snowflake
+
+Usage:
+    python -m pipeline.benchmarks.bench_static_loader --sizes 10000 1000000 10000000
+    python -m pipeline.benchmarks.bench_static_loader --offline
+
+--offline only times the client-side preparation (tuple building vs Parquet
+serialization) and needs no Snowflake credentials.
+"""
+import argparse
+import logging
+import time
+from io import BytesIO
+import numpy as np
+import pandas as pd
+from pipeline.ingestion.static_ingestor import StaticIngestor
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+DEFAULT_SIZES = [10_000, 1_000_000, 10_000_000]
+
+class BenchmarkIngestor(StaticIngestor):
+    """StaticIngestor with no source, used only to reach the loaders"""
+    def load_data(self):
+        return pd.DataFrame()
+
+    def process_data(self, df: pd.DataFrame):
+        return df
+
+def make_synthetic_frame(n_rows: int, seed: int = 0) -> pd.DataFrame:
+    """Build a frame shaped like the WHO / suicide-demographics tables"""
+    rng = np.random.default_rng(seed)
+    countries = np.array([f"Country {i}" for i in range(100)], dtype=object)
+    return pd.DataFrame({
+        "country": countries[rng.integers(0, len(countries), n_rows)],
+        "year": rng.integers(1979, 2017, n_rows),
+        "sex": np.where(rng.random(n_rows) < 0.5, "Male", "Female"),
+        "age": rng.choice(["5-14 years", "15-24 years", "25-34 years", "35-54 years", "55-74 years", "75+ years"], n_rows),
+        "suicides_no": rng.integers(0, 5000, n_rows).astype(float),
+        "population": rng.integers(1_000, 10_000_000, n_rows),
+        "suicide_rate_per_100k": rng.random(n_rows) * 50,
+        "survey_date": pd.Timestamp("2014-01-01") + pd.to_timedelta(rng.integers(0, 365 * 86400, n_rows), unit="s")
+    })
+
+def time_call(fn, *args, **kwargs) -> float:
+    start = time.perf_counter()
+    fn(*args, **kwargs)
+    return time.perf_counter() - start
+
+def bench_offline(ingestor: StaticIngestor, df: pd.DataFrame) -> dict:
+    """Time only the client-side preparation of each path"""
+    parquet_buffer = BytesIO()
+    return {
+        "insert": time_call(ingestor._rows_to_tuples, df),
+        "copy": time_call(df.to_parquet, parquet_buffer, compression="snappy", index=False)
+    }
+
+def bench_snowflake(ingestor: StaticIngestor, df: pd.DataFrame, methods: list) -> dict:
+    """Time a full load of each path into a scratch table"""
+    return {
+        method: time_call(ingestor.load_static_to_snowflake, df, f"BENCH_STATIC_{method.upper()}", method=method)
+        for method in methods
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES)
+    parser.add_argument("--methods", nargs="+", default=["insert", "copy"], choices=["insert", "copy"])
+    parser.add_argument("--offline", action="store_true", help="Only time client-side preparation")
+    args = parser.parse_args()
+
+    ingestor = BenchmarkIngestor()
+    results = []
+    for n_rows in args.sizes:
+        df = make_synthetic_frame(n_rows)
+        if args.offline:
+            timings = bench_offline(ingestor, df)
+        else:
+            timings = bench_snowflake(ingestor, df, args.methods)
+        for method, seconds in timings.items():
+            results.append({"rows": n_rows, "method": method, "seconds": round(seconds, 3),
+                            "rows_per_sec": round(n_rows / seconds) if seconds else None})
+            logger.info(f"{method:>6} {n_rows:>10} rows: {seconds:.3f}s")
+
+    print(pd.DataFrame(results).to_string(index=False))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""Benchmark Validator's Great Expectations path against the compiled fast path
+
+For every suite in gx/expectations/*.json, builds a synthetic frame that satisfies
+the suite plus a copy with injected nulls that violates it, then times both paths
+and checks they agree on pass/fail.
+
+Usage:
+    python -m pipeline.benchmarks.bench_validator --rows 1000 100000
+"""
+import argparse
+import json
+import logging
+import time
+from collections import defaultdict
+from pathlib import Path
+import numpy as np
+import pandas as pd
+from pipeline.ingestion.validator import Validator, gx_project_root, get_gx_context
+
+# Configure logging
+logging.basicConfig(level=logging.WARNING)
+logger = logging.getLogger(__name__)
+
+def load_suites() -> list:
+    suite_dir = Path(gx_project_root()) / "gx" / "expectations"
+    return [json.loads(path.read_text()) for path in sorted(suite_dir.glob("*.json"))]
+
+def synthetic_frame(suite: dict, n_rows: int, seed: int = 0) -> pd.DataFrame:
+    """Generate a frame that satisfies the suite's column expectations"""
+    rng = np.random.default_rng(seed)
+    columns, specs = [], defaultdict(dict)
+    for expectation in suite["expectations"]:
+        kwargs = expectation["kwargs"]
+        if expectation["expectation_type"] == "expect_table_columns_to_match_ordered_list":
+            columns = list(kwargs["column_list"])
+        elif "column" in kwargs:
+            if kwargs["column"] not in columns:
+                columns.append(kwargs["column"])
+            specs[kwargs["column"]].update(kwargs)
+
+    data = {}
+    for col in columns:
+        spec = specs[col]
+        low, high = spec.get("min_value", 0), spec.get("max_value", 100)
+        if "value_set" in spec:
+            data[col] = rng.choice(spec["value_set"], n_rows)
+        elif "strftime_format" in spec:
+            dates = pd.Timestamp("2024-01-01") + pd.to_timedelta(rng.integers(0, 365, n_rows), unit="D")
+            data[col] = dates.strftime(spec["strftime_format"])
+        elif spec.get("type_", "").startswith("int"):
+            data[col] = rng.integers(low, high + 1, n_rows).astype(spec["type_"])
+        elif spec.get("type_", "").startswith("float"):
+            data[col] = (low + rng.random(n_rows) * (high - low)).astype(spec["type_"])
+        else:
+            data[col] = np.array([f"{col}_{i % 50}" for i in range(n_rows)], dtype=object)
+    return pd.DataFrame(data, columns=columns)
+
+def break_frame(suite: dict, df: pd.DataFrame) -> pd.DataFrame:
+    """Null out part of the first not-null column so the suite fails"""
+    broken = df.copy()
+    for expectation in suite["expectations"]:
+        if expectation["expectation_type"] == "expect_column_values_to_not_be_null":
+            column = expectation["kwargs"]["column"]
+            broken[column] = broken[column].astype(object)
+            broken.loc[broken.index[::10], column] = None
+            break
+    return broken
+
+def timed_validate(validator: Validator, df: pd.DataFrame, suite_name: str, repeats: int) -> tuple:
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        success = validator.validate(df, suite_name)
+        timings.append(time.perf_counter() - start)
+    return success, min(timings)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, nargs="+", default=[1_000, 100_000])
+    parser.add_argument("--repeats", type=int, default=3)
+    args = parser.parse_args()
+
+    # Warm the cached context once so the comparison measures validation, not setup
+    start = time.perf_counter()
+    get_gx_context(gx_project_root())
+    print(f"GX context load (paid once per process): {time.perf_counter() - start:.2f}s")
+
+    gx_validator, fast_validator = Validator(fast=False), Validator(fast=True)
+    results = []
+    for suite in load_suites():
+        suite_name = suite["expectation_suite_name"]
+        for n_rows in args.rows:
+            clean = synthetic_frame(suite, n_rows)
+            for case, df in (("clean", clean), ("broken", break_frame(suite, clean))):
+                gx_success, gx_seconds = timed_validate(gx_validator, df, suite_name, args.repeats)
+                fast_success, fast_seconds = timed_validate(fast_validator, df, suite_name, args.repeats)
+                results.append({
+                    "suite": suite_name,
+                    "rows": n_rows,
+                    "case": case,
+                    "gx_s": round(gx_seconds, 4),
+                    "fast_s": round(fast_seconds, 4),
+                    "speedup": round(gx_seconds / fast_seconds, 1) if fast_seconds else None,
+                    "agree": gx_success == fast_success
+                })
+
+    print(pd.DataFrame(results).to_string(index=False))
+
+if __name__ == "__main__":
+    main()
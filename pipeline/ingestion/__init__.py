@@ -7,4 +7,6 @@ from .static_ingestor import (
     MentalHealthCareInLast4WeeksIngestor,
     SuicideByDemographicsIngestor
 )
-from .validator import Validator
\ No newline at end of file
+from .validator import Validator
+from .watermark import WatermarkStore
+from .dedup import NearDuplicateDetector, MinHashLSH
\ No newline at end of file
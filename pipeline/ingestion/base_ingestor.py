@@ -1,12 +1,17 @@
 import os
+import gzip
 import json
 import boto3
 import logging
 from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from io import BytesIO
 import pandas as pd
 from .validator import Validator
+from .watermark import WatermarkStore
+from .dedup import NearDuplicateDetector, DEDUP_MODES
+from pipeline.metrics import MetricsRecorder, frame_bytes
 from dotenv import load_dotenv
 load_dotenv()
 
@@ -14,10 +19,37 @@ load_dotenv()
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Output formats supported for raw/processed artifacts
+SUPPORTED_FORMATS = ("json", "parquet", "ndjson")
+FILE_EXTENSIONS = {"json": "json", "parquet": "parquet", "ndjson": "json.gz"}
+
+# Streaming upload settings (S3 requires every part but the last to be >= 5 MiB)
+STREAM_CHUNK_ROWS = 10000
+MULTIPART_PART_SIZE = 8 * 1024 * 1024
+
 class BaseIngestor(ABC):
-    def __init__(self):
+    # Low-cardinality string columns to dictionary-encode in Parquet output; nested
+    # fields use dotted paths. None, or no listed column in the frame being written,
+    # keeps pyarrow's default of dictionary-encoding every column
+    dictionary_columns = None
+    # Key under which incremental runs store this source's watermark
+    watermark_key = None
+    # Field that orders this source's watermarks; stored marks only move forward on it
+    watermark_order = None
+    # Name of this source's near-duplicate index
+    dedup_key = None
+
+    def __init__(self, incremental: bool = False, dedup: str = None, partition: str = None):
         self.today = datetime.today().strftime("%Y-%m-%d")
 
+        # Slice of the source this instance covers (e.g. one subreddit); it is appended to
+        # output file names so mapped tasks for the same day never overwrite each other
+        self.partition = partition
+        # S3 keys written by the last run, by "raw"/"processed"
+        self.output_keys = {}
+        # Id of the current run; incremental outputs carry it so same-day runs never overwrite each other
+        self.run_id = None
+
         # Local dev directories
         self.local_raw_dir = "data/raw"
         self.local_processed_dir = "data/processed"
@@ -33,6 +65,25 @@ class BaseIngestor(ABC):
             region_name=os.environ.get("AWS_DEFAULT_REGION", "us-east-1")
         )
 
+        # Incremental mode: load_data only fetches items newer than the stored watermarks
+        # and fills pending_watermarks (name -> mark), which run() persists once everything is written
+        self.incremental = incremental
+        self.watermarks = WatermarkStore(s3=self.s3)
+        self.pending_watermarks = {}
+
+        # Per-stage metrics for the current run; metrics_sink=None writes JSON lines locally
+        self.metrics_sink = None
+        self.metrics = None
+
+        # Optional near-duplicate step in process_data: "flag" keeps every row and fills a
+        # duplicate_of column, "collapse" drops duplicates; both also report them in
+        # self.duplicates, and the index is saved after a successful run
+        if dedup not in DEDUP_MODES:
+            raise ValueError(f"Unknown dedup mode: {dedup}. Expected one of {DEDUP_MODES}")
+        self.dedup = dedup
+        self.dedup_detector = NearDuplicateDetector(self.dedup_key or type(self).__name__, s3=self.s3) if dedup else None
+        self.duplicates = None
+
     @abstractmethod
     def load_data(self) -> pd.DataFrame:
         """Fetch or load raw data from a data source"""
@@ -43,35 +94,211 @@ class BaseIngestor(ABC):
         """Clean and transform raw data"""
         pass
 
-    def save_raw(self, df: pd.DataFrame, name: str) -> str:
-        path = os.path.join(self.local_raw_dir, f"{name}_raw_{self.today}.json")
-        df.reset_index().to_json(path, orient="records", indent=2)
+    def handle_near_duplicates(self, df: pd.DataFrame, ids: pd.Series, texts: pd.Series) -> pd.DataFrame:
+        """Flag or collapse rows whose text nearly duplicates an earlier item
+
+        Flag mode adds duplicate_of: the id of the item a row repeats, missing for
+        originals. Collapse mode returns a copy without the duplicate rows.
+        """
+        if self.dedup_detector is None:
+            return df
+
+        self.duplicates = self.dedup_detector.detect(ids, texts)
+        logger.info(f"Found {len(self.duplicates)} near-duplicates among {len(df)} items")
+        if self.dedup == "collapse":
+            return df[~ids.astype(str).isin(self.duplicates["id"])].copy()
+        originals = dict(zip(self.duplicates["id"], self.duplicates["duplicate_of"]))
+        return df.assign(duplicate_of=ids.astype(str).map(originals))
+
+    def _parquet_options(self, df: pd.DataFrame) -> dict:
+        """Build pyarrow write options for Parquet output"""
+        options = {"engine": "pyarrow", "compression": "zstd", "index": False}
+        # Raw and processed frames have different columns; an empty list would disable dictionaries
+        present = [c for c in self.dictionary_columns or [] if c.split(".")[0] in df.columns]
+        if present:
+            options["use_dictionary"] = present
+        return options
+
+    def _write_frame(self, df: pd.DataFrame, target, file_format: str) -> None:
+        """Write a DataFrame to a path or buffer in the requested format"""
+        if file_format == "parquet":
+            df.to_parquet(target, **self._parquet_options(df))
+        elif file_format == "ndjson":
+            df.to_json(target, orient="records", lines=True, compression="gzip")
+        else:
+            df.to_json(target, orient="records", indent=2)
+
+    def _upload_part(self, s3_key: str, upload_id: str, part_number: int, buffer: BytesIO) -> dict:
+        """Upload the buffered bytes as one multipart part and reset the buffer"""
+        response = self.s3.upload_part(
+            Bucket=self.S3_BUCKET,
+            Key=s3_key,
+            UploadId=upload_id,
+            PartNumber=part_number,
+            Body=buffer.getvalue()
+        )
+        buffer.seek(0)
+        buffer.truncate()
+        return {"ETag": response["ETag"], "PartNumber": part_number}
+
+    def upload_stream(self, df: pd.DataFrame, s3_key: str, reset_index: bool = False,
+                      chunk_rows: int = STREAM_CHUNK_ROWS, part_size: int = MULTIPART_PART_SIZE) -> int:
+        """Stream a DataFrame to S3 as gzipped NDJSON using a multipart upload
+
+        Returns the number of compressed bytes uploaded.
+        """
+        upload_id = self.s3.create_multipart_upload(
+            Bucket=self.S3_BUCKET,
+            Key=s3_key,
+            ContentType="application/x-ndjson",
+            ContentEncoding="gzip"
+        )["UploadId"]
+
+        parts = []
+        n_bytes = 0
+        buffer = BytesIO()
+        try:
+            # Serialize chunk by chunk so only one chunk and one part are held in memory
+            with gzip.GzipFile(fileobj=buffer, mode="wb") as gz:
+                for start in range(0, len(df), chunk_rows):
+                    chunk = df.iloc[start:start + chunk_rows]
+                    if reset_index:
+                        chunk = chunk.reset_index()
+                    lines = chunk.to_json(orient="records", lines=True)
+                    if not lines.endswith("\n"):
+                        lines += "\n"
+                    gz.write(lines.encode("utf-8"))
+
+                    if buffer.tell() >= part_size:
+                        n_bytes += buffer.tell()
+                        parts.append(self._upload_part(s3_key, upload_id, len(parts) + 1, buffer))
+
+            # Closing the gzip stream flushes the trailer into the final part
+            n_bytes += buffer.tell()
+            parts.append(self._upload_part(s3_key, upload_id, len(parts) + 1, buffer))
+
+            self.s3.complete_multipart_upload(
+                Bucket=self.S3_BUCKET,
+                Key=s3_key,
+                UploadId=upload_id,
+                MultipartUpload={"Parts": parts}
+            )
+        except Exception:
+            self.s3.abort_multipart_upload(Bucket=self.S3_BUCKET, Key=s3_key, UploadId=upload_id)
+            raise
+
+        logger.info(f"Streamed s3://{self.S3_BUCKET}/{s3_key} in {len(parts)} parts")
+        return n_bytes
+
+    def watermark_name(self, part: str = None) -> str:
+        """Stored name of a watermark: the source, plus the partition or part it covers"""
+        part = part or self.partition
+        return f"{self.watermark_key}:{part}" if part else self.watermark_key
+
+    def _filename(self, name: str, suffix: str, file_format: str) -> str:
+        partition = f"_{self.partition}" if self.partition else ""
+        run = f"_{self.run_id}" if self.incremental and self.run_id else ""
+        return f"{name}_{suffix}_{self.today}{partition}{run}.{FILE_EXTENSIONS[file_format]}"
+
+    def save_raw(self, df: pd.DataFrame, name: str, file_format: str = "json") -> str:
+        path = os.path.join(self.local_raw_dir, self._filename(name, "raw", file_format))
+        self._write_frame(df.reset_index(), path, file_format)
         logger.info(f"Saved raw data locally to {path}")
         return path
 
-    def save_processed(self, df: pd.DataFrame, name: str) -> str:
-        path = os.path.join(self.local_processed_dir, f"{name}_processed_{self.today}.json")
-        with open(path, "w") as f:
-            json.dump(df.to_dict(orient="records"), f, indent=2)
+    def save_processed(self, df: pd.DataFrame, name: str, file_format: str = "json") -> str:
+        path = os.path.join(self.local_processed_dir, self._filename(name, "processed", file_format))
+        if file_format in ("parquet", "ndjson"):
+            self._write_frame(df, path, file_format)
+        else:
+            with open(path, "w") as f:
+                json.dump(df.to_dict(orient="records"), f, indent=2)
         logger.info(f"Saved processed data locally to {path}")
         return path
 
-    def upload(self, df: pd.DataFrame, name: str, s3_folder: str, is_processed: bool = False) -> None:
+    def upload(self, df: pd.DataFrame, name: str, s3_folder: str, is_processed: bool = False,
+               file_format: str = "json") -> int:
+        """Upload a frame to S3, returning the number of bytes written"""
         suffix = "processed" if is_processed else "raw"
-        filename = f"{name}_{suffix}_{self.today}.json"
-        s3_key = f"{s3_folder}/{filename}"
+        s3_key = f"{s3_folder}/{self._filename(name, suffix, file_format)}"
+        self.output_keys[suffix] = s3_key
+
+        if file_format == "ndjson":
+            n_bytes = self.upload_stream(df, s3_key, reset_index=True)
+            logger.info(f"Streamed {suffix} data to s3://{self.S3_BUCKET}/{s3_key}")
+            return n_bytes
 
         buffer = BytesIO()
-        df.reset_index().to_json(buffer, orient="records", indent=2)
+        self._write_frame(df.reset_index(), buffer, file_format)
+        n_bytes = buffer.tell()
         buffer.seek(0)
 
         self.s3.upload_fileobj(buffer, self.S3_BUCKET, s3_key)
         logger.info(f"Uploaded {suffix} data to s3://{self.S3_BUCKET}/{s3_key}")
+        return n_bytes
+
+    def _save_outputs(self, df: pd.DataFrame, name: str, s3_folder: str, is_processed: bool,
+                      save_s3: bool, save_local: bool, file_format: str) -> None:
+        """Save a raw or processed frame locally and/or to S3"""
+        suffix = "processed" if is_processed else "raw"
+        if save_local:
+            with self.metrics.stage(f"save_{suffix}_local", format=file_format) as stage:
+                if is_processed:
+                    path = self.save_processed(df, name, file_format)
+                else:
+                    path = self.save_raw(df, name, file_format)
+                stage.rows, stage.bytes = len(df), os.path.getsize(path)
+        if save_s3:
+            with self.metrics.stage(f"upload_{suffix}", format=file_format) as stage:
+                stage.rows = len(df)
+                stage.bytes = self.upload(df, name, s3_folder, is_processed=is_processed, file_format=file_format)
+
+    def _process_and_validate(self, raw_df: pd.DataFrame, gx_suite: str) -> pd.DataFrame:
+        # Process data
+        with self.metrics.stage("process") as stage:
+            processed_df = self.process_data(raw_df)
+            stage.rows, stage.bytes = len(processed_df), frame_bytes(processed_df)
+
+        # Validate data
+        with self.metrics.stage("validate", suite=gx_suite) as stage:
+            stage.rows = len(processed_df)
+            validator = Validator()
+            if not validator.validate(processed_df, gx_suite):
+                raise ValueError(f"Validation failed for suite: {gx_suite}")
+
+        return processed_df
+
+    def run(self, name: str, gx_suite: str, save_s3: bool = True, save_local: bool = False,
+            file_format: str = "json", pipelined: bool = False):
+        """Main ingestion pipeline logic
+
+        pipelined=True writes the raw data in the background while processing and
+        validation run; both writes are joined before the run counts as successful.
+        Returns the per-stage metric records for the run.
+        """
+        if file_format not in SUPPORTED_FORMATS:
+            raise ValueError(f"Unsupported file format: {file_format}. Expected one of {SUPPORTED_FORMATS}")
 
-    def run(self, name: str, gx_suite: str, save_s3: bool = True, save_local: bool = False):
-        """Main ingestion pipeline logic"""
+        self.metrics = MetricsRecorder(name, sink=self.metrics_sink)
+        self.run_id = self.metrics.run_id
+        self.output_keys = {}
+        self.pending_watermarks = {}
+        try:
+            self._run_stages(name, gx_suite, save_s3, save_local, file_format, pipelined)
+        finally:
+            self.metrics.close()
+        return self.metrics.summary()
+
+    def _run_stages(self, name: str, gx_suite: str, save_s3: bool, save_local: bool,
+                    file_format: str, pipelined: bool) -> None:
         # Load data
-        raw_df = self.load_data()
+        with self.metrics.stage("load") as stage:
+            raw_df = self.load_data()
+            stage.rows, stage.bytes = len(raw_df), frame_bytes(raw_df)
+
+        if raw_df.empty:
+            logger.warning(f"No new {name} data to ingest")
+            return
 
         # Determine folder naming convention
         if name in ["cdc", "reddit"]:
@@ -81,23 +308,41 @@ class BaseIngestor(ABC):
             s3_raw_folder_name = f"{name}_raw"
             s3_processed_folder_name = f"{name}_processed"
 
-        # Save raw (local + S3)
-        if save_local:
-            self.save_raw(raw_df, name)
-        if save_s3:
-            self.upload(raw_df, name, s3_raw_folder_name, is_processed=False)
+        raw_args = (name, s3_raw_folder_name, False, save_s3, save_local, file_format)
+        processed_args = (name, s3_processed_folder_name, True, save_s3, save_local, file_format)
 
-        # Process data
-        processed_df = self.process_data(raw_df)
+        if pipelined:
+            with ThreadPoolExecutor(max_workers=2) as pool:
+                # Save raw (local + S3) in the background
+                raw_future = pool.submit(self._save_outputs, raw_df, *raw_args)
 
-        # Validate data
-        validator = Validator()
-        if not validator.validate(processed_df, gx_suite):
-            raise ValueError(f"Validation failed for suite: {gx_suite}")
+                try:
+                    # process_data may modify its input in place, so it works on a copy
+                    processed_df = self._process_and_validate(raw_df.copy(), gx_suite)
+                except Exception:
+                    # The raw write is still wanted; let it finish before surfacing the failure
+                    if raw_future.exception() is not None:
+                        logger.error(f"Raw {name} upload also failed: {raw_future.exception()}")
+                    raise
 
-        # Save processed (local + S3)
-        if save_local:
-            self.save_processed(processed_df, name)
-        if save_s3:
-            self.upload(processed_df, name, s3_processed_folder_name, is_processed=True)
+                # Save processed (local + S3) while the raw write finishes, then join both
+                processed_future = pool.submit(self._save_outputs, processed_df, *processed_args)
+                raw_future.result()
+                processed_future.result()
+        else:
+            # Save raw (local + S3)
+            self._save_outputs(raw_df, *raw_args)
+
+            processed_df = self._process_and_validate(raw_df, gx_suite)
+
+            # Save processed (local + S3)
+            self._save_outputs(processed_df, *processed_args)
+
+        # Advance the watermarks only after the delta has been written
+        if self.incremental:
+            for mark_name, watermark in self.pending_watermarks.items():
+                self.watermarks.set(mark_name, watermark, order_by=self.watermark_order)
 
+        # Persist newly seen items so the next run checks against them
+        if self.dedup_detector is not None:
+            self.dedup_detector.save()
@@ -0,0 +1,100 @@
+import sys
+import logging
+import numpy as np
+import pandas as pd
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+MB = 1024 * 1024
+
+def is_categorical(series: pd.Series) -> bool:
+    return isinstance(series.dtype, pd.CategoricalDtype)
+
+def map_categories(series: pd.Series, func) -> pd.Series:
+    """Apply a vectorized string transform (Series -> Series) once per distinct value
+
+    Categoricals only transform their categories and re-point the codes, so values
+    that normalize to the same string merge and values mapped to NaN become missing.
+    Any other series is transformed row by row as before.
+    """
+    if not is_categorical(series):
+        return func(series)
+
+    categories = func(pd.Series(series.cat.categories, dtype=object))
+    uniques, inverse = pd.factorize(categories)
+    codes = series.cat.codes.to_numpy()
+    if len(inverse):
+        codes = np.where(codes >= 0, inverse[codes], -1)
+    return pd.Series(
+        pd.Categorical.from_codes(codes, categories=pd.Index(uniques, dtype=object)),
+        index=series.index,
+        name=series.name
+    )
+
+def downcast_numerics(df: pd.DataFrame) -> pd.DataFrame:
+    """Shrink integer columns to the smallest type holding their range, and floats to
+    float32 where that keeps every value exactly"""
+    for col in df.select_dtypes(include="integer").columns:
+        df[col] = pd.to_numeric(df[col], downcast="integer")
+    for col in df.select_dtypes(include="float64").columns:
+        values = df[col].to_numpy()
+        narrow = values.astype(np.float32)
+        if np.array_equal(narrow.astype(np.float64), values, equal_nan=True):
+            df[col] = narrow
+    return df
+
+def compact_frame(df: pd.DataFrame, categorical_columns: list = None) -> pd.DataFrame:
+    """Dictionary-encode low-cardinality string columns and downcast numerics"""
+    for col in categorical_columns or []:
+        if col in df.columns and not is_categorical(df[col]):
+            df[col] = df[col].astype("category")
+    return downcast_numerics(df)
+
+def expand_dtypes(df: pd.DataFrame) -> pd.DataFrame:
+    """The frame with the dtypes a non-compact run produces (object strings, 64-bit numerics)
+
+    Used to check compact frames against suites that pin dtypes. Categoricals expand
+    to references to their shared category strings, so this costs about 8 bytes per
+    value rather than a copy of the strings.
+    """
+    dtypes = {}
+    for col in df.columns:
+        dtype = df[col].dtype
+        if isinstance(dtype, pd.CategoricalDtype):
+            dtypes[col] = object
+        elif pd.api.types.is_integer_dtype(dtype) and dtype.itemsize < 8:
+            dtypes[col] = "int64"
+        elif pd.api.types.is_float_dtype(dtype) and dtype.itemsize < 8:
+            dtypes[col] = "float64"
+    return df.astype(dtypes) if dtypes else df
+
+def expanded_memory_usage(df: pd.DataFrame) -> int:
+    """Estimated memory_usage(deep=True) of the frame with plain dtypes, without building it
+
+    Counts 8 bytes per numeric value or object reference plus the size of each
+    referenced string, i.e. what a non-compact run's frame would hold.
+    """
+    total = int(df.index.memory_usage(deep=True))
+    for col in df.columns:
+        series = df[col]
+        if is_categorical(series):
+            codes = series.cat.codes.to_numpy()
+            counts = np.bincount(codes[codes >= 0], minlength=len(series.cat.categories))
+            sizes = np.fromiter((sys.getsizeof(c) for c in series.cat.categories), dtype=np.int64,
+                                count=len(series.cat.categories))
+            total += 8 * len(series) + int(counts @ sizes) + int((codes < 0).sum()) * sys.getsizeof(np.nan)
+        elif pd.api.types.is_numeric_dtype(series.dtype) and not pd.api.types.is_bool_dtype(series.dtype):
+            total += 8 * len(series)
+        else:
+            total += int(series.memory_usage(deep=True, index=False))
+    return total
+
+def memory_report(df: pd.DataFrame, label: str) -> dict:
+    """Measured compact size and estimated plain-dtype size in MB, logged and returned for metrics"""
+    estimate = expanded_memory_usage(df) / MB
+    measured = df.memory_usage(deep=True).sum() / MB
+    logger.info(f"{label}: {measured:.1f} MB compact vs an estimated {estimate:.1f} MB with object/64-bit "
+                f"dtypes ({estimate / measured if measured else 0:.1f}x)")
+    return {"memory_mb_plain_estimate": round(estimate, 3), "memory_mb_compact": round(float(measured), 3)}
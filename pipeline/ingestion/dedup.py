@@ -0,0 +1,207 @@
+import os
+import zlib
+import logging
+from io import BytesIO
+import numpy as np
+import pandas as pd
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# process_data near-duplicate modes: report duplicates only, or drop them
+DEDUP_MODES = (None, "flag", "collapse")
+DEFAULT_DEDUP_URI = "data/dedup"
+
+MERSENNE_PRIME = np.uint64((1 << 61) - 1)
+MAX_HASH = np.uint64((1 << 32) - 1)
+# Shingles hashed per MinHash batch (bounds the num_perm x shingles work matrix)
+SHINGLE_BATCH = 50_000
+
+def shingle_hashes(text: str, k: int = 5) -> np.ndarray:
+    """Stable 32-bit hashes of the distinct character k-grams of normalized text"""
+    text = " ".join(str(text).lower().split())
+    if len(text) <= k:
+        grams = {text} if text else set()
+    else:
+        grams = {text[i:i + k] for i in range(len(text) - k + 1)}
+    return np.fromiter((zlib.crc32(g.encode()) for g in grams), dtype=np.uint64, count=len(grams))
+
+class MinHashLSH():
+    """MinHash signatures with a banded LSH index
+
+    Signatures of `num_perm` values are split into `bands` bands; items sharing any
+    band are candidates, and candidates are confirmed by the fraction of equal
+    signature values (an estimate of Jaccard similarity of the shingle sets).
+    """
+    def __init__(self, num_perm: int = 128, bands: int = 16, shingle_size: int = 5, seed: int = 1):
+        if num_perm % bands:
+            raise ValueError(f"num_perm ({num_perm}) must be divisible by bands ({bands})")
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.shingle_size = shingle_size
+        self.seed = seed
+
+        rng = np.random.RandomState(seed)
+        self.a = rng.randint(1, int(MERSENNE_PRIME), size=num_perm, dtype=np.uint64)
+        self.b = rng.randint(0, int(MERSENNE_PRIME), size=num_perm, dtype=np.uint64)
+
+        self.keys = []
+        self.signatures = {}
+        self.buckets = [{} for _ in range(bands)]
+
+    @property
+    def params(self) -> tuple:
+        return (self.num_perm, self.bands, self.shingle_size, self.seed)
+
+    def signatures_for(self, texts) -> np.ndarray:
+        """(n_texts, num_perm) uint32 signatures; texts without shingles get all-MAX_HASH rows"""
+        hashes = [shingle_hashes(text, self.shingle_size) for text in texts]
+        signatures = np.full((len(hashes), self.num_perm), MAX_HASH, dtype=np.uint64)
+
+        # Batch documents so one vectorized permutation pass covers many shingles
+        start = 0
+        while start < len(hashes):
+            end, n_shingles = start, 0
+            while end < len(hashes) and (n_shingles == 0 or n_shingles + len(hashes[end]) <= SHINGLE_BATCH):
+                n_shingles += len(hashes[end])
+                end += 1
+
+            batch = hashes[start:end]
+            lengths = np.array([len(h) for h in batch])
+            if n_shingles:
+                values = np.concatenate(batch)
+                permuted = ((np.outer(self.a, values) + self.b[:, None]) % MERSENNE_PRIME) & MAX_HASH
+                non_empty = np.flatnonzero(lengths)
+                offsets = np.concatenate(([0], np.cumsum(lengths)[:-1]))[non_empty]
+                signatures[start + non_empty] = np.minimum.reduceat(permuted, offsets, axis=1).T
+            start = end
+
+        return signatures.astype(np.uint32)
+
+    def _band_keys(self, signature: np.ndarray) -> list:
+        return [signature[i * self.rows:(i + 1) * self.rows].tobytes() for i in range(self.bands)]
+
+    def insert(self, key: str, signature: np.ndarray) -> None:
+        if key in self.signatures:
+            return
+        self.keys.append(key)
+        self.signatures[key] = signature
+        for band, band_key in zip(self.buckets, self._band_keys(signature)):
+            band.setdefault(band_key, []).append(key)
+
+    def query(self, signature: np.ndarray) -> set:
+        """Keys sharing at least one band with the signature"""
+        candidates = set()
+        for band, band_key in zip(self.buckets, self._band_keys(signature)):
+            candidates.update(band.get(band_key, ()))
+        return candidates
+
+    def similarity(self, signature: np.ndarray, key: str) -> float:
+        return float(np.mean(self.signatures[key] == signature))
+
+    def to_bytes(self, max_items: int = None) -> bytes:
+        keys = self.keys[-max_items:] if max_items else self.keys
+        buffer = BytesIO()
+        np.savez_compressed(
+            buffer,
+            params=np.array(self.params),
+            keys=np.array(keys, dtype=str),
+            signatures=np.array([self.signatures[k] for k in keys], dtype=np.uint32).reshape(len(keys), self.num_perm)
+        )
+        return buffer.getvalue()
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "MinHashLSH":
+        stored = np.load(BytesIO(data))
+        index = cls(*[int(p) for p in stored["params"]])
+        for key, signature in zip(stored["keys"].tolist(), stored["signatures"]):
+            index.insert(key, signature)
+        return index
+
+class NearDuplicateDetector():
+    """Incremental near-duplicate detection backed by a persisted MinHash LSH index
+
+    The index for `name` lives in a local directory or an s3:// prefix (DEDUP_INDEX_URI),
+    is loaded on first use and only written back by save(), so a failed run does not
+    record items that were never loaded. At most `max_items` recent items are kept.
+    """
+    def __init__(self, name: str, uri: str = None, s3=None, threshold: float = 0.8,
+                 num_perm: int = 128, bands: int = 16, shingle_size: int = 5, max_items: int = 500_000):
+        prefix = (uri or os.environ.get("DEDUP_INDEX_URI", DEFAULT_DEDUP_URI)).rstrip("/")
+        self.uri = f"{prefix}/{name}_minhash.npz"
+        self.s3 = s3
+        self.threshold = threshold
+        self.max_items = max_items
+        self.index_args = dict(num_perm=num_perm, bands=bands, shingle_size=shingle_size)
+        self._index = None
+
+        if self.uri.startswith("s3://"):
+            self.bucket, _, self.key = self.uri[len("s3://"):].partition("/")
+        else:
+            self.bucket, self.key = None, self.uri
+
+    def _read(self):
+        if self.bucket:
+            try:
+                return self.s3.get_object(Bucket=self.bucket, Key=self.key)["Body"].read()
+            except self.s3.exceptions.NoSuchKey:
+                return None
+        if not os.path.exists(self.key):
+            return None
+        with open(self.key, "rb") as f:
+            return f.read()
+
+    @property
+    def index(self) -> MinHashLSH:
+        if self._index is None:
+            fresh = MinHashLSH(**self.index_args)
+            data = self._read()
+            stored = MinHashLSH.from_bytes(data) if data else None
+            if stored is not None and stored.params != fresh.params:
+                logger.warning(f"Ignoring {self.uri}: built with different MinHash parameters")
+                stored = None
+            self._index = stored or fresh
+            logger.info(f"Loaded near-duplicate index {self.uri} with {len(self._index.keys)} items")
+        return self._index
+
+    def detect(self, ids: pd.Series, texts: pd.Series) -> pd.DataFrame:
+        """Check items against the index (and each other), adding the new originals
+
+        Returns one row per near-duplicate: its id, the id it duplicates and the
+        estimated similarity. An id already in the index is never its own duplicate.
+        """
+        index = self.index
+        signatures = index.signatures_for(texts.fillna("").astype(str))
+        empty = np.uint32(MAX_HASH)
+
+        duplicates = []
+        for key, signature in zip(ids.astype(str), signatures):
+            if signature[0] == empty and (signature == empty).all():
+                continue
+            best, best_similarity = None, self.threshold
+            for candidate in index.query(signature):
+                if candidate == key:
+                    continue
+                similarity = index.similarity(signature, candidate)
+                if similarity >= best_similarity:
+                    best, best_similarity = candidate, similarity
+            if best is not None:
+                duplicates.append({"id": key, "duplicate_of": best, "similarity": round(best_similarity, 3)})
+            else:
+                index.insert(key, signature)
+
+        return pd.DataFrame(duplicates, columns=["id", "duplicate_of", "similarity"])
+
+    def save(self) -> None:
+        if self._index is None:
+            return
+        body = self._index.to_bytes(self.max_items)
+        if self.bucket:
+            self.s3.put_object(Bucket=self.bucket, Key=self.key, Body=body)
+        else:
+            os.makedirs(os.path.dirname(self.key) or ".", exist_ok=True)
+            with open(self.key, "wb") as f:
+                f.write(body)
+        logger.info(f"Saved near-duplicate index to {self.uri} ({len(body)} bytes)")
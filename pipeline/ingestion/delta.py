@@ -0,0 +1,151 @@
+import os
+import logging
+from io import BytesIO
+import numpy as np
+import pandas as pd
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+DEFAULT_ROW_HASH_URI = "data/static_row_hashes"
+KEY_HASH = "_key_hash"
+ROW_HASH = "_row_hash"
+
+# Hash of a missing value, shared by every column type
+NULL_HASH = pd.util.hash_pandas_object(pd.Series([None], dtype=object), index=False).to_numpy()[0]
+
+def column_hashes(series: pd.Series) -> np.ndarray:
+    """64-bit hash of each value that does not depend on the column's dtype
+
+    Compact runs (categoricals, int16, float32), per-chunk inferred dtypes and
+    int/float flips from NaNs store the same values with different dtypes, so values
+    are hashed in a canonical form: numbers as float64, strings as Python objects.
+    """
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        categories = pd.Series(series.cat.categories.astype(object))
+        category_hashes = column_hashes(categories)
+        codes = series.cat.codes.to_numpy()
+        return np.where(codes >= 0, category_hashes[np.maximum(codes, 0)], NULL_HASH)
+    if pd.api.types.is_numeric_dtype(series.dtype):
+        canonical = series.astype("float64")
+    elif pd.api.types.is_string_dtype(series.dtype):
+        canonical = series.astype(object)
+    else:
+        canonical = series
+    hashes = pd.util.hash_pandas_object(canonical, index=False).to_numpy()
+    return np.where(series.isna().to_numpy(), NULL_HASH, hashes)
+
+def frame_hashes(df: pd.DataFrame, columns: list) -> np.ndarray:
+    """Combine per-column hashes into one 64-bit hash per row"""
+    combined = np.full(len(df), 0x345678, dtype=np.uint64)
+    multiplier = np.uint64(1000003)
+    for position, column in enumerate(columns):
+        combined ^= column_hashes(df[column])
+        combined *= multiplier
+        multiplier += np.uint64(82520 + 2 * (len(columns) - position))
+    return combined
+
+def row_hashes(df: pd.DataFrame, key_columns: list) -> pd.DataFrame:
+    """Natural key columns plus stable 64-bit hashes of the key and of the whole row"""
+    keyed = df[key_columns].reset_index(drop=True)
+    keyed[KEY_HASH] = frame_hashes(df, key_columns)
+    keyed[ROW_HASH] = frame_hashes(df, list(df.columns))
+    return keyed
+
+class RowHashManifest():
+    """Per-table row hashes of the last load, as Parquet in a local directory or an s3:// prefix"""
+    def __init__(self, uri: str = None, s3=None):
+        self.uri = (uri or os.environ.get("STATIC_ROW_HASH_URI", DEFAULT_ROW_HASH_URI)).rstrip("/")
+        self.s3 = s3
+        if self.uri.startswith("s3://"):
+            self.bucket, _, self.prefix = self.uri[len("s3://"):].partition("/")
+        else:
+            self.bucket, self.prefix = None, self.uri
+
+    def _key(self, table_name: str) -> str:
+        return f"{self.prefix}/{table_name.lower()}.parquet"
+
+    def get(self, table_name: str):
+        """Hashes from the previous load, or None if the table was never delta-loaded"""
+        key = self._key(table_name)
+        if self.bucket:
+            try:
+                body = self.s3.get_object(Bucket=self.bucket, Key=key)["Body"].read()
+            except self.s3.exceptions.NoSuchKey:
+                return None
+            return pd.read_parquet(BytesIO(body))
+        if not os.path.exists(key):
+            return None
+        return pd.read_parquet(key)
+
+    def set(self, table_name: str, hashes: pd.DataFrame) -> None:
+        key = self._key(table_name)
+        buffer = BytesIO()
+        hashes.to_parquet(buffer, compression="zstd", index=False)
+        if self.bucket:
+            self.s3.put_object(Bucket=self.bucket, Key=key, Body=buffer.getvalue())
+        else:
+            os.makedirs(os.path.dirname(key) or ".", exist_ok=True)
+            with open(key, "wb") as f:
+                f.write(buffer.getvalue())
+        logger.info(f"Saved {len(hashes)} row hashes for {table_name} to {self.uri}")
+
+class DeltaPlan():
+    """Diff processed frames (whole or chunk by chunk) against the previous load's hashes
+
+    upserts() returns the inserted and updated rows of each frame it sees; once every
+    frame has been seen, deletes() returns the keys of rows that disappeared and
+    hashes() the manifest to store for the next load.
+    """
+    def __init__(self, key_columns: list, previous: pd.DataFrame = None):
+        self.key_columns = key_columns
+        self.previous = previous
+        if previous is None:
+            self.previous_keys = pd.Index([], dtype=np.uint64)
+            self.previous_rows = np.array([], dtype=np.uint64)
+        else:
+            self.previous_keys = pd.Index(previous[KEY_HASH].to_numpy())
+            self.previous_rows = previous[ROW_HASH].to_numpy()
+        self.seen = []
+        self.seen_keys = set()
+        self.counts = {"inserted": 0, "updated": 0, "unchanged": 0, "deleted": 0}
+
+    @property
+    def bootstrap(self) -> bool:
+        """No previous hashes: the table has to be fully (re)loaded"""
+        return self.previous is None
+
+    def upserts(self, df: pd.DataFrame) -> pd.DataFrame:
+        keyed = row_hashes(df, self.key_columns)
+        key_hashes = keyed[KEY_HASH].to_numpy()
+        keys = key_hashes.tolist()
+        if len(set(keys)) != len(keys) or not self.seen_keys.isdisjoint(keys):
+            raise ValueError(f"Natural key {self.key_columns} is not unique; delta loads need a unique key")
+        self.seen_keys.update(keys)
+        self.seen.append(keyed)
+
+        # Position of each key in the previous load (-1 for new keys)
+        positions = self.previous_keys.get_indexer(key_hashes)
+        inserted = positions == -1
+        updated = np.zeros(len(keyed), dtype=bool)
+        if len(self.previous_rows):
+            previous_rows = self.previous_rows[np.where(inserted, 0, positions)]
+            updated = ~inserted & (previous_rows != keyed[ROW_HASH].to_numpy())
+        self.counts["inserted"] += int(inserted.sum())
+        self.counts["updated"] += int(updated.sum())
+        self.counts["unchanged"] += int((~inserted & ~updated).sum())
+        return df.reset_index(drop=True)[inserted | updated]
+
+    def deletes(self) -> pd.DataFrame:
+        if self.previous is None:
+            return pd.DataFrame(columns=self.key_columns)
+        seen = np.concatenate([keyed[KEY_HASH].to_numpy() for keyed in self.seen]) if self.seen else []
+        gone = ~self.previous[KEY_HASH].isin(seen)
+        self.counts["deleted"] = int(gone.sum())
+        return self.previous.loc[gone, self.key_columns].reset_index(drop=True)
+
+    def hashes(self) -> pd.DataFrame:
+        if not self.seen:
+            return pd.DataFrame(columns=self.key_columns + [KEY_HASH, ROW_HASH])
+        return pd.concat(self.seen, ignore_index=True)
@@ -0,0 +1,165 @@
+import json
+import logging
+from datetime import datetime
+from pathlib import Path
+import numpy as np
+import pandas as pd
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# How many failing values to report, matching GX's partial_unexpected_list
+PARTIAL_UNEXPECTED_COUNT = 20
+
+# Dtypes compact frames (see compact.py) use in place of a suite's declared type
+COMPACT_TYPES = {
+    "object": {"category"},
+    "int64": {"int8", "int16", "int32"},
+    "float64": {"float32"}
+}
+
+def _column_map_result(series: pd.Series, unexpected: np.ndarray, mostly: float = None,
+                       count_nulls: bool = False) -> tuple:
+    """Summarize a per-row boolean check the way GX column map expectations do
+
+    Nulls are excluded from the denominator unless the check is about nulls itself.
+    """
+    element_count = len(series)
+    unexpected = np.asarray(unexpected, dtype=bool)
+    nonnull = series.notna().to_numpy()
+    denominator = element_count if count_nulls else int(nonnull.sum())
+    if not count_nulls:
+        unexpected = unexpected & nonnull
+
+    unexpected_count = int(unexpected.sum())
+    unexpected_percent = 100.0 * unexpected_count / denominator if denominator else 0.0
+    threshold = 1.0 if mostly is None else mostly
+    success = denominator == 0 or (denominator - unexpected_count) / denominator >= threshold
+
+    partial = series[unexpected].head(PARTIAL_UNEXPECTED_COUNT).tolist()
+    return success, {
+        "element_count": element_count,
+        "unexpected_count": unexpected_count,
+        "unexpected_percent": unexpected_percent,
+        "partial_unexpected_list": partial
+    }
+
+def _missing_column(column: str) -> tuple:
+    return False, {"details": f"Column {column} does not exist"}
+
+def check_table_columns_to_match_ordered_list(df, column_list, **_):
+    observed = list(df.columns)
+    return observed == list(column_list), {"observed_value": observed}
+
+def check_column_to_exist(df, column, **_):
+    return column in df.columns, {}
+
+def check_column_values_to_not_be_null(df, column, mostly=None, **_):
+    if column not in df.columns:
+        return _missing_column(column)
+    series = df[column]
+    return _column_map_result(series, series.isna().to_numpy(), mostly, count_nulls=True)
+
+def check_column_values_to_be_between(df, column, min_value=None, max_value=None, strict_min=False,
+                                      strict_max=False, mostly=None, **_):
+    if column not in df.columns:
+        return _missing_column(column)
+    series = df[column]
+
+    # Compare only non-null values; nulls are never unexpected for this expectation
+    nonnull = series.notna().to_numpy()
+    values = series.to_numpy()[nonnull]
+    inside = np.ones(len(values), dtype=bool)
+    if min_value is not None:
+        inside &= (values > min_value) if strict_min else (values >= min_value)
+    if max_value is not None:
+        inside &= (values < max_value) if strict_max else (values <= max_value)
+
+    unexpected = np.zeros(len(series), dtype=bool)
+    unexpected[nonnull] = ~inside
+    return _column_map_result(series, unexpected, mostly)
+
+def check_column_values_to_be_in_set(df, column, value_set, mostly=None, **_):
+    if column not in df.columns:
+        return _missing_column(column)
+    series = df[column]
+    return _column_map_result(series, ~series.isin(value_set).to_numpy(), mostly)
+
+def check_column_values_to_be_of_type(df, column, type_, compact=False, **_):
+    if column not in df.columns:
+        return _missing_column(column)
+    observed = str(df[column].dtype)
+    success = observed == type_ or (compact and observed in COMPACT_TYPES.get(type_, ()))
+    return success, {"observed_value": observed}
+
+def check_column_values_to_match_strftime_format(df, column, strftime_format, mostly=None, **_):
+    if column not in df.columns:
+        return _missing_column(column)
+    series = df[column]
+
+    # Parse each distinct value once; formats repeat heavily (e.g. one value per date)
+    def matches(value) -> bool:
+        try:
+            datetime.strptime(str(value), strftime_format)
+            return True
+        except ValueError:
+            return False
+
+    uniques = series.dropna().unique()
+    bad_values = [value for value in uniques if not matches(value)]
+    return _column_map_result(series, series.isin(bad_values).to_numpy(), mostly)
+
+# Expectation types the fast path can evaluate; anything else falls back to GX
+CHECKS = {
+    "expect_table_columns_to_match_ordered_list": check_table_columns_to_match_ordered_list,
+    "expect_column_to_exist": check_column_to_exist,
+    "expect_column_values_to_not_be_null": check_column_values_to_not_be_null,
+    "expect_column_values_to_be_between": check_column_values_to_be_between,
+    "expect_column_values_to_be_in_set": check_column_values_to_be_in_set,
+    "expect_column_values_to_be_of_type": check_column_values_to_be_of_type,
+    "expect_column_values_to_match_strftime_format": check_column_values_to_match_strftime_format
+}
+
+class CompiledSuite():
+    """A GX expectation suite compiled to vectorized pandas/NumPy checks"""
+    def __init__(self, suite_name: str, expectations: list):
+        self.suite_name = suite_name
+        self.expectations = expectations
+
+    @classmethod
+    def from_file(cls, path):
+        """Compile a suite JSON file; returns None if any expectation type is unsupported"""
+        with open(path, "r") as f:
+            suite = json.load(f)
+
+        expectations = suite.get("expectations", [])
+        unsupported = {e["expectation_type"] for e in expectations if e["expectation_type"] not in CHECKS}
+        if unsupported:
+            logger.info(f"{suite['expectation_suite_name']} uses unsupported expectations {sorted(unsupported)}")
+            return None
+        return cls(suite["expectation_suite_name"], expectations)
+
+    def validate(self, df: pd.DataFrame, compact: bool = False) -> tuple:
+        """Run every check, returning (success, [per-expectation results])
+
+        compact=True accepts categoricals and downcast numerics for the declared types.
+        """
+        results = []
+        for expectation in self.expectations:
+            expectation_type = expectation["expectation_type"]
+            success, result = CHECKS[expectation_type](df, compact=compact, **expectation["kwargs"])
+            results.append({
+                "expectation_type": expectation_type,
+                "kwargs": expectation["kwargs"],
+                "success": bool(success),
+                "result": result
+            })
+        return all(r["success"] for r in results), results
+
+def compile_suite(project_root, suite_name: str):
+    """Compile gx/expectations/<suite_name>.json under the GX project root"""
+    path = Path(project_root) / "gx" / "expectations" / f"{suite_name}.json"
+    if not path.exists():
+        return None
+    return CompiledSuite.from_file(path)
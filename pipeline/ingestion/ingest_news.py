@@ -1,47 +1,87 @@
 from pipeline.ingestion import BaseIngestor
+from pipeline.ingestion.news_client import NewsAPIClient, NEWS_API_URL, day_slices
 import logging
 import pandas as pd
-import requests
 import os
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
+def news_window(days: int = 7) -> tuple:
+    """Start (UTC midnight `days` ago) and end (now) of a run's query window, as naive UTC
+
+    NewsAPI reads from/to as UTC and aggregate_daily groups by UTC day, so slices
+    must follow UTC days whatever the worker's local timezone is.
+    """
+    end = datetime.now(timezone.utc).replace(tzinfo=None)
+    start = datetime.combine((end - timedelta(days=days)).date(), datetime.min.time())
+    return start, end
+
+def news_slices(days: int = 7) -> list:
+    """Per-day (from, to) slices of the query window, e.g. one per mapped task"""
+    return day_slices(*news_window(days))
+
 class NewsIngestor(BaseIngestor):
-    def __init__(self):
-        super().__init__()
+    # Raw frames carry author and the source struct; processed frames the daily source lists
+    dictionary_columns = ["author", "source.name", "sources"]
+    watermark_key = "news"
+    watermark_order = "publishedAt"
+    dedup_key = "news"
+
+    def __init__(self, incremental: bool = False, max_workers: int = 4, requests_per_second: float = 1.0,
+                 dedup: str = None, date_slice: tuple = None):
+        # date_slice=(from, to) fetches only that slice and names the outputs after its day
+        super().__init__(incremental=incremental, dedup=dedup,
+                         partition=date_slice[0][:10] if date_slice else None)
+        self.date_slice = date_slice
         self.api_key = os.getenv('NEWS_API_KEY')
-        self.base_url = 'https://newsapi.org/v2/everything'
+        # NEWS_API_BASE_URL points the client at a local stub server (see news_stub_server.py)
+        self.base_url = os.getenv('NEWS_API_BASE_URL', NEWS_API_URL)
+        self.query = '("mental health" OR anxiety OR depression OR "suicide prevention")'
+        self.client = NewsAPIClient(
+            self.api_key,
+            base_url=self.base_url,
+            max_workers=max_workers,
+            requests_per_second=requests_per_second
+        )
         
     def load_data(self) -> pd.DataFrame:
         try:
             logger.info("Fetching mental health news from News API...")
             
             # Query last 7 days (free tier works well with weekly ingestion)
+            start, end = news_window()
+
+            # Incremental runs start from the newest article already ingested
+            last_published = None
+            if self.incremental:
+                last_published = self.watermarks.get(self.watermark_name()).get('publishedAt')
+                if last_published:
+                    start = max(start, datetime.strptime(last_published[:19], '%Y-%m-%dT%H:%M:%S'))
+
             params = {
-                'q': '("mental health" OR anxiety OR depression OR "suicide prevention")',
+                'q': self.query,
                 'language': 'en',
-                'sortBy': 'publishedAt',
-                'from': (datetime.now() - timedelta(days=7)).strftime('%Y-%m-%d'),
-                'to': datetime.now().strftime('%Y-%m-%d'),
-                'pageSize': 100,  # Max allowed by free tier
-                'apiKey': self.api_key
+                'sortBy': 'publishedAt'
             }
-            
-            response = requests.get(self.base_url, params=params, timeout=30)
-            response.raise_for_status()
-            
-            data = response.json()
-            
-            if data.get('status') != 'ok':
-                raise ValueError(f"News API error: {data.get('message', 'Unknown error')}")
-            
-            articles = data.get('articles', [])
+            if self.date_slice:
+                articles = self.client.fetch_slice(params, *self.date_slice)
+            else:
+                articles = self.client.fetch_range(params, start, end)
             logger.info(f"Fetched {len(articles)} articles from News API on {self.today}")
             
-            # Convert to DataFrame
+            # Convert to DataFrame (day slices can share boundary articles)
             df = pd.DataFrame(articles)
+            if not df.empty:
+                df = df.drop_duplicates(subset='url').reset_index(drop=True)
+
+            if self.incremental and not df.empty:
+                # NewsAPI timestamps are uniform ISO-8601 UTC strings, so they compare lexically
+                if last_published:
+                    df = df[df['publishedAt'] > last_published]
+                if not df.empty:
+                    self.pending_watermarks = {self.watermark_name(): {'publishedAt': df['publishedAt'].max()}}
             
             return df
             
@@ -51,42 +91,58 @@ class NewsIngestor(BaseIngestor):
 
     def process_data(self, df):
         """Process and aggregate news data by date"""
-        processed_df = df.copy()
-        
-        # Parse published date
-        processed_df['publishedAt'] = pd.to_datetime(
-            processed_df['publishedAt'], 
-            errors='coerce'
-        )
-        processed_df['date'] = processed_df['publishedAt'].dt.date
-        
-        # Extract source name
-        processed_df['source_name'] = processed_df['source'].apply(
-            lambda x: x.get('name', 'Unknown') if isinstance(x, dict) else 'Unknown'
-        )
-        
-        # Group by date and aggregate
-        daily_agg = processed_df.groupby('date').agg({
-            'title': ['count', lambda x: ' | '.join(x.head(5))],  # Count + sample headlines
-            'source_name': lambda x: ', '.join(set(x))  # Unique sources
-        }).reset_index()
-        
-        # Flatten column names
-        daily_agg.columns = ['date', 'article_count', 'sample_headlines', 'sources']
-        
-        # Convert date to string for JSON serialization (it's already a date object from groupby)
-        daily_agg['date'] = daily_agg['date'].astype(str)
-        
-        # Sort by date
-        daily_agg = daily_agg.sort_values('date')
-        
+        # Syndicated stories run under near-identical headlines at many outlets
+        df = self.handle_near_duplicates(df, df['url'], df['title'])
+
+        daily_agg = aggregate_daily(df)
+
         logger.info(f"Processed {len(daily_agg)} days of news data")
         logger.info(f"Date range: {daily_agg['date'].min()} to {daily_agg['date'].max()}")
         logger.info(f"Total articles: {daily_agg['article_count'].sum()}")
-        
+
         return daily_agg
 
-    
+def aggregate_daily(df: pd.DataFrame, n_headlines: int = 5) -> pd.DataFrame:
+    """Daily article count, first headlines and distinct sources, without per-row Python
+
+    Dates are UTC calendar days of publishedAt; articles with unparseable dates are
+    dropped. sources lists each day's distinct source names in order of first
+    appearance ('Unknown' when an article has no source name).
+    """
+    # Parse published date and truncate to the day (grouping on datetime64 instead of date objects)
+    published = pd.to_datetime(df['publishedAt'], errors='coerce', utc=True)
+    day = published.dt.floor('D')
+
+    # Extract source name as a categorical
+    source = df['source'] if 'source' in df.columns else pd.Series(index=df.index, dtype=object)
+    names = pd.json_normalize([x if isinstance(x, dict) else {} for x in source])
+    source_name = names['name'] if 'name' in names.columns else pd.Series(index=names.index, dtype=object)
+    source_name = pd.Categorical(source_name.fillna('Unknown'))
+
+    articles = pd.DataFrame({'day': day, 'title': df['title'], 'source_name': source_name})
+    articles = articles[articles['day'].notna()]
+
+    # Count + sample headlines
+    article_count = articles.groupby('day')['title'].count()
+    titles = articles[['day', 'title']].dropna()
+    sample_headlines = titles.groupby('day').head(n_headlines).groupby('day')['title'].agg(' | '.join)
+
+    # Unique sources
+    pairs = articles[['day', 'source_name']].drop_duplicates()
+    sources = pairs['source_name'].astype(str).groupby(pairs['day']).agg(', '.join)
+
+    daily_agg = pd.DataFrame({
+        'article_count': article_count.astype('int64'),
+        'sample_headlines': sample_headlines.reindex(article_count.index, fill_value=''),
+        'sources': sources.reindex(article_count.index, fill_value='')
+    }).reset_index()
+
+    # Convert date to string for JSON serialization
+    daily_agg.insert(0, 'date', daily_agg.pop('day').dt.strftime('%Y-%m-%d'))
+
+    # Sort by date
+    return daily_agg.sort_values('date').reset_index(drop=True)
+
 if __name__ == "__main__":
     news_ingestor = NewsIngestor()
     news_ingestor.run("news", "news_suite", True, True)
\ No newline at end of file
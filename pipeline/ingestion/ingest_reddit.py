@@ -1,5 +1,7 @@
 from pipeline.ingestion import BaseIngestor
 import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone, timedelta
 import logging
 import praw
@@ -9,36 +11,107 @@ import pandas as pd
 # Configure logging
 logger = logging.getLogger(__name__)
 
+DEFAULT_SUBREDDITS = ["mentalhealth", "depression", "anxiety"]
+
 class RedditIngestor(BaseIngestor):
-    def __init__(self):
-        super().__init__()
-        self.reddit = praw.Reddit(
+    dictionary_columns = ["subreddit"]
+    watermark_key = "reddit"
+    watermark_order = "created_utc"
+    dedup_key = "reddit"
+
+    def __init__(self, subreddits: list = None, listing: str = "hot", limit: int = 50,
+                 lookback_days: int = 7, max_workers: int = 4, stale_streak: int = 10,
+                 incremental: bool = False, dedup: str = None, partition: str = None):
+        super().__init__(incremental=incremental, dedup=dedup, partition=partition)
+        self.subreddits = subreddits or DEFAULT_SUBREDDITS
+        self.listing = listing
+        self.limit = limit
+        self.lookback_days = lookback_days
+        self.max_workers = max_workers
+        # Consecutive non-stickied posts past the cutoff before a hot/top listing is abandoned
+        self.stale_streak = stale_streak
+        self._local = threading.local()
+
+    def _make_client(self):
+        return praw.Reddit(
             client_id=os.getenv("REDDIT_CLIENT_ID"),
             client_secret=os.getenv("REDDIT_CLIENT_SECRET"),
             user_agent=os.getenv("REDDIT_USER_AGENT")
         )
-        self.subreddits = ["mentalhealth", "depression", "anxiety"]
-    
+
+    def _client(self):
+        """PRAW instances are not thread safe, so each worker thread gets its own"""
+        if not hasattr(self._local, "reddit"):
+            self._local.reddit = self._make_client()
+        return self._local.reddit
+
+    def _fetch_subreddit(self, sub: str, cutoff: float) -> list:
+        """Fetch posts newer than `cutoff` from one subreddit listing"""
+        listing = getattr(self._client().subreddit(sub), self.listing)(limit=self.limit)
+
+        posts = []
+        stale = 0
+        for post in listing:
+            if post.created_utc <= cutoff:
+                # Pinned posts are often old and do not say anything about the rest of the listing
+                if getattr(post, "stickied", False):
+                    continue
+                stale += 1
+                # "new" is sorted by creation time, so the first old post ends it
+                if self.listing == "new" or stale >= self.stale_streak:
+                    break
+                continue
+
+            stale = 0
+            posts.append({
+                "id": post.id,
+                "subreddit": sub,
+                "title": post.title,
+                "score": post.score,
+                "created_utc": post.created_utc,
+                "url": post.url,
+                "selftext": post.selftext[:500],
+                "num_comments": post.num_comments
+            })
+
+        logger.info(f"Fetched {len(posts)} posts from r/{sub}")
+        return posts
+
+    def _next_watermarks(self, results: list) -> dict:
+        """Newest created_utc / post id of each subreddit that returned posts, by watermark name"""
+        marks = {}
+        for sub, sub_posts in zip(self.subreddits, results):
+            if not sub_posts:
+                continue
+            newest = max(sub_posts, key=lambda p: p["created_utc"])
+            marks[self.watermark_name(sub)] = {"created_utc": newest["created_utc"], "post_id": newest["id"]}
+        return marks
+
+    def _seen_utc(self, sub: str, legacy: dict):
+        """Stored created_utc for a subreddit, falling back to the old all-subreddit mark"""
+        mark = self.watermarks.get(self.watermark_name(sub))
+        return mark.get("created_utc", legacy.get("created_utc", {}).get(sub))
+
     def load_data(self):
         try:
-            posts = []
-            for sub in self.subreddits:
-                for post in self.reddit.subreddit(sub).hot(limit=50):
-                    posts.append({
-                        "subreddit": sub,
-                        "title": post.title,
-                        "score": post.score,
-                        "created_utc": post.created_utc,
-                        "url": post.url,
-                        "selftext": post.selftext[:500],
-                        "num_comments": post.num_comments
-                    })
-
-            last_week = datetime.now(timezone.utc) - timedelta(days=7)
-            posts = [
-                p for p in posts
-                if datetime.fromtimestamp(p["created_utc"], tz=timezone.utc) > last_week
-            ]
+            cutoff = (datetime.now(timezone.utc) - timedelta(days=self.lookback_days)).timestamp()
+
+            # Per-subreddit cutoffs: never look further back than the newest post already ingested
+            cutoffs = {sub: cutoff for sub in self.subreddits}
+            if self.incremental:
+                legacy = self.watermarks.get(self.watermark_key)
+                for sub in self.subreddits:
+                    cutoffs[sub] = max(cutoff, self._seen_utc(sub, legacy) or cutoff)
+
+            # Bounded pool keeps concurrent requests within Reddit's per-client rate limit
+            n_workers = max(1, min(self.max_workers, len(self.subreddits)))
+            with ThreadPoolExecutor(max_workers=n_workers) as pool:
+                results = list(pool.map(lambda sub: self._fetch_subreddit(sub, cutoffs[sub]), self.subreddits))
+                posts = [post for sub_posts in results for post in sub_posts]
+
+            if self.incremental:
+                self.pending_watermarks = self._next_watermarks(results)
+
             return pd.DataFrame(posts)
         
         except Exception as e:
@@ -47,9 +120,15 @@ class RedditIngestor(BaseIngestor):
 
     
     def process_data(self, df):
+        # Crossposts between subreddits share title and text
+        df = self.handle_near_duplicates(df, df["id"], df["title"] + " " + df["selftext"].fillna(""))
+
         df["created_utc"] = pd.to_datetime(df["created_utc"], unit="s", utc=True)
         df["date"] = df["created_utc"].dt.strftime("%Y-%m-%d")
-        return df[["subreddit", "date", "title", "selftext", "score", "num_comments"]].rename(
+        # Set by flag-mode dedup; always present so every run writes the same columns
+        if "duplicate_of" not in df.columns:
+            df["duplicate_of"] = None
+        return df[["subreddit", "date", "title", "selftext", "score", "num_comments", "duplicate_of"]].rename(
             columns={"selftext": "text", "num_comments": "comments"}
         )
 
@@ -0,0 +1,68 @@
+"""Local stand-in for the NewsAPI /v2/everything endpoint
+
+Serves a fixed list of articles with the same from/to filtering, pagination and
+error payloads as NewsAPI, so NewsIngestor/NewsAPIClient can run without network:
+
+    with NewsAPIStubServer(articles) as server:
+        NewsAPIClient("test", base_url=server.url).fetch_range(...)
+"""
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+class NewsAPIStubServer():
+    def __init__(self, articles: list, host: str = "127.0.0.1", port: int = 0, max_results: int = None):
+        self.articles = sorted(articles, key=lambda a: a["publishedAt"], reverse=True)
+        self.max_results = max_results
+        self.requests = 0
+        self.server = ThreadingHTTPServer((host, port), self._handler())
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    @property
+    def url(self) -> str:
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}/v2/everything"
+
+    def _handler(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                stub.requests += 1
+                query = {k: v[0] for k, v in parse_qs(urlparse(self.path).query).items()}
+                status, body = stub.respond(query)
+                payload = json.dumps(body).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
+
+    def respond(self, query: dict):
+        """Build the (status, body) NewsAPI would return for a query"""
+        date_from = query.get("from", "")
+        date_to = query.get("to", "9999")
+        matches = [a for a in self.articles if date_from <= a["publishedAt"].rstrip("Z") <= date_to]
+
+        page = int(query.get("page", 1))
+        page_size = int(query.get("pageSize", 100))
+        start = (page - 1) * page_size
+        if self.max_results is not None and start >= self.max_results:
+            return 426, {"status": "error", "code": "maximumResultsReached",
+                         "message": f"You have requested too many results. Limit is {self.max_results}."}
+
+        return 200, {"status": "ok", "totalResults": len(matches), "articles": matches[start:start + page_size]}
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.server.shutdown()
+        self.server.server_close()
@@ -1,15 +1,149 @@
+import time
+import logging
+import argparse
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, wait, FIRST_COMPLETED
 from pipeline.ingestion.static_ingestor import (
     MentalHealthInTechSurveyIngestor,
-    WHOSuicideStatisticsIngestor, 
+    WHOSuicideStatisticsIngestor,
     MentalHealthCareInLast4WeeksIngestor,
     SuicideByDemographicsIngestor
 )
 
-def run_all_static_sources():
-    MentalHealthInTechSurveyIngestor().run("tech_survey_processed", "tech_survey_suite", "TECH_SURVEY")
-    WHOSuicideStatisticsIngestor().run("who_suicide_processed", "who_suicide_suite", "WHO_SUICIDE")
-    MentalHealthCareInLast4WeeksIngestor().run("mental_health_care_processed", "mental_health_care_suite", "MENTAL_HEALTH_CARE")
-    SuicideByDemographicsIngestor().run("suicide_demographics_processed", "suicide_demographics_suite", "SUICIDE_DEMOGRAPHICS")
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Static sources and the sources each one must wait for
+STATIC_SOURCES = {
+    "tech_survey": {
+        "ingestor": MentalHealthInTechSurveyIngestor,
+        "args": ("tech_survey_processed", "tech_survey_suite", "TECH_SURVEY"),
+        "depends_on": []
+    },
+    "who_suicide": {
+        "ingestor": WHOSuicideStatisticsIngestor,
+        "args": ("who_suicide_processed", "who_suicide_suite", "WHO_SUICIDE"),
+        "depends_on": []
+    },
+    "mental_health_care": {
+        "ingestor": MentalHealthCareInLast4WeeksIngestor,
+        "args": ("mental_health_care_processed", "mental_health_care_suite", "MENTAL_HEALTH_CARE"),
+        "depends_on": []
+    },
+    "suicide_demographics": {
+        "ingestor": SuicideByDemographicsIngestor,
+        "args": ("suicide_demographics_processed", "suicide_demographics_suite", "SUICIDE_DEMOGRAPHICS"),
+        "depends_on": []
+    }
+}
+
+def check_dependencies(sources: dict) -> None:
+    """Reject unknown dependencies and cycles before anything runs"""
+    for name, source in sources.items():
+        unknown = set(source["depends_on"]) - set(sources)
+        if unknown:
+            raise ValueError(f"{name} depends on unknown sources: {sorted(unknown)}")
+
+    visiting, done = set(), set()
+    def visit(name):
+        if name in done:
+            return
+        if name in visiting:
+            raise ValueError(f"Dependency cycle through {name}")
+        visiting.add(name)
+        for dep in sources[name]["depends_on"]:
+            visit(dep)
+        visiting.discard(name)
+        done.add(name)
+
+    for name in sources:
+        visit(name)
+
+def run_source(name: str, source: dict, chunksize: int = None, force: bool = False, delta: bool = False,
+               compact: bool = False) -> dict:
+    """Run one static ingestor, capturing failure instead of raising"""
+    start = time.perf_counter()
+    ingestor = None
+    try:
+        ingestor = source["ingestor"]()
+        rows = ingestor.run(*source["args"], chunksize=chunksize, force=force, delta=delta,
+                            compact=compact)
+        status, error = ("skipped" if ingestor.skipped else "succeeded"), None
+    except Exception as e:
+        logger.error(f"{name} failed: {e}")
+        rows, status, error = None, "failed", str(e)
+    metrics = ingestor.metrics.summary() if ingestor is not None and ingestor.metrics is not None else []
+    return {"source": name, "status": status, "rows": rows, "seconds": time.perf_counter() - start,
+            "error": error, "metrics": metrics}
+
+def log_summary(results: dict) -> None:
+    logger.info("Static ingestion summary:")
+    for name, result in results.items():
+        rows = "-" if result["rows"] is None else result["rows"]
+        logger.info(f"  {name:<22} {result['status']:<10} {result['seconds']:>8.1f}s  rows={rows}")
+        if result["error"]:
+            logger.info(f"  {'':<22} {result['error']}")
+
+def run_all_static_sources(chunksize: int = None, force: bool = False, max_workers: int = 4,
+                           use_processes: bool = False, sources: dict = None, delta: bool = False,
+                           compact: bool = False, raise_on_failure: bool = True) -> dict:
+    """Run static ingestors concurrently, respecting declared dependencies
+
+    A failed source never aborts the others; sources that depend on it are marked
+    'blocked'. Returns per-source status/timing results, or raises once every source
+    has finished if any failed or was blocked (unless raise_on_failure=False).
+    Threads share one GX context, so full-GX validation runs one source at a time;
+    the fast validator (GX_FAST_PATH) or use_processes=True keeps it parallel.
+    """
+    sources = sources or STATIC_SOURCES
+    check_dependencies(sources)
+
+    executor_cls = ProcessPoolExecutor if use_processes else ThreadPoolExecutor
+    results, running = {}, {}
+    pending = dict(sources)
+
+    with executor_cls(max_workers=max_workers) as pool:
+        while pending or running:
+            # Block sources whose dependencies did not succeed
+            for name, source in list(pending.items()):
+                failed_deps = [d for d in source["depends_on"]
+                               if results.get(d, {}).get("status") in ("failed", "blocked")]
+                if failed_deps:
+                    results[name] = {"source": name, "status": "blocked", "rows": None, "seconds": 0.0,
+                                     "error": f"dependency failed: {', '.join(failed_deps)}", "metrics": []}
+                    del pending[name]
+
+            # Submit every source whose dependencies have finished
+            for name, source in list(pending.items()):
+                if all(d in results for d in source["depends_on"]):
+                    running[pool.submit(run_source, name, source, chunksize, force, delta, compact)] = name
+                    del pending[name]
+
+            if not running:
+                continue
+
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                results[running.pop(future)] = future.result()
+
+    results = {name: results[name] for name in sources}
+    log_summary(results)
+
+    unsuccessful = [name for name, result in results.items() if result["status"] in ("failed", "blocked")]
+    if unsuccessful and raise_on_failure:
+        raise RuntimeError(f"Static ingestion failed for: {', '.join(unsuccessful)}")
+    return results
 
 if __name__ == "__main__":
-    run_all_static_sources()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Run all static source ingestors")
+    parser.add_argument("--force", action="store_true", help="Reload sources even if unchanged")
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--processes", action="store_true", help="Use a process pool instead of threads")
+    parser.add_argument("--chunksize", type=int, default=None)
+    parser.add_argument("--delta", action="store_true", help="Merge only changed rows instead of reloading tables")
+    parser.add_argument("--compact", action="store_true",
+                        help="Use categoricals and downcast numerics to cut peak memory")
+    args = parser.parse_args()
+
+    run_all_static_sources(chunksize=args.chunksize, force=args.force, max_workers=args.workers,
+                           use_processes=args.processes, delta=args.delta, compact=args.compact)
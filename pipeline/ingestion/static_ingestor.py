@@ -4,10 +4,17 @@ from great_expectations.data_context import get_context
 from great_expectations.core.batch import BatchRequest
 from abc import ABC, abstractmethod
 from .validator import Validator
+from .watermark import WatermarkStore
+from .delta import DeltaPlan, RowHashManifest
+from .compact import map_categories, downcast_numerics, memory_report
 from dotenv import load_dotenv
 import boto3
 import os
 import sys
+import json
+import hashlib
+import inspect
+from datetime import date, datetime
 from pathlib import Path
 
 if os.path.exists('.env.local'):
@@ -18,13 +25,47 @@ else:
 project_root = Path(__file__).parent.parent.parent
 sys.path.insert(0, str(project_root))
 from pipeline.snowflake.load_snowflake import snowflake_connection
+from pipeline.metrics import MetricsRecorder, frame_bytes
+from snowflake.connector.pandas_tools import write_pandas
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Manifest of the last successfully loaded version of each raw file
+DEFAULT_MANIFEST_URI = "data/static_manifest.json"
+
+# Rows per staged Parquet file for the COPY-based Snowflake load
+STATIC_LOAD_CHUNK_ROWS = 1_000_000
+
+def _is_plain_date(value) -> bool:
+    return isinstance(value, date) and not isinstance(value, datetime)
+
+def is_date_column(series: pd.Series) -> bool:
+    """Check whether an object column holds only datetime.date values"""
+    values = series.dropna()
+    if values.empty or not _is_plain_date(values.iloc[0]):
+        return False
+    return bool(values.map(_is_plain_date).all())
+
 class StaticIngestor(ABC):
+    # S3 key of the raw CSV under static_data/raw/
+    source_key = None
+    # Raw text columns read as strings, so a chunk where one is empty or looks numeric
+    # still parses it like every other chunk (categorical_columns take precedence)
+    string_columns = []
+    # Dtypes of the processed numeric columns, pinned on every processed frame; with
+    # string_columns this fixes the table DDL whichever rows land in the first chunk
+    processed_dtypes = {}
+    # Columns uniquely identifying a processed row; required for delta loads
+    natural_key = None
+    # Low-cardinality raw CSV columns read as categoricals in compact mode
+    categorical_columns = []
+
     def __init__(self):
+        self.rows_dropped = 0
+        # Compact mode: categoricals and downcast numerics (set per run)
+        self.compact = False
 
         # S3 config
         self.S3_BUCKET = "mental-health-project-pipeline"
@@ -35,6 +76,19 @@ class StaticIngestor(ABC):
             region_name=os.environ.get("AWS_DEFAULT_REGION", "us-east-1")
         )
 
+        # Manifest lives next to the watermarks: a local JSON file or an s3:// object
+        self.manifest = WatermarkStore(os.environ.get("STATIC_MANIFEST_URI", DEFAULT_MANIFEST_URI), s3=self.s3)
+
+        # Row hashes of the last delta load of each table
+        self.row_hashes = RowHashManifest(s3=self.s3)
+
+        # Per-stage metrics for the current run; metrics_sink=None writes JSON lines locally
+        self.metrics_sink = None
+
+        # Set by run when the source was unchanged and nothing was loaded
+        self.skipped = False
+        self.metrics = None
+
     @abstractmethod
     def load_data(self) -> pd.DataFrame:
         """Fetch or load raw data from a data source"""
@@ -45,8 +99,27 @@ class StaticIngestor(ABC):
         """Clean and transform raw data"""
         pass
 
+    def read_csv(self, body, **kwargs):
+        """Read a raw CSV with string_columns as strings; compact mode parses
+        categorical_columns straight into categoricals"""
+        dtype = {col: "object" for col in self.string_columns}
+        if self.compact:
+            dtype.update({col: "category" for col in self.categorical_columns})
+        return pd.read_csv(body, dtype=dtype or None, **kwargs)
+
+    def load_chunks(self, chunksize: int):
+        """Stream the raw CSV from S3 as DataFrames of at most `chunksize` rows"""
+        response = self.s3.get_object(Bucket=self.S3_BUCKET, Key=self.source_key)
+        return self.read_csv(response['Body'], chunksize=chunksize)
+
+    def _record_dropped(self, initial_rows: int, final_rows: int):
+        """Log rows removed by dropna and keep a running total across chunks"""
+        dropped = initial_rows - final_rows
+        self.rows_dropped += dropped
+        logger.info(f"Removed {dropped} rows with missing essential data")
+
     def load_static_to_s3(self, df: pd.DataFrame, file_name: str):
-        """Load processed data to AWS S3"""
+        """Load processed data to AWS S3, returning the number of bytes written"""
         try:
             processed_key = f"static_data/processed/{file_name.lower()}.json"
             json_buffer = df.to_json(orient='records', date_format='iso')
@@ -58,90 +131,353 @@ class StaticIngestor(ABC):
             )
 
             logger.info(f"Saved processed data to s3://{self.S3_BUCKET}/{processed_key}")
+            return len(json_buffer)
         except Exception as e:
             logger.error(f"Failed to save processed data to S3: {e}")
+            raise
+
 
+    def _snowflake_columns(self, df: pd.DataFrame) -> list:
+        """Map DataFrame dtypes to Snowflake column definitions"""
+        columns = []
+        for col in df.columns:
+            dtype = df[col].dtype
+            if pd.api.types.is_bool_dtype(dtype):
+                columns.append(f'"{col}" BOOLEAN')
+            elif pd.api.types.is_integer_dtype(dtype):
+                columns.append(f'"{col}" INTEGER')
+            elif pd.api.types.is_float_dtype(dtype):
+                columns.append(f'"{col}" FLOAT')
+            elif isinstance(dtype, pd.DatetimeTZDtype):
+                columns.append(f'"{col}" TIMESTAMP_TZ')
+            elif pd.api.types.is_datetime64_dtype(dtype):
+                columns.append(f'"{col}" TIMESTAMP_NTZ')
+            elif dtype == 'object' and is_date_column(df[col]):
+                columns.append(f'"{col}" DATE')
+            else:
+                columns.append(f'"{col}" VARCHAR(16777216)')
+        return columns
+
+    def _rows_to_tuples(self, df: pd.DataFrame) -> list:
+        """Convert a DataFrame to row tuples for executemany (legacy insert path)"""
+        data_tuples = []
+        for _, row in df.iterrows():
+            tuple_row = []
+            for value in row:
+                if pd.isna(value):
+                    tuple_row.append(None)
+                elif hasattr(value, 'strftime'):
+                    tuple_row.append(str(value))
+                else:
+                    tuple_row.append(value)
+            data_tuples.append(tuple(tuple_row))
+        return data_tuples
+
+    def load_static_to_snowflake(self, df: pd.DataFrame, table_name: str, method: str = "copy",
+                                 replace: bool = True):
+        """Load processed data to Snowflake
+
+        method='copy' stages the frame as compressed Parquet and loads it with a single
+        COPY (via write_pandas); method='insert' is the original row-by-row executemany path.
+        replace=False appends to the existing table instead of recreating it.
+        """
+        if method not in ("copy", "insert"):
+            raise ValueError(f"Unknown Snowflake load method: {method}")
 
-    def load_static_to_snowflake(self, df: pd.DataFrame, table_name: str):
-        """Load processed data to Snowflake"""
         try:
             with snowflake_connection() as conn:
                 cursor = conn.cursor()
-                
-                # Create table
-                columns = []
-                for col in df.columns:
-                    if df[col].dtype == 'object':
-                        columns.append(f'"{col}" VARCHAR(16777216)')
-                    elif df[col].dtype in ['int64', 'int32']:
-                        columns.append(f'"{col}" INTEGER')
-                    elif df[col].dtype in ['float64', 'float32']:
-                        columns.append(f'"{col}" FLOAT')
-                    elif df[col].dtype == 'bool':
-                        columns.append(f'"{col}" BOOLEAN')
-                    elif 'datetime' in str(df[col].dtype):
-                        columns.append(f'"{col}" VARCHAR(16777216)')
-                    else:
-                        columns.append(f'"{col}" VARCHAR(16777216)')
-                
+
                 # Create table SQL statement
-                create_sql = f"""
-                CREATE OR REPLACE TABLE STATIC.{table_name} (
-                    {', '.join(columns)}
-                )
-                """
-                cursor.execute(create_sql)
-                
-                data_tuples = []
-                for _, row in df.iterrows():
-                    tuple_row = []
-                    for value in row:
-                        if pd.isna(value):
-                            tuple_row.append(None)
-                        elif hasattr(value, 'strftime'): 
-                            tuple_row.append(value.strftime('%Y-%m-%d %H:%M:%S'))
-                        else:
-                            tuple_row.append(value)
-                    data_tuples.append(tuple(tuple_row))
-                
-                # Bulk insert
-                placeholders = ', '.join(['%s'] * len(df.columns))
-                insert_sql = f"INSERT INTO STATIC.{table_name} VALUES ({placeholders})"
-                
-                cursor.executemany(insert_sql, data_tuples)
+                if replace:
+                    create_sql = f"""
+                    CREATE OR REPLACE TABLE STATIC.{table_name} (
+                        {', '.join(self._snowflake_columns(df))}
+                    )
+                    """
+                    cursor.execute(create_sql)
+
+                if method == "copy":
+                    # PUT compressed Parquet chunks to the table stage and COPY them in one statement
+                    success, n_chunks, n_rows, _ = write_pandas(
+                        conn,
+                        df.reset_index(drop=True),
+                        table_name,
+                        schema="STATIC",
+                        chunk_size=STATIC_LOAD_CHUNK_ROWS,
+                        compression="snappy",
+                        use_logical_type=True
+                    )
+                    if not success:
+                        raise RuntimeError(f"COPY into STATIC.{table_name} did not succeed")
+                    logger.info(f"Staged {n_chunks} Parquet chunks ({n_rows} rows) for STATIC.{table_name}")
+                else:
+                    # Bulk insert
+                    placeholders = ', '.join(['%s'] * len(df.columns))
+                    insert_sql = f"INSERT INTO STATIC.{table_name} VALUES ({placeholders})"
+                    cursor.executemany(insert_sql, self._rows_to_tuples(df))
+
                 conn.commit()
-                
+
             logger.info(f"Loaded {len(df)} rows to STATIC.{table_name}")
         except Exception as e:
             logger.error(f"Failed to load {table_name} to Snowflake: {e}")
             raise
-    
-    def run(self, file_name: str, gx_suite: str, table_name: str):
-        """Main loading, processing, and saving logic"""
-        # Load data
-        raw_df = self.load_data()
 
-        if raw_df.empty:
-            logger.warning(f"No data found for {table_name}")
-            return None
+    def merge_static_to_snowflake(self, upserts: pd.DataFrame, deletes: pd.DataFrame, table_name: str,
+                                  columns: list):
+        """Apply inserted/updated rows and deleted keys to STATIC.<table> with one MERGE
+
+        Both frames are COPYed into a temporary table shaped like the target plus a
+        _DELTA_OP column ('U' upsert, 'D' delete), matched on the natural key.
+        """
+        deletes = deletes if deletes is not None else pd.DataFrame(columns=self.natural_key)
+        if upserts.empty and deletes.empty:
+            logger.info(f"No changes to merge into STATIC.{table_name}")
+            return
+
+        delta_table = f"{table_name}_DELTA"
+        quoted = lambda col: f'"{col}"'
+        on = " AND ".join(f"EQUAL_NULL(target.{quoted(c)}, source.{quoted(c)})" for c in self.natural_key)
+        updates = ", ".join(f"target.{quoted(c)} = source.{quoted(c)}" for c in columns if c not in self.natural_key)
+        merge_sql = f"""
+        MERGE INTO STATIC.{table_name} AS target
+        USING STATIC.{delta_table} AS source
+        ON {on}
+        WHEN MATCHED AND source."_DELTA_OP" = 'D' THEN DELETE
+        {f"WHEN MATCHED THEN UPDATE SET {updates}" if updates else ""}
+        WHEN NOT MATCHED AND source."_DELTA_OP" = 'U' THEN INSERT ({", ".join(quoted(c) for c in columns)})
+            VALUES ({", ".join(f"source.{quoted(c)}" for c in columns)})
+        """
 
-        # Process data
-        processed_df = self.process_data(raw_df)
+        try:
+            with snowflake_connection() as conn:
+                cursor = conn.cursor()
+                cursor.execute(f"CREATE OR REPLACE TEMPORARY TABLE STATIC.{delta_table} LIKE STATIC.{table_name}")
+                cursor.execute(f'ALTER TABLE STATIC.{delta_table} ADD COLUMN "_DELTA_OP" VARCHAR(1)')
+
+                # Stage upserts and deleted keys separately so key-only rows do not change column dtypes
+                for op, frame in (("U", upserts), ("D", deletes)):
+                    if frame.empty:
+                        continue
+                    success, _, _, _ = write_pandas(
+                        conn,
+                        frame.reset_index(drop=True).assign(_DELTA_OP=op),
+                        delta_table,
+                        schema="STATIC",
+                        chunk_size=STATIC_LOAD_CHUNK_ROWS,
+                        compression="snappy",
+                        use_logical_type=True
+                    )
+                    if not success:
+                        raise RuntimeError(f"COPY into STATIC.{delta_table} did not succeed")
+
+                cursor.execute(merge_sql)
+                result = cursor.fetchone()
+                conn.commit()
 
-        # Validate data
-        validator = Validator()
-        if not validator.validate(processed_df, gx_suite):
-            raise ValueError(f"Validation failed for suite: {gx_suite}")
+            logger.info(f"Merged {len(upserts)} upserts and {len(deletes)} deletes into STATIC.{table_name}"
+                        f"{f' (rows inserted/updated/deleted: {result})' if result else ''}")
+        except Exception as e:
+            logger.error(f"Failed to merge delta into {table_name}: {e}")
+            raise
 
+    def delta_plan(self, table_name: str):
+        """Diff plan against the last delta load, or None if this source has no natural key"""
+        if not self.natural_key:
+            logger.warning(f"{type(self).__name__} has no natural key; falling back to a full reload")
+            return None
+        plan = DeltaPlan(self.natural_key, self.row_hashes.get(table_name))
+        if plan.bootstrap:
+            logger.info(f"No row hashes for {table_name} yet; reloading it fully to start delta loads")
+        return plan
+
+    def _finish_delta(self, plan: DeltaPlan, table_name: str, columns: list, apply_deletes: bool = False):
+        """Apply deletes still pending and store the row hashes for the next delta load"""
+        if plan is None:
+            return
+        if apply_deletes and not plan.bootstrap:
+            with self.metrics.stage("snowflake_merge_deletes", table=table_name) as stage:
+                deletes = plan.deletes()
+                stage.rows = len(deletes)
+                self.merge_static_to_snowflake(pd.DataFrame(columns=columns), deletes, table_name, columns)
+        self.row_hashes.set(table_name, plan.hashes())
+        logger.info(f"Delta load of {table_name}: {plan.counts}")
+
+    def processing_fingerprint(self, **config) -> str:
+        """Hash of the processing code and run configuration applied to the raw file"""
+        try:
+            code = inspect.getsource(type(self).process_data)
+        except (OSError, TypeError):
+            code = type(self).process_data.__qualname__
+        payload = json.dumps({"code": code, "dtypes": self.processed_dtypes, **config}, sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    def source_state(self, **config) -> dict:
+        """Current S3 ETag of the raw file plus the processing fingerprint"""
+        head = self.s3.head_object(Bucket=self.S3_BUCKET, Key=self.source_key)
+        return {"etag": head["ETag"].strip('"'), "config": self.processing_fingerprint(**config)}
+
+    def run(self, file_name: str, gx_suite: str, table_name: str, chunksize: int = None, force: bool = False,
+            delta: bool = False, compact: bool = False):
+        """Main loading, processing, and saving logic; returns the number of rows loaded
+
+        Returns None only when the source is unchanged and was skipped (self.skipped is
+        then True); any failure to read, validate or load raises. delta=True merges only inserted, updated and deleted rows (by natural_key) into
+        the existing table instead of recreating it. compact=True reads low-cardinality
+        strings as categoricals and downcasts processed numerics to cut peak memory.
+        """
+        self.metrics = MetricsRecorder(table_name, sink=self.metrics_sink)
+        self.compact = compact
+        self.skipped = False
+        try:
+            # Skip download -> process -> validate -> load when neither the file nor the config changed
+            state = self.source_state(file_name=file_name, gx_suite=gx_suite, table_name=table_name, chunksize=chunksize,
+                                      compact=compact)
+            if not force and self.manifest.get(self.source_key) == state:
+                logger.info(f"Skipping {table_name}: {self.source_key} unchanged since last load")
+                self.skipped = True
+                return None
+
+            plan = self.delta_plan(table_name) if delta else None
+            if chunksize:
+                rows_loaded = self.run_chunked(file_name, gx_suite, table_name, chunksize, plan)
+            else:
+                rows_loaded = self.run_full(file_name, gx_suite, table_name, plan)
+
+            self.manifest.set(self.source_key, state)
+            return rows_loaded
+        finally:
+            self.metrics.close()
+
+    def pin_dtypes(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Cast processed columns to processed_dtypes so every chunk has the whole-file schema"""
+        dtypes = {col: dtype for col, dtype in self.processed_dtypes.items() if col in df.columns}
+        return df.astype(dtypes) if dtypes else df
+
+    def validator(self) -> Validator:
+        # Compact runs use the fast path, which checks compact dtypes without expanding the frame
+        return Validator(fast=True if self.compact else None)
+
+    def _process_and_validate(self, raw_df: pd.DataFrame, gx_suite: str, validator: Validator, **fields):
+        # Process data
+        with self.metrics.stage("process", **fields) as stage:
+            processed_df = self.pin_dtypes(self.process_data(raw_df))
+            if self.compact:
+                processed_df = downcast_numerics(processed_df)
+                stage.fields.update(memory_report(processed_df, f"Processed {type(self).__name__}"))
+            stage.rows, stage.bytes = len(processed_df), frame_bytes(processed_df)
+
+        if processed_df.empty:
+            return processed_df
+
+        # Validate data (compact frames are checked as is against the suites' declared dtypes)
+        with self.metrics.stage("validate", suite=gx_suite, **fields) as stage:
+            stage.rows = len(processed_df)
+            if not validator.validate(processed_df, gx_suite, compact=self.compact):
+                raise ValueError(f"Validation failed for suite: {gx_suite}")
+
+        return processed_df
+
+    def _load_outputs(self, processed_df: pd.DataFrame, file_name: str, table_name: str,
+                      replace: bool = True, plan: DeltaPlan = None, last: bool = False, **fields):
         # Save data to S3
-        self.load_static_to_s3(processed_df, file_name)
+        with self.metrics.stage("upload_processed", **fields) as stage:
+            stage.rows = len(processed_df)
+            stage.bytes = self.load_static_to_s3(processed_df, file_name)
 
         # Save data to Snowflake
-        self.load_static_to_snowflake(processed_df, table_name)
+        if plan is None or plan.bootstrap:
+            with self.metrics.stage("snowflake_load", table=table_name, **fields) as stage:
+                stage.rows = len(processed_df)
+                if plan is not None:
+                    plan.upserts(processed_df)
+                self.load_static_to_snowflake(processed_df, table_name, replace=replace)
+        else:
+            # Delta load: only changed rows (and, on the last frame, deleted keys) are staged
+            with self.metrics.stage("snowflake_merge", table=table_name, **fields) as stage:
+                upserts = plan.upserts(processed_df)
+                deletes = plan.deletes() if last else None
+                stage.rows = len(upserts) + (len(deletes) if deletes is not None else 0)
+                self.merge_static_to_snowflake(upserts, deletes, table_name, list(processed_df.columns))
+
+    def run_full(self, file_name: str, gx_suite: str, table_name: str, plan: DeltaPlan = None):
+        """Process, validate and load the whole source in memory"""
+        # Load data
+        with self.metrics.stage("load") as stage:
+            raw_df = self.load_data()
+            stage.rows, stage.bytes = len(raw_df), frame_bytes(raw_df)
+            if self.compact and not raw_df.empty:
+                stage.fields.update(memory_report(raw_df, f"Raw {type(self).__name__}"))
+
+        # load_data logs and returns an empty frame when the download fails
+        if raw_df.empty:
+            raise RuntimeError(f"No data found for {table_name}")
+
+        processed_df = self._process_and_validate(raw_df, gx_suite, self.validator())
+        self._load_outputs(processed_df, file_name, table_name, plan=plan, last=True)
+        self._finish_delta(plan, table_name, list(processed_df.columns))
 
         logger.info(f"Completed {table_name}")
+        return len(processed_df)
+
+    def run_chunked(self, file_name: str, gx_suite: str, table_name: str, chunksize: int,
+                    plan: DeltaPlan = None):
+        """Process, validate and load the source chunk by chunk with bounded memory"""
+        try:
+            chunks = iter(self.load_chunks(chunksize))
+        except Exception as e:
+            logger.error(f"Failed to open {self.source_key} from S3: {e}")
+            raise
+
+        validator = self.validator()
+        self.rows_dropped = 0
+        rows_read = rows_loaded = n_parts = chunk_no = 0
+
+        while True:
+            # Load data
+            with self.metrics.stage("load", chunk=chunk_no) as stage:
+                chunk = next(chunks, None)
+                stage.rows = 0 if chunk is None else len(chunk)
+            if chunk is None:
+                break
+            rows_read += len(chunk)
+
+            processed_chunk = self._process_and_validate(chunk, gx_suite, validator, chunk=chunk_no)
+            chunk_no += 1
+            if processed_chunk.empty:
+                continue
+
+            # Append chunk to S3 and Snowflake (first chunk recreates the table)
+            self._load_outputs(processed_chunk, f"{file_name}/part-{n_parts:05d}", table_name,
+                               replace=(n_parts == 0), plan=plan, chunk=chunk_no - 1)
+            columns = list(processed_chunk.columns)
+
+            rows_loaded += len(processed_chunk)
+            n_parts += 1
+
+        if n_parts == 0:
+            raise RuntimeError(f"No data found for {table_name}")
+
+        # Rows missing from every chunk were deleted at the source
+        self._finish_delta(plan, table_name, columns, apply_deletes=True)
+
+        logger.info(f"Removed {self.rows_dropped} rows with missing essential data across all chunks")
+        logger.info(f"Completed {table_name}: {rows_loaded} of {rows_read} rows loaded in {n_parts} chunks")
+        return rows_loaded
 
 class MentalHealthInTechSurveyIngestor(StaticIngestor):
+    source_key = "static_data/raw/mental_health_in_tech_survey.csv"
+    string_columns = [
+        "Timestamp", "Gender", "Country", "state", "self_employed", "family_history", "treatment",
+        "work_interfere", "no_employees", "remote_work", "tech_company", "benefits", "care_options",
+        "wellness_program", "seek_help", "anonymity", "leave", "mental_health_consequence",
+        "phys_health_consequence", "coworkers", "supervisor", "mental_health_interview",
+        "phys_health_interview", "mental_vs_physical", "obs_consequence", "comments"
+    ]
+    processed_dtypes = {"Age": "int64"}
+    categorical_columns = ["Gender", "Country", "state"]
+
     def __init__(self):
         super().__init__()
 
@@ -149,28 +485,23 @@ class MentalHealthInTechSurveyIngestor(StaticIngestor):
         try:
             response = self.s3.get_object(
                 Bucket=self.S3_BUCKET,
-                Key='static_data/raw/mental_health_in_tech_survey.csv'
+                Key=self.source_key
             )
-            df = pd.read_csv(response['Body'])
+            df = self.read_csv(response['Body'])
             return df
         except Exception as e:
             logger.error(f"Failed to load Mental Health in Tech Survey data from S3: {e}")
             return pd.DataFrame() 
     
     def process_data(self, df: pd.DataFrame):
-        # Keep only standard Male/Female responses
-        df['Gender'] = df['Gender'].str.lower().str.strip()
-        
-        # Keep only rows that start with 'm' or 'f' 
-        mask = df['Gender'].str.startswith('m') | df['Gender'].str.startswith('f')
-        df = df[mask].copy()
-        
-        # Standardize to Male/Female
-        df.loc[df['Gender'].str.startswith('m'), 'Gender'] = 'Male'
-        df.loc[df['Gender'].str.startswith('f'), 'Gender'] = 'Female'
+        # Standardize responses starting with 'm' or 'f' to Male/Female; anything else becomes missing
+        df['Gender'] = map_categories(
+            df['Gender'],
+            lambda g: g.str.lower().str.strip().str[:1].map({'m': 'Male', 'f': 'Female'})
+        )
 
-        # Remove age outliers
-        df = df[(df['Age'] >= 16) & (df['Age'] <= 80)]
+        # Keep only Male/Female responses and remove age outliers in one pass
+        df = df[df['Gender'].notna() & (df['Age'] >= 16) & (df['Age'] <= 80)]
 
         # Remove free text
         df = df.drop(columns=['comments'])
@@ -183,6 +514,13 @@ class MentalHealthInTechSurveyIngestor(StaticIngestor):
         return df
 
 class WHOSuicideStatisticsIngestor(StaticIngestor):
+    source_key = "static_data/raw/who_suicide_statistics.csv"
+    string_columns = ["country", "sex", "age"]
+    processed_dtypes = {"year": "int64", "suicides_no": "float64", "population": "float64",
+                        "suicide_rate_per_100k": "float64"}
+    natural_key = ["country", "year", "sex", "age"]
+    categorical_columns = ["country", "sex", "age"]
+
     def __init__(self):
         super().__init__()
     
@@ -190,9 +528,9 @@ class WHOSuicideStatisticsIngestor(StaticIngestor):
         try:
             response = self.s3.get_object(
                 Bucket=self.S3_BUCKET,
-                Key='static_data/raw/who_suicide_statistics.csv'
+                Key=self.source_key
             )
-            df = pd.read_csv(response['Body'])
+            df = self.read_csv(response['Body'])
             return df
         except Exception as e:
             logger.error(f"Failed to load WHO Suicide Statistics data from S3: {e}")
@@ -201,27 +539,33 @@ class WHOSuicideStatisticsIngestor(StaticIngestor):
     def process_data(self, df: pd.DataFrame):
         # Reformat and clean sex column
         gender_mapping = {"male": "Male", "female": "Female"}
-        df["sex"] = df["sex"].str.lower().str.strip() 
-        df["sex"] = df["sex"].map(gender_mapping)
+        df["sex"] = map_categories(df["sex"], lambda sex: sex.str.lower().str.strip().map(gender_mapping))
 
         # Fill NA values in suicide_no with 0
         df["suicides_no"] = df["suicides_no"].fillna(0)
 
         # Clean country name
-        df["country"] = df["country"].str.strip()
+        df["country"] = map_categories(df["country"], lambda country: country.str.strip())
 
         # Suicide rate per 100k population
         df["suicide_rate_per_100k"] = (df["suicides_no"] / df["population"]) * 100000
 
         # Data validation
-        df = df[df["year"] > 1900] 
-        df = df[df["population"] > 0]
+        df = df[(df["year"] > 1900) & (df["population"] > 0)]
 
         logger.info(f"Processed WHO Suicide Statistics data: {len(df)} rows")
 
         return df
     
 class MentalHealthCareInLast4WeeksIngestor(StaticIngestor):
+    source_key = "static_data/raw/mental_health_care_in_the_last_4_weeks.csv"
+    string_columns = ["Indicator", "Group", "State", "Subgroup", "Phase", "Time Period Label",
+                      "Time Period Start Date", "Time Period End Date", "Confidence Interval",
+                      "Quartile Range", "Suppression Flag"]
+    processed_dtypes = {"Time Period": "int64", "Value": "float64", "LowCI": "float64", "HighCI": "float64"}
+    natural_key = ["Indicator", "Group", "State", "Subgroup", "Time Period"]
+    categorical_columns = ["Indicator", "Group", "State", "Subgroup"]
+
     def __init__(self):
         super().__init__()
 
@@ -229,9 +573,9 @@ class MentalHealthCareInLast4WeeksIngestor(StaticIngestor):
         try:
             response = self.s3.get_object(
                 Bucket=self.S3_BUCKET,
-                Key='static_data/raw/mental_health_care_in_the_last_4_weeks.csv'
+                Key=self.source_key
             )
-            df = pd.read_csv(response['Body'])
+            df = self.read_csv(response['Body'])
             return df
         except Exception as e:
             logger.error(f"Failed to load Mental Health Care in Last 4 Weeks data from S3: {e}")
@@ -248,24 +592,28 @@ class MentalHealthCareInLast4WeeksIngestor(StaticIngestor):
     
         initial_rows = len(df)
         df = df.dropna(subset=essential_cols)
-        final_rows = len(df)
-    
-        logger.info(f"Removed {initial_rows - final_rows} rows with missing essential data")
+        self._record_dropped(initial_rows, len(df))
 
         # Convert date columns to proper datetime
         df['Time Period Start Date'] = pd.to_datetime(df['Time Period Start Date'])
         df['Time Period End Date'] = pd.to_datetime(df['Time Period End Date'])
 
         # Clean categorical columns
-        df['State'] = df['State'].str.strip()
-        df['Group'] = df['Group'].str.strip()
-        df['Subgroup'] = df['Subgroup'].str.strip()
+        for col in ['State', 'Group', 'Subgroup']:
+            df[col] = map_categories(df[col], lambda values: values.str.strip())
 
         logger.info(f"Processed Mental Health Care in Last 4 Weeks data: {len(df)} rows")
 
         return df
 
 class SuicideByDemographicsIngestor(StaticIngestor):
+    source_key = "static_data/raw/death_rates_for_suicide_by_sex_race_hispanic_origin_and_age_united_states.csv"
+    # Raw headers are upper case; process_data lower-cases them
+    string_columns = ["INDICATOR", "UNIT", "STUB_NAME", "STUB_LABEL", "AGE", "FLAG"]
+    processed_dtypes = {"year": "int64", "estimate": "float64"}
+    natural_key = ["indicator", "unit", "stub_name", "stub_label", "year", "age"]
+    categorical_columns = ["INDICATOR", "UNIT", "STUB_NAME", "STUB_LABEL", "AGE"]
+
     def __init__(self):
         super().__init__()
     
@@ -273,9 +621,9 @@ class SuicideByDemographicsIngestor(StaticIngestor):
         try:
             response = self.s3.get_object(
                 Bucket=self.S3_BUCKET,
-                Key='static_data/raw/death_rates_for_suicide_by_sex_race_hispanic_origin_and_age_united_states.csv'
+                Key=self.source_key
             )
-            df = pd.read_csv(response['Body'])
+            df = self.read_csv(response['Body'])
             return df
         except Exception as e:
             logger.error(f"Failed to load Death Rates for Suicide by Demographic data from S3: {e}")
@@ -290,11 +638,8 @@ class SuicideByDemographicsIngestor(StaticIngestor):
                              'year_num', 'age_num'], errors='ignore')
 
         # Clean categorical columns
-        df['indicator'] = df['indicator'].str.strip() 
-        df['unit'] = df['unit'].str.strip() 
-        df['stub_name'] = df['stub_name'].str.strip()
-        df['stub_label'] = df['stub_label'].str.strip() 
-        df['age'] = df['age'].str.strip()
+        for col in ['indicator', 'unit', 'stub_name', 'stub_label', 'age']:
+            df[col] = map_categories(df[col], lambda values: values.str.strip())
 
         # Improve column names
         df['demographic_category'] = df['stub_name']
@@ -304,14 +649,11 @@ class SuicideByDemographicsIngestor(StaticIngestor):
         essential_cols = ['indicator', 'unit', 'stub_name', 'stub_label', 'year', 
                         'age', 'estimate', 'demographic_category', 'demographic_value']
         
-        initial_rows = len(df)
-        df = df.dropna(subset=essential_cols)
-        final_rows = len(df)
-        
-        logger.info(f"Removed {initial_rows - final_rows} rows with missing essential data")
+        complete = df[essential_cols].notna().all(axis=1)
+        self._record_dropped(len(df), int(complete.sum()))
 
-        # Data validation
-        df = df[df['year'] >= 1950]
+        # Data validation (filtered together with the null check to copy the frame once)
+        df = df[complete & (df['year'] >= 1950)]
 
         logger.info(f"Processed Death Rates for Suicide by Demographic data: {len(df)} rows")
 
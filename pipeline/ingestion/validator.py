@@ -1,50 +1,113 @@
+import os
+import copy
 import logging
+import threading
+from functools import lru_cache
 import pandas as pd
 import great_expectations as gx
 from pathlib import Path
+from .fast_validator import compile_suite
+from .compact import expand_dtypes
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# GX contexts and their default pandas datasource are not thread-safe: every
+# read_dataframe registers an asset and batch on the shared datasource
+_gx_lock = threading.Lock()
+
+def gx_project_root() -> str:
+    if Path('/opt/airflow').exists():
+        return '/opt/airflow' # Docker path
+    return str(Path(__file__).parent.parent.parent) # Local path
+
+@lru_cache(maxsize=None)
+def get_gx_context(project_root: str):
+    """Data context, built once per process and project root"""
+    logger.info(f"Using GX project root: {project_root}")
+    return gx.get_context(project_root_dir=project_root)
+
+@lru_cache(maxsize=None)
+def get_expectation_suite(project_root: str, suite_name: str):
+    """Expectation suite, loaded once per process"""
+    return get_gx_context(project_root).get_expectation_suite(expectation_suite_name=suite_name)
+
+@lru_cache(maxsize=None)
+def get_compiled_suite(project_root: str, suite_name: str):
+    """Fast-path checks for a suite, or None if it needs full GX"""
+    return compile_suite(project_root, suite_name)
+
 class Validator():
-    def __init__(self):
-        pass 
+    def __init__(self, fast: bool = None):
+        # fast=True evaluates suites with compiled pandas/NumPy checks, falling back
+        # to GX for suites that use expectation types the fast path does not support.
+        # Defaults to the GX_FAST_PATH environment variable so pipelines can opt in.
+        if fast is None:
+            fast = os.environ.get("GX_FAST_PATH", "").lower() in ("1", "true")
+        self.fast = fast
 
-    def validate(self, df: pd.DataFrame, suite_name: str):
-        """Perform data validation with Great Expectations"""
+    def validate(self, df: pd.DataFrame, suite_name: str, compact: bool = False):
+        """Perform data validation with Great Expectations
+
+        compact=True validates a compact frame (categoricals, downcast numerics) as is
+        on the fast path; GX needs the declared dtypes, so it gets an expanded copy.
+        """
         try:
-            if Path('/opt/airflow').exists():
-                project_root = '/opt/airflow' # Docker path
-            else:
-                project_root = Path(__file__).parent.parent.parent # Local path
-        
-            logger.info(f"Using GX project root: {project_root}")
-
-            # Get context and load existing suite
-            context = gx.get_context(project_root_dir=str(project_root))
-            suite = context.get_expectation_suite(expectation_suite_name=suite_name)
-            
+            project_root = gx_project_root()
+
+            if self.fast:
+                compiled = get_compiled_suite(project_root, suite_name)
+                if compiled is not None:
+                    return self._validate_fast(compiled, df, suite_name, compact)
+                logger.info(f"Falling back to GX for {suite_name}")
+
+            if compact:
+                logger.warning(f"Expanding compact dtypes to validate {suite_name} with GX")
+                df = expand_dtypes(df)
+            return self._validate_gx(project_root, df, suite_name)
+
+        except Exception as e:
+            logger.error(f"Failed to validate {suite_name}: {e}")
+            return False
+
+    def _validate_fast(self, compiled, df: pd.DataFrame, suite_name: str, compact: bool = False):
+        success, results = compiled.validate(df, compact=compact)
+
+        # Log which expectations failed
+        if not success:
+            logger.error(f"{suite_name} validation FAILED")
+            for result in results:
+                if not result["success"]:
+                    logger.error(f"  FAILED: {result['expectation_type']}")
+                    logger.error(f"    {result['result']}")
+
+        logger.info(f"{suite_name} validation {'PASSED' if success else 'FAILED'} (fast path)")
+        return success
+
+    def _validate_gx(self, project_root: str, df: pd.DataFrame, suite_name: str):
+        # One thread at a time uses the shared context (fast-path checks are not serialized)
+        with _gx_lock:
+            # Get cached context and a copy of the cached suite
+            context = get_gx_context(project_root)
+            suite = copy.deepcopy(get_expectation_suite(project_root, suite_name))
+
             # Create validator with existing suite
             validator = context.sources.pandas_default.read_dataframe(df)
             validator.expectation_suite = suite
-            
+
             # Run validation
             results = validator.validate()
 
-            # Log which expectations failed
-            if not results.success:
-                logger.error(f"{suite_name} validation FAILED")
-                for result in results.results:
-                    if not result.success:
-                        logger.error(f"  FAILED: {result.expectation_config.expectation_type}")
-                        logger.error(f"    {result.result}")
-            else:
-                logger.info(f"{suite_name} validation PASSED")
-            
-            logger.info(f"{suite_name} validation {'PASSED' if results.success else 'FAILED'}")
-            return results.success
-            
-        except Exception as e:
-            logger.error(f"Failed to validate {suite_name}: {e}")
-            return False
\ No newline at end of file
+        # Log which expectations failed
+        if not results.success:
+            logger.error(f"{suite_name} validation FAILED")
+            for result in results.results:
+                if not result.success:
+                    logger.error(f"  FAILED: {result.expectation_config.expectation_type}")
+                    logger.error(f"    {result.result}")
+        else:
+            logger.info(f"{suite_name} validation PASSED")
+
+        logger.info(f"{suite_name} validation {'PASSED' if results.success else 'FAILED'}")
+        return results.success
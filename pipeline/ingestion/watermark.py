@@ -0,0 +1,119 @@
+import os
+import json
+import logging
+from urllib.parse import quote
+from botocore.exceptions import ClientError
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+DEFAULT_WATERMARK_URI = "data/watermarks.json"
+
+# Conditional S3 writes retried when another writer got in first
+MAX_WRITE_ATTEMPTS = 5
+CONFLICT_CODES = ("PreconditionFailed", "ConditionalRequestConflict")
+
+class WatermarkStore():
+    """Per-source high-water marks persisted as local JSON files or S3 objects
+
+    Each source (or source:partition) is its own object next to the uri, e.g.
+    data/watermarks/reddit%3Adepression.json for data/watermarks.json, so mapped
+    tasks never rewrite each other's marks. Writes to one source are serialized
+    with a file lock locally and with conditional puts on S3. Sources only found in
+    the single-file layout of uri are still read from it.
+    """
+    def __init__(self, uri: str = None, s3=None):
+        self.uri = uri or os.environ.get("WATERMARK_URI", DEFAULT_WATERMARK_URI)
+        self.s3 = s3
+        if self.uri.startswith("s3://"):
+            self.bucket, _, self.key = self.uri[len("s3://"):].partition("/")
+        else:
+            self.bucket, self.key = None, self.uri
+        self.prefix = self.key[:-len(".json")] if self.key.endswith(".json") else self.key
+
+    def _source_key(self, source: str) -> str:
+        return f"{self.prefix}/{quote(source, safe='')}.json"
+
+    def _read(self, key: str) -> tuple:
+        """(contents or None, S3 ETag or None)"""
+        if self.bucket:
+            try:
+                response = self.s3.get_object(Bucket=self.bucket, Key=key)
+            except self.s3.exceptions.NoSuchKey:
+                return None, None
+            return json.loads(response["Body"].read()), response["ETag"]
+
+        if not os.path.exists(key):
+            return None, None
+        with open(key, "r") as f:
+            return json.load(f), None
+
+    def get(self, source: str) -> dict:
+        """Return the stored watermark for a source (empty if never ingested)"""
+        mark, _ = self._read(self._source_key(source))
+        if mark is None:
+            legacy, _ = self._read(self.key)
+            return (legacy or {}).get(source, {})
+        return mark
+
+    @staticmethod
+    def _advances(current: dict, watermark: dict, order_by: str) -> bool:
+        if order_by is None or not current or current.get(order_by) is None:
+            return True
+        return watermark.get(order_by) is not None and watermark[order_by] > current[order_by]
+
+    def set(self, source: str, watermark: dict, order_by: str = None) -> bool:
+        """Persist the watermark for a source, leaving other sources untouched
+
+        With order_by, the mark is only written if that field moves forward, so a
+        late or concurrent run can never move a watermark backwards. Returns
+        whether the mark was written.
+        """
+        key = self._source_key(source)
+        written = self._set_s3(key, source, watermark, order_by) if self.bucket else \
+            self._set_local(key, source, watermark, order_by)
+        if written:
+            logger.info(f"Updated {source} watermark in {self.uri}: {watermark}")
+        else:
+            logger.info(f"Kept {source} watermark: {watermark} does not advance it")
+        return written
+
+    def _set_local(self, key: str, source: str, watermark: dict, order_by: str) -> bool:
+        os.makedirs(os.path.dirname(key) or ".", exist_ok=True)
+        with open(f"{key}.lock", "w") as lock:
+            if fcntl is not None:
+                fcntl.flock(lock, fcntl.LOCK_EX)
+            current = self.get(source)
+            if not self._advances(current, watermark, order_by):
+                return False
+            tmp_path = f"{key}.{os.getpid()}.tmp"
+            with open(tmp_path, "w") as f:
+                f.write(json.dumps(watermark, indent=2, sort_keys=True))
+            os.replace(tmp_path, key)
+        return True
+
+    def _set_s3(self, key: str, source: str, watermark: dict, order_by: str) -> bool:
+        body = json.dumps(watermark, indent=2, sort_keys=True)
+        for _ in range(MAX_WRITE_ATTEMPTS):
+            current, etag = self._read(key)
+            if current is None:
+                current = self.get(source)
+            if not self._advances(current, watermark, order_by):
+                return False
+
+            # Only write over the version just read (or create if there was none)
+            condition = {"IfMatch": etag} if etag else {"IfNoneMatch": "*"}
+            try:
+                self.s3.put_object(Bucket=self.bucket, Key=key, Body=body, **condition)
+                return True
+            except ClientError as e:
+                if e.response.get("Error", {}).get("Code") not in CONFLICT_CODES:
+                    raise
+                logger.info(f"Concurrent update of {source} watermark; retrying")
+        raise RuntimeError(f"Could not update {source} watermark after {MAX_WRITE_ATTEMPTS} attempts")
@@ -0,0 +1,179 @@
+import os
+import json
+import time
+import logging
+import threading
+import tracemalloc
+from contextlib import contextmanager
+from datetime import datetime, timezone
+import pandas as pd
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+DEFAULT_METRICS_PATH = "data/metrics/ingestion_metrics.jsonl"
+
+# tracemalloc is process-wide: recorders share one start/stop through a reference
+# count, and a stage only resets the peak when no other traced stage is running
+_tracing_lock = threading.Lock()
+_tracing_users = 0
+_active_stages = 0
+
+def trace_memory_enabled() -> bool:
+    """Opt-in tracemalloc peaks via METRICS_TRACE_MEMORY (tracing slows every allocation)"""
+    return os.environ.get("METRICS_TRACE_MEMORY", "").lower() in ("1", "true")
+
+def _acquire_tracing() -> None:
+    global _tracing_users
+    with _tracing_lock:
+        if _tracing_users == 0 and not tracemalloc.is_tracing():
+            tracemalloc.start()
+        _tracing_users += 1
+
+def _release_tracing() -> None:
+    global _tracing_users
+    with _tracing_lock:
+        _tracing_users -= 1
+        if _tracing_users == 0 and tracemalloc.is_tracing():
+            tracemalloc.stop()
+
+def _enter_traced_stage() -> None:
+    global _active_stages
+    with _tracing_lock:
+        if _active_stages == 0:
+            tracemalloc.reset_peak()
+        _active_stages += 1
+
+def _exit_traced_stage() -> float:
+    global _active_stages
+    with _tracing_lock:
+        _active_stages -= 1
+        return round(tracemalloc.get_traced_memory()[1] / 2**20, 2)
+
+def frame_bytes(df: pd.DataFrame) -> int:
+    """In-memory size of a DataFrame, including object payloads"""
+    return int(df.memory_usage(deep=True).sum())
+
+def rss_mb():
+    """Current resident set size of this process in MB (None where /proc is unavailable)"""
+    try:
+        with open("/proc/self/statm") as f:
+            resident_pages = int(f.read().split()[1])
+    except (OSError, IndexError, ValueError):
+        return None
+    return round(resident_pages * os.sysconf("SC_PAGE_SIZE") / 2**20, 1)
+
+def process_peak_rss_mb():
+    """High-water resident set size of the whole process so far, in MB (None where unavailable)"""
+    if resource is None:
+        return None
+    # ru_maxrss is reported in KB on Linux
+    return round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1)
+
+class JSONLinesSink():
+    """Append metric records as JSON lines to a local file"""
+    def __init__(self, path: str = None):
+        self.path = path or os.environ.get("METRICS_PATH", DEFAULT_METRICS_PATH)
+        self.lock = threading.Lock()
+
+    def emit(self, record: dict) -> None:
+        with self.lock:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            with open(self.path, "a") as f:
+                f.write(json.dumps(record, default=str) + "\n")
+
+class LoggingSink():
+    """Emit metric records through the logger"""
+    def emit(self, record: dict) -> None:
+        logger.info(f"METRICS {json.dumps(record, default=str)}")
+
+class Stage():
+    """Mutable handle for the stage being timed; set rows/bytes inside the block"""
+    def __init__(self, name: str, **fields):
+        self.name = name
+        self.rows = None
+        self.bytes = None
+        self.fields = fields
+
+class MetricsRecorder():
+    """Per-stage wall time, memory peaks and row/byte counts for one ingestion run
+
+    Each finished stage becomes a structured record sent to the sink (any object
+    with emit(record)) and kept in `records`. Each stage records the current RSS at
+    its end and the change since its start (rss_mb, rss_delta_mb), plus the process
+    high-water mark so far (process_peak_rss_mb, which never goes down and is not a
+    per-stage number). tracemalloc peaks are opt-in (trace_memory=True or METRICS_TRACE_MEMORY=1) and
+    process-wide, so stages that overlap in threads share their peak.
+    """
+    def __init__(self, run_name: str, sink=None, trace_memory: bool = None):
+        self.run_name = run_name
+        self.sink = sink if sink is not None else JSONLinesSink()
+        self.trace_memory = trace_memory_enabled() if trace_memory is None else trace_memory
+        self.run_id = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S%f")
+        self.records = []
+        self.lock = threading.Lock()
+        self._tracing = False
+
+    @contextmanager
+    def stage(self, name: str, **fields):
+        stage = Stage(name, **fields)
+        if self.trace_memory:
+            with self.lock:
+                if not self._tracing:
+                    _acquire_tracing()
+                    self._tracing = True
+            _enter_traced_stage()
+
+        status = "succeeded"
+        start_rss = rss_mb()
+        start = time.perf_counter()
+        try:
+            yield stage
+        except Exception:
+            status = "failed"
+            raise
+        finally:
+            traced_peak = _exit_traced_stage() if self.trace_memory else None
+            end_rss = rss_mb()
+            record = {
+                "run": self.run_name,
+                "run_id": self.run_id,
+                "stage": name,
+                "status": status,
+                "seconds": round(time.perf_counter() - start, 4),
+                "rows": stage.rows,
+                "bytes": stage.bytes,
+                "tracemalloc_peak_mb": traced_peak,
+                "rss_mb": end_rss,
+                "rss_delta_mb": None if start_rss is None or end_rss is None else round(end_rss - start_rss, 1),
+                "process_peak_rss_mb": process_peak_rss_mb(),
+                "timestamp": datetime.now(timezone.utc).isoformat(),
+                **stage.fields
+            }
+            self.record(record)
+
+    def record(self, record: dict) -> None:
+        with self.lock:
+            self.records.append(record)
+        try:
+            self.sink.emit(record)
+        except Exception as e:
+            logger.warning(f"Failed to emit metrics for {record.get('stage')}: {e}")
+
+    def close(self) -> None:
+        """Release this recorder's hold on tracemalloc; the last one out stops it"""
+        with self.lock:
+            if self._tracing:
+                _release_tracing()
+            self._tracing = False
+
+    def summary(self) -> list:
+        """Records for this run, e.g. to return from an Airflow task (XCom)"""
+        with self.lock:
+            return list(self.records)
@@ -0,0 +1,6 @@
+from .local_s3 import LocalS3
+from .fake_snowflake import FakeSnowflake, FakeConnection, FakeCursor
+from .fake_reddit import FakeReddit
+from .fixtures import Fixtures, record_fixtures
+from .synthetic import synthetic_fixtures, BASE_SIZES
+from .environment import ReplayEnvironment
\ No newline at end of file
@@ -0,0 +1,32 @@
+from types import SimpleNamespace
+
+# Fields captured from PRAW submissions when recording a listing
+POST_FIELDS = ["id", "title", "score", "created_utc", "url", "selftext", "num_comments", "stickied"]
+
+class FakeSubreddit():
+    def __init__(self, posts: list):
+        self.posts = posts
+
+    def _listing(self, posts: list, limit: int = None):
+        for post in posts if limit is None else posts[:limit]:
+            yield SimpleNamespace(**post)
+
+    def hot(self, limit: int = None):
+        return self._listing(self.posts, limit)
+
+    def top(self, limit: int = None, **kwargs):
+        return self._listing(sorted(self.posts, key=lambda p: p["score"], reverse=True), limit)
+
+    def new(self, limit: int = None):
+        return self._listing(sorted(self.posts, key=lambda p: p["created_utc"], reverse=True), limit)
+
+    def rising(self, limit: int = None):
+        return self._listing(self.posts, limit)
+
+class FakeReddit():
+    """Replays recorded subreddit listings through the part of the PRAW API RedditIngestor uses"""
+    def __init__(self, listings: dict):
+        self.listings = listings
+
+    def subreddit(self, name: str) -> FakeSubreddit:
+        return FakeSubreddit(self.listings.get(name, []))
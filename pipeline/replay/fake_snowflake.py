@@ -0,0 +1,129 @@
+import re
+import uuid
+import logging
+import threading
+from io import BytesIO
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+CREATE_TABLE_RE = re.compile(r"CREATE\s+(?:OR\s+REPLACE\s+)?(?:TEMPORARY\s+)?TABLE\s+(?:IF\s+NOT\s+EXISTS\s+)?([\w.]+)", re.IGNORECASE)
+INSERT_RE = re.compile(r"INSERT\s+INTO\s+([\w.]+)", re.IGNORECASE)
+
+class FakeSnowflake():
+    """Records what the pipeline sends to Snowflake instead of running it
+
+    Keeps every executed statement and a row count per table; write_pandas() can be
+    patched in for snowflake.connector.pandas_tools.write_pandas and still pays the
+    client-side cost of serializing each chunk to Parquet.
+    """
+    def __init__(self):
+        self.statements = []
+        self.tables = {}
+        self.bytes_staged = 0
+        self.lock = threading.Lock()
+
+    def connect(self, private_key: bytes = None):
+        return FakeConnection(self)
+
+    def record(self, statement: str, rows: int = 0) -> None:
+        statement = " ".join(statement.split())
+        with self.lock:
+            self.statements.append(statement)
+            created = CREATE_TABLE_RE.match(statement)
+            if created:
+                self.tables[created.group(1).upper()] = 0
+            inserted = INSERT_RE.match(statement)
+            if inserted and rows:
+                table = inserted.group(1).upper()
+                self.tables[table] = self.tables.get(table, 0) + rows
+
+    def write_pandas(self, conn, df, table_name: str, schema: str = None, chunk_size: int = None,
+                     compression: str = "gzip", use_logical_type: bool = None, **kwargs):
+        """Stand-in for write_pandas: Parquet-encode each chunk, then count the rows"""
+        chunk_size = chunk_size or max(len(df), 1)
+        n_chunks = 0
+        for start in range(0, len(df), chunk_size):
+            buffer = BytesIO()
+            df.iloc[start:start + chunk_size].to_parquet(buffer, compression=compression, index=False)
+            with self.lock:
+                self.bytes_staged += buffer.tell()
+            n_chunks += 1
+
+        table = f"{schema}.{table_name}" if schema else table_name
+        self.record(f"COPY INTO {table} FROM @table_stage", rows=0)
+        with self.lock:
+            self.tables[table.upper()] = self.tables.get(table.upper(), 0) + len(df)
+        return True, n_chunks, len(df), []
+
+class FakeCursor():
+    def __init__(self, account: FakeSnowflake):
+        self.account = account
+        self.rowcount = 0
+        self.sfqid = None
+        self.description = None
+        self._results = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def execute(self, statement: str, params=None, **kwargs):
+        self.account.record(statement)
+        self.rowcount = 0
+        self._results = [(1,)] if statement.strip().upper() == "SELECT 1" else []
+        return self
+
+    def execute_async(self, statement: str, params=None, **kwargs) -> dict:
+        """Runs immediately; the query id resolves through get_results_from_sfqid"""
+        self.execute(statement, params)
+        self.sfqid = uuid.uuid4().hex
+        return {"queryId": self.sfqid}
+
+    def get_results_from_sfqid(self, sfqid: str) -> None:
+        pass
+
+    def executemany(self, statement: str, seq_of_params, **kwargs):
+        rows = len(seq_of_params) if hasattr(seq_of_params, "__len__") else sum(1 for _ in seq_of_params)
+        self.account.record(statement, rows=rows)
+        self.rowcount = rows
+        return self
+
+    def fetchone(self):
+        return self._results.pop(0) if self._results else None
+
+    def fetchall(self) -> list:
+        results, self._results = self._results, []
+        return results
+
+    def close(self) -> None:
+        pass
+
+class FakeConnection():
+    def __init__(self, account: FakeSnowflake):
+        self.account = account
+        self.closed = False
+
+    def cursor(self) -> FakeCursor:
+        return FakeCursor(self.account)
+
+    def commit(self) -> None:
+        pass
+
+    def rollback(self) -> None:
+        pass
+
+    def get_query_status_throw_if_error(self, sfqid: str) -> str:
+        return "SUCCESS"
+
+    def is_still_running(self, status) -> bool:
+        return False
+
+    def is_closed(self) -> bool:
+        return self.closed
+
+    def close(self) -> None:
+        self.closed = True
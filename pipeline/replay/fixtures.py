@@ -0,0 +1,136 @@
+"""Record live Reddit/NewsAPI/S3 responses into fixtures that ReplayEnvironment can serve
+
+Usage:
+    python -m pipeline.replay.fixtures data/fixtures/live --limit 100
+"""
+import os
+import json
+import time
+import logging
+import argparse
+from datetime import datetime, timedelta
+from .fake_reddit import POST_FIELDS
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+NEWS_TIME_FORMAT = "%Y-%m-%dT%H:%M:%SZ"
+
+class Fixtures():
+    """Canned Reddit listings, NewsAPI articles and S3 objects for one replay run
+
+    reddit maps subreddit -> list of post dicts (POST_FIELDS), news is the list of
+    NewsAPI article dicts, s3_objects maps S3 key -> bytes. recorded_at is the epoch
+    time the data was captured, used by rebased() to keep it inside lookback windows.
+    """
+    def __init__(self, reddit: dict = None, news: list = None, s3_objects: dict = None, recorded_at: float = None):
+        self.reddit = reddit or {}
+        self.news = news or []
+        self.s3_objects = s3_objects or {}
+        self.recorded_at = recorded_at if recorded_at is not None else time.time()
+
+    def rebased(self, now: float = None) -> "Fixtures":
+        """Copy with every post/article timestamp shifted as if recorded at `now`"""
+        shift = (now if now is not None else time.time()) - self.recorded_at
+        reddit = {
+            sub: [{**post, "created_utc": post["created_utc"] + shift} for post in posts]
+            for sub, posts in self.reddit.items()
+        }
+        news = []
+        for article in self.news:
+            published = datetime.strptime(article["publishedAt"][:19], "%Y-%m-%dT%H:%M:%S") + timedelta(seconds=shift)
+            news.append({**article, "publishedAt": published.strftime(NEWS_TIME_FORMAT)})
+        return Fixtures(reddit, news, self.s3_objects, recorded_at=self.recorded_at + shift)
+
+    def save(self, path: str) -> None:
+        os.makedirs(path, exist_ok=True)
+        with open(os.path.join(path, "manifest.json"), "w") as f:
+            json.dump({"recorded_at": self.recorded_at, "s3_keys": sorted(self.s3_objects)}, f, indent=2)
+        with open(os.path.join(path, "reddit.json"), "w") as f:
+            json.dump(self.reddit, f)
+        with open(os.path.join(path, "news.json"), "w") as f:
+            json.dump(self.news, f)
+        for key, body in self.s3_objects.items():
+            object_path = os.path.join(path, "s3", key)
+            os.makedirs(os.path.dirname(object_path), exist_ok=True)
+            with open(object_path, "wb") as f:
+                f.write(body)
+        logger.info(f"Saved fixtures to {path}")
+
+    @classmethod
+    def load(cls, path: str) -> "Fixtures":
+        with open(os.path.join(path, "manifest.json"), "r") as f:
+            manifest = json.load(f)
+        with open(os.path.join(path, "reddit.json"), "r") as f:
+            reddit = json.load(f)
+        with open(os.path.join(path, "news.json"), "r") as f:
+            news = json.load(f)
+        s3_objects = {}
+        for key in manifest["s3_keys"]:
+            with open(os.path.join(path, "s3", key), "rb") as f:
+                s3_objects[key] = f.read()
+        return cls(reddit, news, s3_objects, recorded_at=manifest["recorded_at"])
+
+def record_reddit(subreddits: list = None, listing: str = "hot", limit: int = 50) -> dict:
+    """Capture live subreddit listings with the same client RedditIngestor uses"""
+    from pipeline.ingestion.ingest_reddit import RedditIngestor
+
+    ingestor = RedditIngestor(subreddits=subreddits, listing=listing, limit=limit)
+    listings = {}
+    for sub in ingestor.subreddits:
+        posts = getattr(ingestor._client().subreddit(sub), listing)(limit=limit)
+        listings[sub] = [{field: getattr(post, field, None) for field in POST_FIELDS} for post in posts]
+        logger.info(f"Recorded {len(listings[sub])} posts from r/{sub}")
+    return listings
+
+def record_news(days: int = 7) -> list:
+    """Capture the articles NewsIngestor.load_data would fetch"""
+    from pipeline.ingestion.ingest_news import NewsIngestor
+
+    ingestor = NewsIngestor()
+    end = datetime.now()
+    start = datetime.combine((end - timedelta(days=days)).date(), datetime.min.time())
+    params = {'q': ingestor.query, 'language': 'en', 'sortBy': 'publishedAt'}
+    articles = ingestor.client.fetch_range(params, start, end)
+    logger.info(f"Recorded {len(articles)} articles")
+    return articles
+
+def record_s3(keys: list, bucket: str = "mental-health-project-pipeline") -> dict:
+    """Download S3 objects (e.g. the static raw CSVs) as bytes"""
+    import boto3
+
+    s3 = boto3.client("s3", region_name=os.environ.get("AWS_DEFAULT_REGION", "us-east-1"))
+    objects = {}
+    for key in keys:
+        objects[key] = s3.get_object(Bucket=bucket, Key=key)["Body"].read()
+        logger.info(f"Recorded s3://{bucket}/{key} ({len(objects[key])} bytes)")
+    return objects
+
+def record_fixtures(path: str, subreddits: list = None, listing: str = "hot", limit: int = 50,
+                    news_days: int = 7, s3_keys: list = None) -> Fixtures:
+    """Record every live source the ingestors read and save them under `path`"""
+    if s3_keys is None:
+        from pipeline.ingestion.run_static_ingestion import STATIC_SOURCES
+        s3_keys = [source["ingestor"].source_key for source in STATIC_SOURCES.values()]
+
+    recorded_at = time.time()
+    fixtures = Fixtures(
+        reddit=record_reddit(subreddits, listing, limit),
+        news=record_news(news_days),
+        s3_objects=record_s3(s3_keys),
+        recorded_at=recorded_at
+    )
+    fixtures.save(path)
+    return fixtures
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("path")
+    parser.add_argument("--subreddits", nargs="+", default=None)
+    parser.add_argument("--listing", default="hot")
+    parser.add_argument("--limit", type=int, default=50)
+    parser.add_argument("--news-days", type=int, default=7)
+    args = parser.parse_args()
+
+    record_fixtures(args.path, args.subreddits, args.listing, args.limit, args.news_days)
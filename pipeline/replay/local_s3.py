@@ -0,0 +1,132 @@
+import os
+import hashlib
+import logging
+import threading
+import uuid
+from io import BytesIO
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+class NoSuchKey(Exception):
+    pass
+
+class NoSuchUpload(Exception):
+    pass
+
+class LocalS3Exceptions():
+    NoSuchKey = NoSuchKey
+    NoSuchUpload = NoSuchUpload
+
+def _as_bytes(body) -> bytes:
+    if hasattr(body, "read"):
+        body = body.read()
+    if isinstance(body, str):
+        body = body.encode()
+    return bytes(body)
+
+class LocalS3():
+    """In-memory stand-in for the subset of the boto3 S3 client the ingestors use
+
+    Objects are kept as bytes keyed by (bucket, key). `root` mirrors every write to
+    disk under root/<bucket>/<key> so replay outputs can be inspected afterwards.
+    """
+    exceptions = LocalS3Exceptions
+
+    def __init__(self, objects: dict = None, bucket: str = "mental-health-project-pipeline", root: str = None):
+        self.root = root
+        self.objects = {}
+        self.uploads = {}
+        self.calls = {}
+        self.lock = threading.Lock()
+        for key, body in (objects or {}).items():
+            self.put_object(Bucket=bucket, Key=key, Body=body)
+
+    def _count(self, method: str) -> None:
+        with self.lock:
+            self.calls[method] = self.calls.get(method, 0) + 1
+
+    def _store(self, bucket: str, key: str, data: bytes) -> str:
+        with self.lock:
+            self.objects[(bucket, key)] = data
+        if self.root:
+            path = os.path.join(self.root, bucket, key)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, "wb") as f:
+                f.write(data)
+        return f'"{hashlib.md5(data).hexdigest()}"'
+
+    def _load(self, bucket: str, key: str) -> bytes:
+        with self.lock:
+            if (bucket, key) not in self.objects:
+                raise NoSuchKey(f"s3://{bucket}/{key}")
+            return self.objects[(bucket, key)]
+
+    def put_object(self, Bucket: str, Key: str, Body=b"", **kwargs) -> dict:
+        self._count("put_object")
+        return {"ETag": self._store(Bucket, Key, _as_bytes(Body))}
+
+    def get_object(self, Bucket: str, Key: str, **kwargs) -> dict:
+        self._count("get_object")
+        data = self._load(Bucket, Key)
+        return {"Body": BytesIO(data), "ContentLength": len(data), "ETag": f'"{hashlib.md5(data).hexdigest()}"'}
+
+    def head_object(self, Bucket: str, Key: str, **kwargs) -> dict:
+        self._count("head_object")
+        data = self._load(Bucket, Key)
+        return {"ContentLength": len(data), "ETag": f'"{hashlib.md5(data).hexdigest()}"'}
+
+    def upload_fileobj(self, Fileobj, Bucket: str, Key: str, **kwargs) -> None:
+        self._count("upload_fileobj")
+        self._store(Bucket, Key, _as_bytes(Fileobj))
+
+    def list_objects_v2(self, Bucket: str, Prefix: str = "", **kwargs) -> dict:
+        self._count("list_objects_v2")
+        with self.lock:
+            keys = sorted(key for bucket, key in self.objects if bucket == Bucket and key.startswith(Prefix))
+            contents = [{"Key": key, "Size": len(self.objects[(Bucket, key)])} for key in keys]
+        return {"Contents": contents, "KeyCount": len(contents), "IsTruncated": False}
+
+    def delete_object(self, Bucket: str, Key: str, **kwargs) -> dict:
+        self._count("delete_object")
+        with self.lock:
+            self.objects.pop((Bucket, Key), None)
+        return {}
+
+    def create_multipart_upload(self, Bucket: str, Key: str, **kwargs) -> dict:
+        self._count("create_multipart_upload")
+        upload_id = uuid.uuid4().hex
+        with self.lock:
+            self.uploads[upload_id] = {}
+        return {"UploadId": upload_id, "Bucket": Bucket, "Key": Key}
+
+    def upload_part(self, Bucket: str, Key: str, PartNumber: int, UploadId: str, Body=b"", **kwargs) -> dict:
+        self._count("upload_part")
+        data = _as_bytes(Body)
+        with self.lock:
+            if UploadId not in self.uploads:
+                raise NoSuchUpload(UploadId)
+            self.uploads[UploadId][PartNumber] = data
+        return {"ETag": f'"{hashlib.md5(data).hexdigest()}"'}
+
+    def complete_multipart_upload(self, Bucket: str, Key: str, UploadId: str, MultipartUpload: dict = None,
+                                  **kwargs) -> dict:
+        self._count("complete_multipart_upload")
+        with self.lock:
+            if UploadId not in self.uploads:
+                raise NoSuchUpload(UploadId)
+            parts = self.uploads.pop(UploadId)
+        numbers = [part["PartNumber"] for part in (MultipartUpload or {}).get("Parts", [])] or sorted(parts)
+        return {"ETag": self._store(Bucket, Key, b"".join(parts[n] for n in numbers))}
+
+    def abort_multipart_upload(self, Bucket: str, Key: str, UploadId: str, **kwargs) -> dict:
+        self._count("abort_multipart_upload")
+        with self.lock:
+            self.uploads.pop(UploadId, None)
+        return {}
+
+    def total_bytes(self, prefix: str = "") -> int:
+        """Bytes stored under a key prefix across all buckets"""
+        with self.lock:
+            return sum(len(data) for (_, key), data in self.objects.items() if key.startswith(prefix))
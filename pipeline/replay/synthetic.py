@@ -0,0 +1,166 @@
+import time
+from datetime import datetime, timedelta
+import numpy as np
+import pandas as pd
+from .fixtures import Fixtures, NEWS_TIME_FORMAT
+
+# Size of each source at scale=1; every source grows linearly with scale
+BASE_SIZES = {
+    "reddit_posts_per_subreddit": 50,
+    "news_articles_per_day": 1,
+    "static_rows": 1_000
+}
+
+SUBREDDITS = ["mentalhealth", "depression", "anxiety"]
+NEWS_SOURCES = ["Reuters", "BBC News", "The Guardian", "NPR", "CNN", "Associated Press", "Healthline", "Psychology Today"]
+COUNTRIES = ["United States", "United Kingdom", "Canada", "Germany", "Netherlands", "Ireland", "Australia", "France"]
+AGE_GROUPS = ["5-14 years", "15-24 years", "25-34 years", "35-54 years", "55-74 years", "75+ years"]
+STATES = ["United States", "California", "Texas", "New York", "Florida", "Ohio", "Washington", "Georgia"]
+TECH_SURVEY_ANSWERS = ["Yes", "No", "Don't know", "Maybe", "Not sure", "Some of them"]
+TECH_SURVEY_COLUMNS = ["self_employed", "family_history", "treatment", "work_interfere", "no_employees",
+                       "remote_work", "tech_company", "benefits", "care_options", "wellness_program",
+                       "seek_help", "anonymity", "leave", "mental_health_consequence", "phys_health_consequence",
+                       "coworkers", "supervisor", "mental_health_interview", "phys_health_interview",
+                       "mental_vs_physical", "obs_consequence"]
+
+def words(rng, n_rows: int, n_words: int, prefix: str) -> np.ndarray:
+    vocab = np.array([f"{prefix}{i}" for i in range(500)], dtype=object)
+    picks = vocab[rng.integers(0, len(vocab), (n_rows, n_words))]
+    return np.array([" ".join(row) for row in picks], dtype=object)
+
+def reddit_listings(n_per_sub: int, now: float, rng) -> dict:
+    """Hot listings with posts spread over the last week (a few stickied and stale)"""
+    listings = {}
+    for sub in SUBREDDITS:
+        created = now - rng.random(n_per_sub) * 7 * 86400 * 0.98
+        titles = words(rng, n_per_sub, 8, "title")
+        texts = words(rng, n_per_sub, 60, "word")
+        listings[sub] = [{
+            "id": f"{sub[:3]}{i:08x}",
+            "title": titles[i],
+            "score": int(rng.integers(0, 5000)),
+            "created_utc": float(created[i]),
+            "url": f"https://www.reddit.com/r/{sub}/comments/{i:08x}/",
+            "selftext": texts[i],
+            "num_comments": int(rng.integers(0, 800)),
+            "stickied": i < 2
+        } for i in range(n_per_sub)]
+    return listings
+
+def news_articles(n_per_day: int, now: datetime, rng) -> list:
+    """`n_per_day` articles on each of the 8 calendar days NewsIngestor queries"""
+    first_day = datetime.combine((now - timedelta(days=7)).date(), datetime.min.time())
+    published = []
+    for day in range(8):
+        day_start = first_day + timedelta(days=day)
+        span = (min(day_start + timedelta(days=1), now) - day_start).total_seconds()
+        published.extend(day_start + timedelta(seconds=float(s)) for s in np.sort(rng.random(n_per_day) * span))
+    n_articles = len(published)
+    titles = words(rng, n_articles, 10, "headline")
+    return [{
+        "source": {"id": None, "name": NEWS_SOURCES[i % len(NEWS_SOURCES)]},
+        "author": f"Author {i % 97}",
+        "title": titles[i],
+        "description": f"Description of article {i}",
+        "url": f"https://news.example.com/articles/{i}",
+        "urlToImage": None,
+        "publishedAt": published[i].strftime(NEWS_TIME_FORMAT),
+        "content": f"Content of article {i}"
+    } for i in range(n_articles)]
+
+def tech_survey_csv(n_rows: int, rng) -> bytes:
+    df = pd.DataFrame({
+        "Timestamp": (pd.Timestamp("2014-08-27") + pd.to_timedelta(rng.integers(0, 90 * 86400, n_rows), unit="s"))
+            .strftime("%Y-%m-%d %H:%M:%S"),
+        # Includes outliers and free-text genders that process_data filters out
+        "Age": np.where(rng.random(n_rows) < 0.01, 999, rng.integers(18, 70, n_rows)),
+        "Gender": rng.choice(["Male", "male", "M", "Female", "female ", "F", "Woman", "non-binary"], n_rows),
+        "Country": rng.choice(COUNTRIES, n_rows),
+        "state": rng.choice(["CA", "TX", "NY", "WA", "IL"], n_rows)
+    })
+    for col in TECH_SURVEY_COLUMNS:
+        df[col] = rng.choice(TECH_SURVEY_ANSWERS, n_rows)
+    df["comments"] = np.where(rng.random(n_rows) < 0.1, "free text comment", None)
+    return df.to_csv(index=False).encode()
+
+def who_suicide_csv(n_rows: int, rng) -> bytes:
+    df = pd.DataFrame({
+        "country": rng.choice([f" {c}" for c in COUNTRIES] + COUNTRIES, n_rows),
+        "year": rng.integers(1985, 2017, n_rows),
+        "sex": rng.choice(["male", "female", "Male "], n_rows),
+        "age": rng.choice(AGE_GROUPS, n_rows),
+        "suicides_no": np.where(rng.random(n_rows) < 0.05, np.nan, rng.integers(0, 5000, n_rows)),
+        "population": rng.integers(1_000, 10_000_000, n_rows).astype(float)
+    })
+    return df.to_csv(index=False).encode()
+
+def mental_health_care_csv(n_rows: int, rng) -> bytes:
+    period = rng.integers(1, 60, n_rows)
+    period_start = pd.Timestamp("2020-08-19") + pd.to_timedelta(period * 14, unit="D")
+    value = np.round(rng.random(n_rows) * 40 + 5, 1)
+    df = pd.DataFrame({
+        "Indicator": rng.choice(["Took Prescription Medication for Mental Health",
+                                 "Received Counseling or Therapy",
+                                 "Needed Counseling or Therapy But Did Not Get It"], n_rows),
+        "Group": rng.choice(["National Estimate", "By Age", "By Sex", "By State "], n_rows),
+        "State": rng.choice(STATES, n_rows),
+        "Subgroup": rng.choice(["United States", "18 - 29 years", "Male", "Female", " Texas"], n_rows),
+        "Phase": rng.choice(["2", "3", "3.1", "3.2"], n_rows),
+        "Time Period": period,
+        "Time Period Label": [f"Period {p}" for p in period],
+        "Time Period Start Date": period_start.strftime("%m/%d/%Y"),
+        "Time Period End Date": (period_start + pd.Timedelta(days=12)).strftime("%m/%d/%Y"),
+        # Suppressed estimates have no value and are dropped by process_data
+        "Value": np.where(rng.random(n_rows) < 0.03, np.nan, value),
+        "LowCI": np.round(value - 2, 1),
+        "HighCI": np.round(value + 2, 1),
+        "Suppression Flag": np.where(rng.random(n_rows) < 0.03, 1.0, np.nan),
+        "Confidence Interval": [f"{v - 2:.1f} - {v + 2:.1f}" for v in value],
+        "Quartile Range": rng.choice(["", "4.1-12.3", "12.4-20.0"], n_rows)
+    })
+    return df.to_csv(index=False).encode()
+
+def suicide_demographics_csv(n_rows: int, rng) -> bytes:
+    estimate = np.round(rng.random(n_rows) * 30, 1)
+    missing = rng.random(n_rows) < 0.05
+    df = pd.DataFrame({
+        "INDICATOR": "Death rates for suicide",
+        "UNIT": "Deaths per 100,000 resident population, age-adjusted",
+        "UNIT_NUM": 1,
+        "STUB_NAME": rng.choice(["Total", "Sex", "Sex and race", "Age"], n_rows),
+        "STUB_NAME_NUM": rng.integers(0, 12, n_rows),
+        "STUB_LABEL": rng.choice(["All persons", "Male", "Female", "Male: White", "Female: Black"], n_rows),
+        "STUB_LABEL_NUM": np.round(rng.random(n_rows) * 10, 2),
+        "YEAR": rng.integers(1950, 2019, n_rows),
+        "YEAR_NUM": rng.integers(1, 42, n_rows),
+        "AGE": rng.choice(["All ages", "10-14 years", "15-24 years", "25-44 years"], n_rows),
+        "AGE_NUM": rng.integers(0, 10, n_rows),
+        "ESTIMATE": np.where(missing, np.nan, estimate),
+        "FLAG": np.where(missing, "*", None)
+    })
+    return df.to_csv(index=False).encode()
+
+STATIC_GENERATORS = {
+    "static_data/raw/mental_health_in_tech_survey.csv": tech_survey_csv,
+    "static_data/raw/who_suicide_statistics.csv": who_suicide_csv,
+    "static_data/raw/mental_health_care_in_the_last_4_weeks.csv": mental_health_care_csv,
+    "static_data/raw/death_rates_for_suicide_by_sex_race_hispanic_origin_and_age_united_states.csv":
+        suicide_demographics_csv
+}
+
+def synthetic_fixtures(scale: int = 1, seed: int = 0, sources: list = None) -> Fixtures:
+    """Fixtures shaped like the live sources, BASE_SIZES * scale rows per source
+
+    sources limits generation to any of "reddit", "news", "static".
+    """
+    sources = sources or ["reddit", "news", "static"]
+    rng = np.random.default_rng(seed)
+    now = time.time()
+
+    reddit = reddit_listings(BASE_SIZES["reddit_posts_per_subreddit"] * scale, now, rng) if "reddit" in sources else {}
+    news = news_articles(BASE_SIZES["news_articles_per_day"] * scale, datetime.now(), rng) if "news" in sources else []
+    s3_objects = {}
+    if "static" in sources:
+        s3_objects = {key: generate(BASE_SIZES["static_rows"] * scale, rng) for key, generate in STATIC_GENERATORS.items()}
+
+    return Fixtures(reddit, news, s3_objects, recorded_at=now)
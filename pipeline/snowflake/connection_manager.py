@@ -0,0 +1,197 @@
+import os
+import time
+import atexit
+import logging
+import threading
+import boto3
+import snowflake.connector
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.backends import default_backend
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+PRIVATE_KEY_PARAMETER = '/mental-health-pipeline/snowflake/private-key'
+
+def ssm_private_key() -> bytes:
+    """Fetch the Snowflake private key from AWS Parameter Store as DER bytes"""
+    # Get private key from AWS Parameter Store
+    ssm = boto3.client('ssm', region_name='us-east-1')
+    response = ssm.get_parameter(
+        Name=PRIVATE_KEY_PARAMETER,
+        WithDecryption=True
+    )
+    private_key_pem = response['Parameter']['Value'].encode()
+
+    # Load the private key
+    private_key = serialization.load_pem_private_key(
+        private_key_pem,
+        password=None,
+        backend=default_backend()
+    )
+
+    # Convert to bytes for Snowflake
+    return private_key.private_bytes(
+        encoding=serialization.Encoding.DER,
+        format=serialization.PrivateFormat.PKCS8,
+        encryption_algorithm=serialization.NoEncryption()
+    )
+
+def snowflake_connect(private_key: bytes):
+    """Open a new Snowflake session with key-pair auth"""
+    return snowflake.connector.connect(
+        user=os.getenv("SNOWFLAKE_USER"),
+        account=os.getenv("SNOWFLAKE_ACCOUNT"),
+        warehouse=os.getenv("SNOWFLAKE_WAREHOUSE"),
+        database=os.getenv("SNOWFLAKE_DATABASE"),
+        role=os.getenv("SNOWFLAKE_ROLE"),
+        private_key=private_key
+    )
+
+class PooledConnection():
+    """Lease on a pooled connection
+
+    Used as a context manager it yields the underlying connection and hands it back
+    to the pool on exit instead of closing it. Attribute access is forwarded, so
+    code that calls methods on the lease directly keeps working; close() releases.
+    """
+    def __init__(self, manager, conn):
+        self._manager = manager
+        self._conn = conn
+        self._released = False
+
+    def __enter__(self):
+        return self._conn
+
+    def __exit__(self, exc_type, exc, tb):
+        self.release(failed=exc_type is not None)
+
+    def __getattr__(self, name):
+        return getattr(self._conn, name)
+
+    def release(self, failed: bool = False) -> None:
+        if not self._released:
+            self._released = True
+            self._manager.release(self._conn, failed=failed)
+
+    def close(self) -> None:
+        self.release()
+
+class ConnectionManager():
+    """Process-wide Snowflake session pool with a TTL-cached private key
+
+    `key_provider` and `connect` are the only touch points with SSM and Snowflake,
+    so a local stand-in can be swapped in with set_connection_manager() for offline runs.
+    """
+    def __init__(self, key_provider=ssm_private_key, connect=snowflake_connect, pool_size: int = 4,
+                 key_ttl: float = 3600, health_check_after: float = 300):
+        self.key_provider = key_provider
+        self.connect = connect
+        self.pool_size = pool_size
+        self.key_ttl = key_ttl
+        self.health_check_after = health_check_after
+
+        self._key = None
+        self._key_loaded = 0.0
+        self._idle = []  # (connection, last_used) pairs
+        self._lock = threading.Lock()
+        self.stats = {"connects": 0, "reuses": 0, "key_loads": 0, "discarded": 0}
+
+    def private_key(self) -> bytes:
+        """Decrypted DER key, refreshed from the provider once the TTL expires"""
+        with self._lock:
+            if self._key is None or time.monotonic() - self._key_loaded > self.key_ttl:
+                self._key = self.key_provider()
+                self._key_loaded = time.monotonic()
+                self.stats["key_loads"] += 1
+            return self._key
+
+    def _is_healthy(self, conn, last_used: float) -> bool:
+        is_closed = getattr(conn, "is_closed", None)
+        if callable(is_closed) and is_closed():
+            return False
+        if time.monotonic() - last_used < self.health_check_after:
+            return True
+        try:
+            with conn.cursor() as cur:
+                cur.execute("SELECT 1")
+            return True
+        except Exception as e:
+            logger.warning(f"Discarding unhealthy Snowflake connection: {e}")
+            return False
+
+    def _close(self, conn) -> None:
+        try:
+            conn.close()
+        except Exception as e:
+            logger.warning(f"Error closing Snowflake connection: {e}")
+
+    def acquire(self) -> PooledConnection:
+        """Lease an idle healthy session, or open a new one"""
+        while True:
+            with self._lock:
+                if not self._idle:
+                    break
+                conn, last_used = self._idle.pop()
+            if self._is_healthy(conn, last_used):
+                self.stats["reuses"] += 1
+                return PooledConnection(self, conn)
+            self.stats["discarded"] += 1
+            self._close(conn)
+
+        conn = self.connect(self.private_key())
+        self.stats["connects"] += 1
+        return PooledConnection(self, conn)
+
+    def release(self, conn, failed: bool = False) -> None:
+        """Return a session to the pool, closing it if the pool is full"""
+        try:
+            if failed:
+                conn.rollback()
+            else:
+                conn.commit()
+        except Exception as e:
+            logger.warning(f"Discarding Snowflake connection after failed release: {e}")
+            self._close(conn)
+            return
+
+        with self._lock:
+            if len(self._idle) < self.pool_size:
+                self._idle.append((conn, time.monotonic()))
+                return
+        self._close(conn)
+
+    def close_all(self) -> None:
+        """Close every idle session"""
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for conn, _ in idle:
+            self._close(conn)
+        if idle:
+            logger.info(f"Closed {len(idle)} pooled Snowflake connections")
+
+_manager = None
+_manager_lock = threading.Lock()
+
+def get_connection_manager() -> ConnectionManager:
+    global _manager
+    with _manager_lock:
+        if _manager is None:
+            _manager = ConnectionManager(pool_size=int(os.getenv("SNOWFLAKE_POOL_SIZE", 4)))
+            atexit.register(_manager.close_all)
+        return _manager
+
+def set_connection_manager(manager: ConnectionManager) -> ConnectionManager:
+    """Replace the process-wide manager (e.g. with an offline stand-in); returns the old one
+
+    None resets it, so the next get_connection_manager() builds the default again.
+    """
+    global _manager
+    with _manager_lock:
+        previous, _manager = _manager, manager
+    if previous is not None:
+        previous.close_all()
+    if manager is not None:
+        atexit.register(manager.close_all)
+    return previous
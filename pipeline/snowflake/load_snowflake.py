@@ -1,76 +1,102 @@
-import os
-import snowflake.connector
+import logging
 from datetime import datetime
 from dotenv import load_dotenv
-from cryptography.hazmat.primitives import serialization
-from cryptography.hazmat.backends import default_backend
-from pathlib import Path
-import boto3
+from .connection_manager import get_connection_manager
+from .sql_runner import SQLRunner, parse_script, render_sql
+from pipeline.metrics import MetricsRecorder
 
 load_dotenv()
 
-# Create the connection
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Processed-load scripts per output format written by BaseIngestor
+REDDIT_LOAD_SQL = {
+    "json": "pipeline/snowflake/reddit_sql/reddit_processed_load.sql",
+    "parquet": "pipeline/snowflake/reddit_sql/reddit_processed_load_parquet.sql",
+    "ndjson": "pipeline/snowflake/reddit_sql/reddit_processed_load_ndjson.sql"
+}
+NEWS_LOAD_SQL = {
+    "json": "pipeline/snowflake/news_sql/news_processed_load.sql",
+    "parquet": "pipeline/snowflake/news_sql/news_processed_load_parquet.sql",
+    "ndjson": "pipeline/snowflake/news_sql/news_processed_load_ndjson.sql"
+}
+
+# Incremental (watermark) loads append/merge only the delta and are templated by format
+REDDIT_APPEND_SQL = "pipeline/snowflake/reddit_sql/reddit_processed_append.sql"
+NEWS_MERGE_SQL = "pipeline/snowflake/news_sql/news_processed_merge.sql"
+STAGE_FILE_EXTENSIONS = {"json": "json", "parquet": "parquet", "ndjson": "json.gz"}
+
+# Batched loads of a run's partition files (one per mapped ingestion task), templated by format
+PARTITION_LOAD_SQL = {
+    "reddit": "pipeline/snowflake/reddit_sql/reddit_processed_load_files.sql",
+    "news": "pipeline/snowflake/news_sql/news_processed_load_files.sql"
+}
+# Snowflake accepts at most this many names in a COPY FILES list
+MAX_COPY_FILES = 1000
+
+def format_params(source: str, file_format: str) -> dict:
+    """Template values selecting the staged file and file format for a source"""
+    return {
+        "file_ext": STAGE_FILE_EXTENSIONS[file_format],
+        "file_format_name": f"{source}_{file_format}_format"
+    }
+
+# Lease a pooled connection (use as a context manager to hand it back)
 def snowflake_connection():
-    
-    # Get private key from AWS Parameter Store
-    ssm = boto3.client('ssm', region_name='us-east-1')
-    response = ssm.get_parameter(
-        Name='/mental-health-pipeline/snowflake/private-key',
-        WithDecryption=True
-    )
-    private_key_pem = response['Parameter']['Value'].encode()
-    
-    # Load the private key
-    private_key = serialization.load_pem_private_key(
-        private_key_pem,
-        password=None,
-        backend=default_backend()
-    )
-    
-    # Convert to bytes for Snowflake
-    pkb = private_key.private_bytes(
-        encoding=serialization.Encoding.DER,
-        format=serialization.PrivateFormat.PKCS8,
-        encryption_algorithm=serialization.NoEncryption()
-    )
-    
-    # Connect to Snowflake
-    conn = snowflake.connector.connect(
-        user=os.getenv("SNOWFLAKE_USER"),
-        account=os.getenv("SNOWFLAKE_ACCOUNT"),
-        warehouse=os.getenv("SNOWFLAKE_WAREHOUSE"),
-        database=os.getenv("SNOWFLAKE_DATABASE"),
-        role=os.getenv("SNOWFLAKE_ROLE"),
-        private_key=pkb
-    )
-    
-    return conn
-
-# Run SQL queries
-def run_sql_from_file(filepath: str, date: str):
+    return get_connection_manager().acquire()
+
+# Run SQL queries (statements without ordering annotations run in file order)
+def run_sql_from_file(filepath: str, date: str, params: dict = None, runner: SQLRunner = None) -> list:
     with open(filepath, "r") as f:
-        sql_content = f.read().replace("{{ ds_nodash }}", date)
-        statements = [stmt.strip() for stmt in sql_content.split(';') if stmt.strip()]
-        with snowflake_connection().cursor() as cur:
-            for statement in statements:
-                cur.execute(statement)
+        sql_content = render_sql(f.read(), ds_nodash=date, ds=date, **(params or {}))
+    logger.info(f"Running {filepath}")
+    return (runner or SQLRunner()).run(parse_script(sql_content))
+
+# Time a load script; returns the metric records (e.g. for XCom)
+def timed_load(name: str, filepath: str, date: str, params: dict = None) -> list:
+    metrics = MetricsRecorder(name, trace_memory=False)
+    with metrics.stage("snowflake_load", script=filepath) as stage:
+        statements = run_sql_from_file(filepath, date, params)
+        stage.rows = sum(s["rows"] or 0 for s in statements)
+        stage.fields["statements"] = statements
+    return metrics.summary()
 
 # Loaders for each dataset
-def load_reddit_to_snowflake():
+def load_reddit_to_snowflake(file_format: str = "json", incremental: bool = False):
+    today = datetime.today().strftime("%Y-%m-%d")
+    if incremental:
+        return timed_load("reddit", REDDIT_APPEND_SQL, today, format_params("reddit", file_format))
+    return timed_load("reddit", REDDIT_LOAD_SQL[file_format], today)
+
+def load_partitions_to_snowflake(source: str, s3_keys: list, file_format: str = "json"):
+    """Load every partition file of a run with one COPY; keys are relative to the bucket"""
+    # Slices without new data write nothing and report no key
+    files = sorted({key.split("/", 1)[1] for key in s3_keys if key})
+    if not files:
+        logger.warning(f"No {source} partition files to load")
+        return []
+    if len(files) > MAX_COPY_FILES:
+        raise ValueError(f"{len(files)} {source} files exceed the {MAX_COPY_FILES}-file COPY limit")
+
     today = datetime.today().strftime("%Y-%m-%d")
-    run_sql_from_file("pipeline/snowflake/reddit_sql/reddit_processed_load.sql", today)
+    params = {**format_params(source, file_format), "files": files}
+    return timed_load(source, PARTITION_LOAD_SQL[source], today, params)
 
 def load_cdc_to_snowflake():
     today = datetime.today().strftime("%Y-%m-%d")
-    run_sql_from_file("pipeline/snowflake/cdc_sql/cdc_processed_load.sql", today)
+    return timed_load("cdc", "pipeline/snowflake/cdc_sql/cdc_processed_load.sql", today)
 
 def load_trends_to_snowflake():
     today = datetime.today().strftime("%Y-%m-%d")
-    run_sql_from_file("pipeline/snowflake/trends_sql/trends_processed_load.sql", today)
+    return timed_load("trends", "pipeline/snowflake/trends_sql/trends_processed_load.sql", today)
 
-def load_news_to_snowflake():
+def load_news_to_snowflake(file_format: str = "json", incremental: bool = False):
     today = datetime.today().strftime("%Y-%m-%d")
-    run_sql_from_file("pipeline/snowflake/news_sql/news_processed_load.sql", today)
+    if incremental:
+        return timed_load("news", NEWS_MERGE_SQL, today, format_params("news", file_format))
+    return timed_load("news", NEWS_LOAD_SQL[file_format], today)
 
 if __name__ == "__main__":
     load_cdc_to_snowflake()
@@ -5,4 +5,14 @@ CREATE OR REPLACE STAGE news_stage
 
 CREATE OR REPLACE FILE FORMAT news_json_format
     TYPE = 'JSON'
-    STRIP_OUTER_ARRAY = TRUE;
\ No newline at end of file
+    STRIP_OUTER_ARRAY = TRUE;
+
+CREATE OR REPLACE FILE FORMAT news_parquet_format
+    TYPE = 'PARQUET'
+    COMPRESSION = AUTO;
+
+
+CREATE OR REPLACE FILE FORMAT news_ndjson_format
+    TYPE = 'JSON'
+    COMPRESSION = GZIP
+    STRIP_OUTER_ARRAY = FALSE;
@@ -7,4 +7,7 @@ CREATE OR REPLACE TABLE NEWS_PROCESSED (
     article_count INT,
     sample_headlines TEXT,
     sources TEXT
-);
\ No newline at end of file
+);
+
+-- Landing table for incremental loads (see news_processed_merge.sql)
+CREATE OR REPLACE TABLE NEWS_PROCESSED_DELTA LIKE NEWS_PROCESSED;
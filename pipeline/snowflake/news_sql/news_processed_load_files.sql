@@ -0,0 +1,32 @@
+-- Use NEWS Schema
+USE SCHEMA MENTAL_HEALTH.NEWS;
+
+-- Create a temporary table to hold new dates
+CREATE OR REPLACE TEMP TABLE TEMP_NEWS_DATES(date DATE);
+
+-- Extract dates from every partition file of the run into the temp table
+COPY INTO TEMP_NEWS_DATES
+FROM (
+  SELECT TO_DATE($1:date::STRING)
+  FROM @news_stage
+)
+FILES = ({% for file in files %}'{{ file }}'{{ ", " if not loop.last }}{% endfor %})
+FILE_FORMAT = (FORMAT_NAME = '{{ file_format_name }}');
+
+-- Delete any existing rows in the main table that match incoming dates
+DELETE FROM MENTAL_HEALTH.NEWS.NEWS_PROCESSED
+WHERE date IN (SELECT date FROM TEMP_NEWS_DATES);
+
+-- Load all partition files of the run in one COPY
+COPY INTO MENTAL_HEALTH.NEWS.NEWS_PROCESSED
+FROM @news_stage
+FILES = ({% for file in files %}'{{ file }}'{{ ", " if not loop.last }}{% endfor %})
+FILE_FORMAT = (FORMAT_NAME = '{{ file_format_name }}')
+MATCH_BY_COLUMN_NAME = CASE_INSENSITIVE;
+
+-- Remove any corrupted/incomplete rows
+DELETE FROM MENTAL_HEALTH.NEWS.NEWS_PROCESSED
+WHERE date IS NULL;
+
+-- Clean up
+DROP TABLE IF EXISTS TEMP_NEWS_DATES;
\ No newline at end of file
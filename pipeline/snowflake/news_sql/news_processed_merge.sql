@@ -0,0 +1,33 @@
+-- Use NEWS Schema
+USE SCHEMA MENTAL_HEALTH.NEWS;
+
+-- Clear the previous delta (DELETE, unlike TRUNCATE, keeps COPY load metadata)
+DELETE FROM MENTAL_HEALTH.NEWS.NEWS_PROCESSED_DELTA;
+
+-- Stage today's incremental deltas (one file per run); files already loaded are skipped.
+-- Only names ending in a run id (_YYYYMMDDTHHMMSSffffff) match, never the full-load file
+COPY INTO MENTAL_HEALTH.NEWS.NEWS_PROCESSED_DELTA
+FROM @news_stage
+PATTERN = '.*news_processed_{{ ds }}(_.+)?_[0-9]{8}T[0-9]{12}[.]{{ file_ext | replace(".", "[.]") }}'
+FILE_FORMAT = (FORMAT_NAME = '{{ file_format_name }}')
+MATCH_BY_COLUMN_NAME = CASE_INSENSITIVE;
+
+-- Fold the delta into the daily aggregates (one source row per date, however many files covered it)
+MERGE INTO MENTAL_HEALTH.NEWS.NEWS_PROCESSED t
+USING (
+    SELECT
+        date,
+        SUM(article_count) AS article_count,
+        MAX(sample_headlines) AS sample_headlines,
+        ARRAY_TO_STRING(ARRAY_DISTINCT(ARRAY_FLATTEN(ARRAY_AGG(SPLIT(sources, ', ')))), ', ') AS sources
+    FROM MENTAL_HEALTH.NEWS.NEWS_PROCESSED_DELTA
+    WHERE date IS NOT NULL
+    GROUP BY date
+) s
+ON t.date = s.date
+WHEN MATCHED THEN UPDATE SET
+    article_count = t.article_count + s.article_count,
+    sample_headlines = s.sample_headlines,
+    sources = ARRAY_TO_STRING(ARRAY_DISTINCT(ARRAY_CAT(SPLIT(t.sources, ', '), SPLIT(s.sources, ', '))), ', ')
+WHEN NOT MATCHED THEN INSERT (date, article_count, sample_headlines, sources)
+    VALUES (s.date, s.article_count, s.sample_headlines, s.sources);
@@ -4,5 +4,6 @@ CREATE TABLE MENTAL_HEALTH.REDDIT.REDDIT_PROCESSED (
     title STRING,
     text STRING,
     score INTEGER,
-    comments INTEGER
+    comments INTEGER,
+    duplicate_of STRING
 );
\ No newline at end of file
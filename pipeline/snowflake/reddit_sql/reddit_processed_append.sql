@@ -0,0 +1,16 @@
+-- Use Reddit Schema
+USE SCHEMA MENTAL_HEALTH.REDDIT;
+
+-- Append the incremental deltas (only posts newer than the stored watermarks).
+-- Each run writes its own file, so several runs a day each add one.
+-- COPY load metadata skips files that were already loaded, so re-running is a no-op.
+-- Only names ending in a run id (_YYYYMMDDTHHMMSSffffff) match, never the full-load file.
+COPY INTO MENTAL_HEALTH.REDDIT.REDDIT_PROCESSED
+FROM @reddit_stage
+PATTERN = '.*reddit_processed_{{ ds }}(_.+)?_[0-9]{8}T[0-9]{12}[.]{{ file_ext | replace(".", "[.]") }}'
+FILE_FORMAT = (FORMAT_NAME = '{{ file_format_name }}')
+MATCH_BY_COLUMN_NAME = CASE_INSENSITIVE;
+
+-- Remove any corrupted/incomplete rows
+DELETE FROM MENTAL_HEALTH.REDDIT.REDDIT_PROCESSED
+WHERE date IS NULL;
@@ -0,0 +1,32 @@
+-- Use REDDIT Schema
+USE SCHEMA MENTAL_HEALTH.REDDIT;
+
+-- Create a temporary table to hold new dates
+CREATE OR REPLACE TEMP TABLE TEMP_REDDIT_DATES(date DATE);
+
+-- Extract dates from every partition file of the run into the temp table
+COPY INTO TEMP_REDDIT_DATES
+FROM (
+  SELECT TO_DATE($1:date::STRING)
+  FROM @reddit_stage
+)
+FILES = ({% for file in files %}'{{ file }}'{{ ", " if not loop.last }}{% endfor %})
+FILE_FORMAT = (FORMAT_NAME = '{{ file_format_name }}');
+
+-- Delete any existing rows in the main table that match incoming dates
+DELETE FROM MENTAL_HEALTH.REDDIT.REDDIT_PROCESSED
+WHERE date IN (SELECT date FROM TEMP_REDDIT_DATES);
+
+-- Load all partition files of the run in one COPY
+COPY INTO MENTAL_HEALTH.REDDIT.REDDIT_PROCESSED
+FROM @reddit_stage
+FILES = ({% for file in files %}'{{ file }}'{{ ", " if not loop.last }}{% endfor %})
+FILE_FORMAT = (FORMAT_NAME = '{{ file_format_name }}')
+MATCH_BY_COLUMN_NAME = CASE_INSENSITIVE;
+
+-- Remove any corrupted/incomplete rows
+DELETE FROM MENTAL_HEALTH.REDDIT.REDDIT_PROCESSED
+WHERE date IS NULL;
+
+-- Clean up
+DROP TABLE IF EXISTS TEMP_REDDIT_DATES;
\ No newline at end of file
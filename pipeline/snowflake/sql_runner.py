@@ -0,0 +1,235 @@
+import re
+import time
+import logging
+from jinja2 import Environment, StrictUndefined
+from .connection_manager import get_connection_manager
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# "-- @name: load_main", "-- @after: create_temp, delete_old", "-- @independent"
+ANNOTATION_RE = re.compile(r"^\s*--\s*@(\w+)\s*:?\s*(.*?)\s*$")
+
+_templates = Environment(undefined=StrictUndefined, keep_trailing_newline=True)
+
+def render_sql(template: str, **context) -> str:
+    """Render Jinja placeholders ({{ ds_nodash }}, {{ file_ext }}, filters, conditionals);
+    an undefined variable raises instead of silently producing broken SQL"""
+    return _templates.from_string(template).render(**context)
+
+def split_statements(sql: str) -> list:
+    """Split a script on top-level semicolons
+
+    Semicolons inside '...' literals (with '' or backslash escapes), "..." identifiers,
+    $$...$$ blocks and -- or /* */ comments do not end a statement.
+    """
+    statements = []
+    start, i, n = 0, 0, len(sql)
+    while i < n:
+        c = sql[i]
+        if c in ("'", '"'):
+            j = i + 1
+            while j < n:
+                if c == "'" and sql[j] == "\\":
+                    j += 2
+                    continue
+                if sql[j] == c:
+                    if j + 1 < n and sql[j + 1] == c:
+                        j += 2
+                        continue
+                    break
+                j += 1
+            i = j + 1
+        elif sql.startswith("$$", i):
+            end = sql.find("$$", i + 2)
+            i = n if end == -1 else end + 2
+        elif sql.startswith("--", i):
+            end = sql.find("\n", i)
+            i = n if end == -1 else end + 1
+        elif sql.startswith("/*", i):
+            end = sql.find("*/", i + 2)
+            i = n if end == -1 else end + 2
+        elif c == ";":
+            statements.append(sql[start:i])
+            start = i = i + 1
+        else:
+            i += 1
+    statements.append(sql[start:])
+    return statements
+
+class Statement():
+    def __init__(self, name: str, sql: str, after: list = None):
+        self.name = name
+        self.sql = sql
+        self.after = after or []
+
+def parse_script(sql: str) -> list:
+    """Statements with their dependencies
+
+    Leading comment lines may annotate a statement: `-- @name: x` names it,
+    `-- @after: a, b` makes it wait for named earlier statements only, and
+    `-- @independent` lets it start right away. Unannotated statements wait for the
+    statement before them, so plain scripts keep running in file order.
+    """
+    statements = []
+    for chunk in split_statements(sql):
+        lines = chunk.strip().splitlines()
+        annotations = {}
+        while lines and (lines[0].strip().startswith("--") or not lines[0].strip()):
+            match = ANNOTATION_RE.match(lines.pop(0))
+            if match:
+                annotations[match.group(1).lower()] = match.group(2)
+        body = "\n".join(lines).strip()
+        if not body:
+            continue
+
+        name = annotations.get("name") or f"stmt_{len(statements) + 1}"
+        names = [s.name for s in statements]
+        if name in names:
+            raise ValueError(f"Duplicate statement name: {name}")
+        if "after" in annotations:
+            after = [dep.strip() for dep in annotations["after"].split(",") if dep.strip()]
+        elif "independent" in annotations or not statements:
+            after = []
+        else:
+            after = [statements[-1].name]
+
+        unknown = [dep for dep in after if dep not in names]
+        if unknown:
+            raise ValueError(f"{name} depends on unknown or later statements: {unknown}")
+        statements.append(Statement(name, body, after))
+    return statements
+
+def is_chain(statements: list) -> bool:
+    """Whether every statement waits (directly or not) for the one before it, so none can overlap"""
+    ancestors = {}
+    for i, statement in enumerate(statements):
+        ancestors[statement.name] = set(statement.after).union(*(ancestors[dep] for dep in statement.after))
+        if i and statements[i - 1].name not in ancestors[statement.name]:
+            return False
+    return True
+
+def rows_affected(cursor):
+    """Rows loaded by a COPY or changed by DML, None for statements that report neither"""
+    names = [column[0].lower() for column in (cursor.description or [])]
+    if "rows_loaded" in names:
+        index = names.index("rows_loaded")
+        return sum(row[index] or 0 for row in cursor.fetchall())
+    counts = [i for i, column in enumerate(names) if column.startswith("number of rows")]
+    if counts:
+        row = cursor.fetchone()
+        return sum(row[i] or 0 for i in counts) if row else 0
+    return None
+
+class SQLRunner():
+    """Run parsed statements on one pooled session
+
+    Every statement whose dependencies have succeeded is submitted with execute_async,
+    and all running queries are polled together with exponential backoff, so
+    independent statements overlap on the warehouse. Temp tables and USE statements
+    are session state shared by all of them. After a failure nothing new is
+    submitted, running queries are awaited and the error is raised. Scripts where no
+    two statements can overlap run with blocking execute instead, since polling only
+    adds round trips to a strict chain.
+    """
+    def __init__(self, max_concurrency: int = 8, poll_interval: float = 0.05, max_poll_interval: float = 1.0,
+                 async_queries: bool = True):
+        self.max_concurrency = max_concurrency
+        self.poll_interval = poll_interval
+        self.max_poll_interval = max_poll_interval
+        self.async_queries = async_queries
+
+    def run(self, statements: list) -> list:
+        """Run statements; returns per-statement name/status/seconds/rows/query_id/error"""
+        results = {s.name: {"name": s.name, "status": "pending", "seconds": None, "rows": None,
+                            "query_id": None, "error": None, "sql": " ".join(s.sql.split())[:120]}
+                   for s in statements}
+        with get_connection_manager().acquire() as conn:
+            if self.async_queries and not is_chain(statements):
+                self._run_async(conn, statements, results)
+            else:
+                self._run_sync(conn, statements, results)
+            self._log(results)
+
+            failed = [r for r in results.values() if r["status"] == "failed"]
+            if failed:
+                raise RuntimeError(f"Statement {failed[0]['name']} failed: {failed[0]['error']}")
+        return list(results.values())
+
+    def _run_sync(self, conn, statements: list, results: dict) -> None:
+        for statement in statements:
+            result = results[statement.name]
+            if any(results[dep]["status"] != "succeeded" for dep in statement.after):
+                result["status"] = "skipped"
+                continue
+            start = time.perf_counter()
+            try:
+                with conn.cursor() as cur:
+                    cur.execute(statement.sql)
+                    result.update(status="succeeded", rows=rows_affected(cur), query_id=cur.sfqid)
+            except Exception as e:
+                result.update(status="failed", error=str(e))
+            result["seconds"] = round(time.perf_counter() - start, 4)
+
+    def _run_async(self, conn, statements: list, results: dict) -> None:
+        pending = list(statements)
+        running = {}  # name -> (cursor, query id, start time)
+        interval = self.poll_interval
+
+        while pending or running:
+            failed = any(r["status"] == "failed" for r in results.values())
+
+            # Submit every statement whose dependencies have succeeded
+            for statement in list(pending):
+                if failed:
+                    results[statement.name]["status"] = "skipped"
+                    pending.remove(statement)
+                    continue
+                if len(running) >= self.max_concurrency:
+                    break
+                if all(results[dep]["status"] == "succeeded" for dep in statement.after):
+                    pending.remove(statement)
+                    cur = conn.cursor()
+                    start = time.perf_counter()
+                    try:
+                        cur.execute_async(statement.sql)
+                    except Exception as e:
+                        results[statement.name].update(status="failed", error=str(e),
+                                                       seconds=round(time.perf_counter() - start, 4))
+                        cur.close()
+                        failed = True
+                        continue
+                    results[statement.name].update(status="running", query_id=cur.sfqid)
+                    running[statement.name] = (cur, cur.sfqid, start)
+
+            if not running:
+                continue
+
+            # Poll every running query once
+            finished = False
+            for name, (cur, query_id, start) in list(running.items()):
+                try:
+                    status = conn.get_query_status_throw_if_error(query_id)
+                    if conn.is_still_running(status):
+                        continue
+                    cur.get_results_from_sfqid(query_id)
+                    results[name].update(status="succeeded", rows=rows_affected(cur))
+                except Exception as e:
+                    results[name].update(status="failed", error=str(e))
+                results[name]["seconds"] = round(time.perf_counter() - start, 4)
+                cur.close()
+                del running[name]
+                finished = True
+
+            if finished:
+                interval = self.poll_interval
+            elif running:
+                time.sleep(interval)
+                interval = min(interval * 2, self.max_poll_interval)
+
+    def _log(self, results: dict) -> None:
+        for result in results.values():
+            rows = "-" if result["rows"] is None else result["rows"]
+            seconds = "-" if result["seconds"] is None else f"{result['seconds']:.2f}s"
+            logger.info(f"  {result['name']:<20} {result['status']:<10} {seconds:>9}  rows={rows}  {result['sql'][:60]}")
@@ -0,0 +1,29 @@
+import pandas as pd
+from pipeline.ingestion.ingest_reddit import RedditIngestor
+
+def posts() -> pd.DataFrame:
+    title = "Feeling very anxious about work lately"
+    return pd.DataFrame({
+        "id": ["a", "b", "c"],
+        "subreddit": ["anxiety", "depression", "anxiety"],
+        "title": [title, title, "Something else entirely here"],
+        "selftext": ["same body text here for both posts", "same body text here for both posts", "other"],
+        "score": [1, 2, 3],
+        "num_comments": [0, 1, 2],
+        "created_utc": [1.7e9] * 3
+    })
+
+def test_flag_mode_marks_duplicates_in_the_output():
+    out = RedditIngestor(dedup="flag").process_data(posts())
+    assert len(out) == 3
+    assert out["duplicate_of"].tolist()[1] == "a"
+    assert out["duplicate_of"].isna().tolist() == [True, False, True]
+
+def test_collapse_mode_drops_duplicates():
+    out = RedditIngestor(dedup="collapse").process_data(posts())
+    assert out["title"].tolist() == ["Feeling very anxious about work lately", "Something else entirely here"]
+    assert out["duplicate_of"].isna().all()
+
+def test_output_columns_do_not_depend_on_dedup():
+    columns = [list(RedditIngestor(dedup=mode).process_data(posts()).columns) for mode in (None, "flag", "collapse")]
+    assert columns[0] == columns[1] == columns[2]
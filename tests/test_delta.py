@@ -0,0 +1,59 @@
+import numpy as np
+import pandas as pd
+from pipeline.ingestion.compact import compact_frame
+from pipeline.ingestion.delta import DeltaPlan, row_hashes
+
+KEY = ["country", "year"]
+
+def plain_frame() -> pd.DataFrame:
+    return pd.DataFrame({
+        "country": pd.Series(["Albania", "Albania", "Brazil", "Chile"], dtype=object),
+        "year": [2001, 2002, 2001, 2001],
+        "sex": pd.Series(["male", "female", "male", None], dtype=object),
+        "suicides_no": [21.0, 14.0, np.nan, 3.5]
+    })
+
+def previous_hashes(df: pd.DataFrame) -> pd.DataFrame:
+    plan = DeltaPlan(KEY)
+    plan.upserts(df)
+    return plan.hashes()
+
+def assert_no_changes(plan: DeltaPlan, df: pd.DataFrame) -> None:
+    assert plan.upserts(df).empty
+    assert plan.deletes().empty
+    assert plan.counts == {"inserted": 0, "updated": 0, "unchanged": len(df), "deleted": 0}
+
+def test_compact_frame_matches_plain_hashes():
+    df = plain_frame()
+    compact = compact_frame(plain_frame(), ["country", "sex"])
+    assert isinstance(compact["country"].dtype, pd.CategoricalDtype)
+    assert compact["year"].dtype == np.int16
+
+    plan = DeltaPlan(KEY, previous_hashes(df))
+    assert_no_changes(plan, compact)
+
+def test_chunk_dtypes_match_whole_file_hashes():
+    df = plain_frame()
+    plan = DeltaPlan(KEY, previous_hashes(df))
+
+    # A NaN-free chunk infers int64 where the whole file had float64, and vice versa
+    first = df.iloc[:2].astype({"suicides_no": "int64"})
+    second = df.iloc[2:].astype({"year": "float64"})
+    assert plan.upserts(first).empty
+    assert plan.upserts(second).empty
+    assert plan.deletes().empty
+
+def test_changed_value_is_still_detected():
+    df = plain_frame()
+    changed = compact_frame(plain_frame(), ["country", "sex"])
+    changed.loc[1, "suicides_no"] = 15.0
+
+    plan = DeltaPlan(KEY, previous_hashes(df))
+    upserts = plan.upserts(changed)
+    assert upserts["year"].tolist() == [2002]
+    assert plan.counts["updated"] == 1
+
+def test_row_hashes_ignore_dtype():
+    df = plain_frame()
+    compact = compact_frame(plain_frame(), ["country", "sex"])
+    assert (row_hashes(df, KEY)["_row_hash"].to_numpy() == row_hashes(compact, KEY)["_row_hash"].to_numpy()).all()
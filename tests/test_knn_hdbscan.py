@@ -0,0 +1,32 @@
+import numpy as np
+import pandas as pd
+import pytest
+from hdbscan import HDBSCAN
+from analysis.clustering.knn_hdbscan import knn_hdbscan
+from analysis.utils.gower_engine import GowerFeatures, gower_distance
+
+CATEGORICAL = [0, 1]
+
+def survey(n_rows: int = 200) -> pd.DataFrame:
+    rng = np.random.default_rng(7)
+    centers = rng.normal(size=(3, 2)) * 3
+    group = rng.integers(0, 3, n_rows)
+    return pd.DataFrame({
+        "gender": (group + rng.integers(0, 2, n_rows)) % 2,
+        "country": group,
+        "age": centers[group, 0] + rng.normal(size=n_rows),
+        "score": centers[group, 1] + rng.normal(size=n_rows)
+    })
+
+# Guards hdbscan_from_mst, which uses hdbscan's private _tree_to_labels and label
+@pytest.mark.parametrize("min_cluster_size, min_samples", [(15, 10), (10, 4), (25, 8)])
+def test_exact_mode_matches_dense_hdbscan(min_cluster_size, min_samples):
+    df = survey()
+    distances = gower_distance(df, CATEGORICAL, n_jobs=1).astype(np.float64)
+    dense = HDBSCAN(min_cluster_size=min_cluster_size, min_samples=min_samples, metric="precomputed").fit(distances)
+
+    clusterer = knn_hdbscan(GowerFeatures.from_frame(df, CATEGORICAL), min_cluster_size=min_cluster_size,
+                            min_samples=min_samples, exact=True, n_jobs=1)
+    assert dense.labels_.max() >= 1
+    np.testing.assert_array_equal(clusterer.labels_, dense.labels_)
+    np.testing.assert_allclose(clusterer.probabilities_, dense.probabilities_)
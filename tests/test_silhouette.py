@@ -0,0 +1,39 @@
+import numpy as np
+import pandas as pd
+import pytest
+from gower import gower_matrix
+from sklearn.metrics import silhouette_score
+from analysis.utils.silhouette import silhouette_report
+
+def gower_distances(n_rows: int = 120) -> np.ndarray:
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame({
+        "gender": rng.integers(0, 2, n_rows),
+        "country": rng.integers(0, 5, n_rows),
+        "age": rng.normal(35, 8, n_rows),
+        "score": rng.normal(size=n_rows)
+    })
+    return gower_matrix(df.to_numpy(dtype=np.float64), cat_features=[True, True, False, False]).astype(np.float64)
+
+def labels_with_noise(n_rows: int) -> np.ndarray:
+    labels = np.arange(n_rows) % 3
+    labels[::10] = -1
+    return labels
+
+def sklearn_score(distances: np.ndarray, labels: np.ndarray) -> float:
+    kept = labels != -1
+    return silhouette_score(distances[kept][:, kept], labels[kept], metric="precomputed")
+
+@pytest.mark.parametrize("max_block_bytes", [256 * 1024 * 1024, 4096])
+def test_chunked_silhouette_matches_sklearn(max_block_bytes):
+    distances = gower_distances()
+    labels = labels_with_noise(len(distances))
+    report = silhouette_report(distances, labels, max_block_bytes=max_block_bytes)
+    assert report["silhouette_score"] == pytest.approx(sklearn_score(distances, labels), abs=1e-12)
+
+def test_report_counts_clusters_and_noise():
+    distances = gower_distances()
+    labels = labels_with_noise(len(distances))
+    report = silhouette_report(distances, labels)
+    assert report["n_clusters"] == 3
+    assert report["noise_ratio"] == pytest.approx(np.mean(labels == -1))
@@ -0,0 +1,16 @@
+import glob
+from pipeline.snowflake.sql_runner import is_chain, parse_script
+
+def test_plain_script_is_a_chain():
+    assert is_chain(parse_script("USE SCHEMA S; CREATE TABLE T(a INT); DROP TABLE T"))
+
+def test_independent_statements_are_not_a_chain():
+    assert not is_chain(parse_script("SELECT 1;\n-- @independent\nSELECT 2"))
+    assert not is_chain(parse_script("-- @name: first\nSELECT 1; SELECT 2;\n-- @after: first\nSELECT 3"))
+
+def test_processed_load_scripts_run_as_chains():
+    paths = glob.glob("pipeline/snowflake/*_sql/*_processed_load*.sql")
+    assert paths
+    for path in paths:
+        with open(path) as f:
+            assert is_chain(parse_script(f.read())), path
@@ -0,0 +1,27 @@
+from io import StringIO
+from pipeline.ingestion.static_ingestor import SuicideByDemographicsIngestor
+
+HEADER = "INDICATOR,UNIT,UNIT_NUM,STUB_NAME,STUB_NAME_NUM,STUB_LABEL,STUB_LABEL_NUM,YEAR,YEAR_NUM,AGE,AGE_NUM,ESTIMATE,FLAG"
+
+def demographics_csv() -> str:
+    row = "Death rates for suicide,Deaths per 100k,1,Total,0,All persons,0.1,{year},1,All ages,0.1,{estimate},{flag}"
+    rows = [row.format(year=1950 + i, estimate=13.2, flag="") for i in range(3)]
+    rows += [row.format(year=1960, estimate="", flag="---"), row.format(year=1961, estimate=12.5, flag="*")]
+    return "\n".join([HEADER, *rows]) + "\n"
+
+def chunk_columns(ingestor, chunksize: int) -> list:
+    columns = []
+    for chunk in ingestor.read_csv(StringIO(demographics_csv()), chunksize=chunksize):
+        processed = ingestor.pin_dtypes(ingestor.process_data(chunk))
+        columns.append(ingestor._snowflake_columns(processed))
+    return columns
+
+def test_all_null_first_chunk_keeps_the_whole_file_ddl():
+    ingestor = SuicideByDemographicsIngestor()
+    ingestor.compact = False
+
+    whole_file = chunk_columns(ingestor, chunksize=100)[0]
+    chunks = chunk_columns(ingestor, chunksize=3)
+    assert '"flag" VARCHAR(16777216)' in whole_file
+    assert '"year" INTEGER' in whole_file and '"estimate" FLOAT' in whole_file
+    assert all(columns == whole_file for columns in chunks)